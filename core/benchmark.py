@@ -0,0 +1,87 @@
+# core/benchmark.py
+"""
+Mediciones de rendimiento de LOBO
+- Cronómetro de arranque (tiempo hasta el prompt), descontando la espera del usuario
+- Resultados en logs/benchmark.json, una sección por medición
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+RUTA_BENCHMARK = os.path.join("logs", "benchmark.json")
+
+
+def guardar_benchmark(seccion, datos, ruta=RUTA_BENCHMARK):
+    """Guarda `datos` bajo `seccion` en el JSON de benchmarks (conserva las demás secciones)"""
+    contenido = {}
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                contenido = json.load(f)
+        except (OSError, ValueError):
+            contenido = {}
+
+    contenido[seccion] = {**datos, 'registrado_en': datetime.now().isoformat(timespec='seconds')}
+
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, indent=4, ensure_ascii=False)
+
+
+class CronometroArranque:
+    """Mide las etapas del arranque hasta que aparece el prompt"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = []  # (nombre, ms, interactiva)
+
+    @contextmanager
+    def etapa(self, nombre, interactiva=False):
+        """
+        Mide una etapa del arranque.
+
+        Las etapas interactivas (login, menús) se registran pero no cuentan
+        para el tiempo hasta el prompt.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas.append((nombre, (time.perf_counter() - t0) * 1000, interactiva))
+
+    def listo(self):
+        """
+        Cierra la medición, la guarda en logs/benchmark.json y la reporta
+
+        Returns:
+            Milisegundos hasta el prompt (sin etapas interactivas)
+        """
+        total_ms = (time.perf_counter() - self.inicio) * 1000
+        espera_ms = sum(ms for _, ms, interactiva in self.etapas if interactiva)
+        hasta_prompt_ms = total_ms - espera_ms
+
+        try:
+            guardar_benchmark("arranque", {
+                'hasta_prompt_ms': round(hasta_prompt_ms, 1),
+                'espera_usuario_ms': round(espera_ms, 1),
+                'etapas': {nombre: round(ms, 1) for nombre, ms, _ in self.etapas},
+            })
+        except OSError as e:
+            logger.warning("No se pudo guardar el benchmark de arranque: %s", e)
+
+        logger.info("Arranque: %.0f ms hasta el prompt (%s)", hasta_prompt_ms,
+                    ", ".join(f"{nombre}={ms:.0f}" for nombre, ms, _ in self.etapas))
+        print(f"⏱️  Listo en {hasta_prompt_ms / 1000:.2f} s")
+
+        return hasta_prompt_ms
+
+
+# ===== INSTANCIA GLOBAL =====
+# Se crea al importar el módulo: main.py lo importa antes que nada
+ARRANQUE = CronometroArranque()
@@ -20,7 +20,7 @@ logger = SessionLogger(session_id="default")
 
 def route_command(command):
     try:
-        logger.log("INFO", f"Ejecutando comando: {command}", usuario=SESSION.user.username)
+        logger.log("INFO", "Ejecutando comando: %s", command, usuario=SESSION.user.username)
         # Aquí va la lógica real del comando
     except Exception as e:
-        logger.log("ERROR", f"Error ejecutando {command}: {str(e)}", usuario=SESSION.user.username)
+        logger.log("ERROR", "Error ejecutando %s: %s", command, e, usuario=SESSION.user.username)
@@ -1,39 +1,175 @@
 # core/context/session_logger.py
-from core.context.logs import BITACORA
+"""
+Logger de sesión: archivo lobo.log + bitácora en la base de datos
+
+- El origen sale de sys._getframe (el módulo de quien llama) o se pasa
+  explícito con origen=; antes se usaba inspect.stack(), que arma todos los
+  frames con su código fuente y costaba milisegundos por llamada
+- El mensaje se formatea de forma perezosa al estilo logging
+  (log("INFO", "Ejecutando %s", comando)): solo si el nivel está habilitado
+  para el archivo, y al escribir el lote para la bitácora
+- La bitácora no hace commit por mensaje: las entradas van a un buffer que se
+  escribe en un solo INSERT cada INTERVALO_DESCARGA segundos, al llegar a
+  TAMANO_LOTE entradas o al salir del programa
+"""
+
+import atexit
 import logging
-import inspect
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+
+logging.basicConfig(
+    filename="lobo.log",
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 50  # Entradas que fuerzan una descarga inmediata
+INTERVALO_DESCARGA = 2.0  # Segundos máximos que una entrada espera en el buffer
+MAX_PENDIENTES = 10000  # Si la DB no responde, se descartan las más viejas
+
+NIVELES = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+def _formatear(mensaje, args):
+    if not args:
+        return mensaje
+    try:
+        return mensaje % args
+    except (TypeError, ValueError):
+        return f"{mensaje} {args}"
+
+
+class SumideroBitacora:
+    """Buffer de entradas para la tabla bitacora, escritas por lotes en un hilo aparte"""
+
+    def __init__(self, tamano_lote=TAMANO_LOTE, intervalo=INTERVALO_DESCARGA):
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self._pendientes = deque(maxlen=MAX_PENDIENTES)
+        self._lock_descarga = threading.Lock()
+        self._hay_lote = threading.Event()
+        self._hilo = None
+        self.escritas = 0
+
+    def agregar(self, origen, nivel, mensaje, args, usuario):
+        """Encola una entrada (sin formatear ni tocar la DB)"""
+        # deque.append es atómico: no hace falta lock en el camino rápido
+        self._pendientes.append((datetime.now(), origen, nivel, mensaje, args, usuario))
+
+        if self._hilo is None:
+            self._iniciar()
+        if len(self._pendientes) >= self.tamano_lote:
+            self._hay_lote.set()
+
+    def _iniciar(self):
+        with self._lock_descarga:
+            if self._hilo is not None:
+                return
+            self._hilo = threading.Thread(target=self._bucle, name="lobo-bitacora", daemon=True)
+            self._hilo.start()
+            atexit.register(self.descargar)
+
+    def _bucle(self):
+        while True:
+            self._hay_lote.wait(self.intervalo)
+            self._hay_lote.clear()
+            try:
+                self.descargar()
+            except Exception as e:
+                logger.error(f"❌ No se pudo escribir la bitácora: {e}")
+
+    def descargar(self):
+        """
+        Escribe lo pendiente en un solo INSERT
+
+        Returns:
+            int: entradas escritas
+        """
+        with self._lock_descarga:
+            lote = []
+            while self._pendientes:
+                try:
+                    lote.append(self._pendientes.popleft())
+                except IndexError:
+                    break
+            if not lote:
+                return 0
+
+            from sqlalchemy import insert
+            from core.db.db import SessionLocal
+            from core.db.schema import BitacoraRegistro
+
+            filas = [
+                {'timestamp': timestamp, 'modulo': origen, 'accion': nivel,
+                 'descripcion': _formatear(mensaje, args), 'usuario': usuario}
+                for timestamp, origen, nivel, mensaje, args, usuario in lote
+            ]
+
+            db = SessionLocal()
+            try:
+                db.execute(insert(BitacoraRegistro), filas)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Se devuelven al buffer para el siguiente intento
+                self._pendientes.extendleft(reversed(lote))
+                raise
+            finally:
+                db.close()
+
+            self.escritas += len(filas)
+            return len(filas)
+
+    @property
+    def pendientes(self):
+        return len(self._pendientes)
+
+
+# ===== INSTANCIA GLOBAL =====
+SUMIDERO_BITACORA = SumideroBitacora()
+
 
 class SessionLogger:
-    def __init__(self, session_id="system"):
+    def __init__(self, session_id="system", sumidero=None):
         self.session_id = session_id
+        self.sumidero = sumidero or SUMIDERO_BITACORA
+
+    def log(self, nivel, mensaje, *args, usuario="system", origen=None):
+        """
+        Registra en lobo.log y en la bitácora
+
+        Args:
+            nivel: "INFO", "WARNING", "ERROR", "DEBUG"...
+            mensaje: texto, con %s para los args (se formatea solo si hace falta)
+            usuario: quien ejecuta
+            origen: módulo que registra; por defecto el de quien llama
+        """
+        nivel = nivel.upper()
+        if origen is None:
+            # Frame 1 = quien llamó al logger (ej: brain, router, auth, etc.)
+            origen = sys._getframe(1).f_globals.get("__name__", "router")
+        origen = origen.upper()
+
+        # Guardar en archivo local (logging formatea solo si el nivel pasa el filtro)
+        nivel_logging = NIVELES.get(nivel, logging.DEBUG)
+        registrador = logging.getLogger(origen.lower())
+        if registrador.isEnabledFor(nivel_logging):
+            registrador.log(nivel_logging, mensaje, *args)
+
+        # Guardar en la base de datos (bitácora global), por lotes
+        self.sumidero.agregar(origen, nivel, mensaje, args, usuario)
 
-    logging.basicConfig(
-        filename="lobo.log",
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s"
-    )
-
-    def log(self, nivel, mensaje, usuario="system"):
-
-        # 🔹 Detectar automáticamente el origen
-        stack = inspect.stack()
-        # El frame 1 es quien llamó al logger (ej: brain, router, auth, etc.)
-        caller_module = inspect.getmodule(stack[1][0])
-        if caller_module and hasattr(caller_module, "__name__"):
-            origen = caller_module.__name__.upper()
-        else:
-            # Si no lo detecta, tratamos de deducir del stack
-            origen = stack[1].function.upper() if stack and len(stack) > 1 else "ROUTER"
-
-        # Guardar en archivo local
-        if nivel.upper() == "INFO":
-            logging.info(mensaje)
-        elif nivel.upper() == "WARNING":
-            logging.warning(mensaje)
-        elif nivel.upper() == "ERROR":
-            logging.error(mensaje)
-        else:
-            logging.debug(mensaje)
-
-        # Guardar en la base de datos (bitácora global)
-        BITACORA.registrar(origen, nivel, mensaje, usuario)
\ No newline at end of file
+    def flush(self):
+        """Escribe ya las entradas pendientes de la bitácora"""
+        return self.sumidero.descargar()
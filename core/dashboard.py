@@ -101,17 +101,30 @@ class Dashboard:
         print("🔔 ALARMAS PROGRAMADAS:")
 
         try:
-            eventos = listar_eventos_por_fecha(self.hoy.isoformat())
+            from modules.alarma.alarma import ALARMAS
+            from modules.agenda.agenda_logics import get_evento_by_id
+
+            fin_del_dia = datetime.combine(self.hoy, datetime.max.time())
+            pendientes = ALARMAS.pendientes(desde=datetime.now(), hasta=fin_del_dia)
 
-            if not eventos:
+            if not pendientes:
                 print("   • Sin alarmas programadas\n")
                 return
 
-            for evento in sorted(eventos, key=lambda e: e.hora_inicio):
-                hora_evento = datetime.combine(self.hoy, evento.hora_inicio)
-                hora_alarma = hora_evento - timedelta(minutes=5)
+            eventos_hoy = {ev.id: ev for ev in listar_eventos_por_fecha(self.hoy.isoformat())}
+
+            for disparo, evento_id in pendientes[:10]:
+                evento = eventos_hoy.get(evento_id) or get_evento_by_id(evento_id)
+                if not evento:
+                    continue
+
+                hora_evento = datetime.combine(evento.fecha_inicio, evento.hora_inicio)
+                minutos_antes = int((hora_evento - disparo).total_seconds() // 60)
+
+                print(f"   🔔 {disparo.strftime('%H:%M')} - {evento.nombre} ({minutos_antes} min antes)")
 
-                print(f"   🔔 {hora_alarma.strftime('%H:%M')} - {evento.nombre} (5 min antes)")
+            if len(pendientes) > 10:
+                print(f"   ... y {len(pendientes) - 10} más hoy")
         except:
             print("   • Sin alarmas programadas")
 
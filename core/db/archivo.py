@@ -0,0 +1,180 @@
+# core/db/archivo.py
+"""
+Archivo histórico local (eventos y recordatorios de semanas pasadas)
+
+- Un archivo por tabla y mes: data/archivo/<tabla>/AAAA-MM.jsonl.gz
+- Columnar: cada segmento es un dict {columna: [valores]} en una línea JSON,
+  así los valores repetidos (tipo, hora, estado...) quedan juntos y gzip
+  los comprime mucho mejor que fila a fila
+- Solo se agrega: cada archivado escribe un miembro gzip nuevo al final del
+  archivo (gzip lee los miembros concatenados como un solo flujo)
+- Las filas vuelven como EventoVista / RecordatorioVista, igual que las de la DB
+- Si un archivado se corta entre escribir y borrar de la DB, la fila queda
+  repetida en el archivo: al leer gana la última copia de cada id
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime, time
+
+from core.db.schema import RecurrenciaEnum
+from core.db.vistas import EventoVista, RecordatorioVista
+
+logger = logging.getLogger(__name__)
+
+RUTA_ARCHIVO = os.path.join("data", "archivo")
+
+
+def _iso(valor):
+    return valor.isoformat() if valor is not None else None
+
+
+def _desde_iso(tipo):
+    return lambda valor: tipo.fromisoformat(valor) if valor is not None else None
+
+
+def _enum_valor(valor):
+    return valor.value if isinstance(valor, RecurrenciaEnum) else valor
+
+
+def _recurrencia(valor):
+    return RecurrenciaEnum(valor) if valor is not None else None
+
+
+# tabla -> (vista, columna de fecha que decide el mes, columnas de texto para buscar,
+#           {columna: (codificar, decodificar)} para las que no son JSON nativo)
+TABLAS = {
+    "eventos": (EventoVista, "fecha_inicio", ("nombre", "descripcion"), {
+        "fecha_inicio": (_iso, _desde_iso(date)),
+        "hora_inicio": (_iso, _desde_iso(time)),
+        "hora_fin": (_iso, _desde_iso(time)),
+        "recurrencia": (_enum_valor, _recurrencia),
+    }),
+    "memory": (RecordatorioVista, "fecha_limite", ("content",), {
+        "timestamp": (_iso, _desde_iso(datetime)),
+        "fecha_limite": (_iso, _desde_iso(date)),
+        "hora_limite": (_iso, _desde_iso(time)),
+    }),
+}
+
+
+class ArchivoHistorico:
+    """Almacén comprimido, columnar y de solo agregar para filas pasadas"""
+
+    def __init__(self, ruta=RUTA_ARCHIVO):
+        self.ruta = ruta
+
+    def _carpeta(self, tabla):
+        return os.path.join(self.ruta, tabla)
+
+    def _archivo(self, tabla, mes):
+        return os.path.join(self._carpeta(tabla), f"{mes}.jsonl.gz")
+
+    def meses(self, tabla):
+        """Meses archivados ("AAAA-MM") en orden"""
+        carpeta = self._carpeta(tabla)
+        if not os.path.isdir(carpeta):
+            return []
+        return sorted(nombre[:7] for nombre in os.listdir(carpeta) if nombre.endswith(".jsonl.gz"))
+
+    # ===== Escritura =====
+
+    def agregar(self, tabla, filas):
+        """
+        Agrega filas (vistas) al archivo, un segmento por mes
+
+        Returns:
+            int: filas escritas
+        """
+        vista, columna_fecha, _, conversiones = TABLAS[tabla]
+
+        por_mes = {}
+        for fila in filas:
+            fecha = getattr(fila, columna_fecha) or date.min
+            por_mes.setdefault(fecha.strftime("%Y-%m"), []).append(fila)
+
+        os.makedirs(self._carpeta(tabla), exist_ok=True)
+
+        for mes, filas_mes in por_mes.items():
+            segmento = {}
+            for columna in vista.__slots__:
+                codificar = conversiones.get(columna, (None,))[0]
+                valores = [getattr(fila, columna) for fila in filas_mes]
+                segmento[columna] = [codificar(v) for v in valores] if codificar else valores
+
+            with gzip.open(self._archivo(tabla, mes), "at", encoding="utf-8") as f:
+                f.write(json.dumps(segmento, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        total = sum(len(filas_mes) for filas_mes in por_mes.values())
+        if total:
+            logger.info(f"🗄️  {total} filas de '{tabla}' archivadas en {len(por_mes)} meses")
+        return total
+
+    # ===== Lectura =====
+
+    def _segmentos(self, tabla, mes):
+        try:
+            with gzip.open(self._archivo(tabla, mes), "rt", encoding="utf-8") as f:
+                for linea in f:
+                    if linea.strip():
+                        yield json.loads(linea)
+        except (OSError, EOFError, ValueError) as e:
+            # Un final truncado (corte de luz a media escritura) no invalida lo anterior
+            logger.warning(f"⚠️  Archivo {tabla}/{mes} incompleto: {e}")
+
+    def leer(self, tabla, desde=None, hasta=None):
+        """
+        Filas archivadas entre `desde` y `hasta` (dates, inclusivos)
+
+        Returns:
+            list: vistas ordenadas por fecha
+        """
+        vista, columna_fecha, _, conversiones = TABLAS[tabla]
+        mes_desde = desde.strftime("%Y-%m") if desde else None
+        mes_hasta = hasta.strftime("%Y-%m") if hasta else None
+
+        por_id = {}
+        for mes in self.meses(tabla):
+            if (mes_desde and mes < mes_desde) or (mes_hasta and mes > mes_hasta):
+                continue
+
+            for segmento in self._segmentos(tabla, mes):
+                columnas = []
+                for columna in vista.__slots__:
+                    decodificar = conversiones.get(columna, (None, None))[1]
+                    valores = segmento.get(columna) or [None] * len(segmento["id"])
+                    columnas.append([decodificar(v) for v in valores] if decodificar else valores)
+
+                for valores in zip(*columnas):
+                    fila = vista(*valores)
+                    por_id[fila.id] = fila
+
+        filas = por_id.values()
+        if desde or hasta:
+            filas = [f for f in filas
+                     if getattr(f, columna_fecha) is not None
+                     and (desde is None or getattr(f, columna_fecha) >= desde)
+                     and (hasta is None or getattr(f, columna_fecha) <= hasta)]
+
+        return sorted(filas, key=lambda f: (getattr(f, columna_fecha) or date.min))
+
+    def buscar(self, tabla, texto, desde=None, hasta=None):
+        """Filas archivadas cuyo texto contiene `texto` (sin distinguir mayúsculas)"""
+        _, _, columnas_texto, _ = TABLAS[tabla]
+        aguja = texto.lower()
+        return [fila for fila in self.leer(tabla, desde, hasta)
+                if any(aguja in (getattr(fila, c) or "").lower() for c in columnas_texto)]
+
+    def buscar_eventos(self, texto, desde=None, hasta=None):
+        return self.buscar("eventos", texto, desde, hasta)
+
+    def buscar_recordatorios(self, texto, desde=None, hasta=None):
+        return self.buscar("memory", texto, desde, hasta)
+
+
+# ===== INSTANCIA GLOBAL =====
+ARCHIVO = ArchivoHistorico()
@@ -6,11 +6,12 @@
 # Uso:
 #   from core.db.db import SessionLocal, engine, init_db
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from core.db.schema import Base
+from sqlalchemy.pool import QueuePool, StaticPool
 from core.exceptions import DatabaseError
 import os
+import sys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,19 +20,116 @@ logger = logging.getLogger(__name__)
 # Ruta de la base de datos
 # ─────────────────────────────────────────────
 
+# LOBO_DB permite apuntar a otra copia (pruebas, respaldo) sin tocar el código
 DB_PATH = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../database/lobo.db")
+    os.environ.get("LOBO_DB") or os.path.join(os.path.dirname(__file__), "../database/lobo.db")
 )
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Espera ante un lock de otro hilo antes de fallar con "database is locked"
+BUSY_TIMEOUT_MS = 5000
+# Sentencias preparadas que guarda cada conexión del pool (sqlite3: 128 por defecto)
+SENTENCIAS_EN_CACHE = 256
+
+# ─────────────────────────────────────────────
+# Registro de motores
+# ─────────────────────────────────────────────
+#
+# Un solo engine por archivo y un solo archivo configurado: el REPL, las
+# alarmas, la sincronización y el executor de tareas comparten el mismo pool
+# (y con él las sentencias preparadas de cada conexión) en lugar de abrir
+# cada uno su propio handle.
+
+_MOTORES = {}
+_RUTAS_PERMITIDAS = {DB_PATH}
+_EN_MEMORIA = ("", ":memory:", "file::memory:")
+
+
+def _normalizar(ruta) -> str:
+    ruta = os.fsdecode(ruta)
+    if ruta in _EN_MEMORIA or ruta.startswith("file::memory:"):
+        return ":memory:"
+    if ruta.startswith("file:"):
+        ruta = ruta[len("file:"):].split("?", 1)[0]
+    return os.path.abspath(ruta)
+
+
+def permitir_ruta(ruta) -> str:
+    """Autoriza otro archivo SQLite (herramientas de prueba o respaldo)"""
+    ruta = _normalizar(ruta)
+    _RUTAS_PERMITIDAS.add(ruta)
+    return ruta
+
+
+def _vigilar_conexiones(evento, args):
+    """Audit hook: rechaza sqlite3.connect a archivos fuera del registro"""
+    if evento != "sqlite3.connect":
+        return
+    ruta = _normalizar(args[0])
+    if ruta != ":memory:" and ruta not in _RUTAS_PERMITIDAS:
+        raise DatabaseError(
+            "Conexión SQLite fuera del registro.",
+            details=f"{ruta} (usa core.db.db.engine / SessionLocal; DB configurada: {DB_PATH})"
+        )
+
+
+sys.addaudithook(_vigilar_conexiones)
+
+
+def _configurar_conexion(dbapi_conn, _registro):
+    """PRAGMAs de cada conexión nueva del pool"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode = WAL")  # lectores no bloquean al escritor
+    cursor.execute("PRAGMA synchronous = NORMAL")  # seguro con WAL, un fsync por checkpoint
+    cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def obtener_engine(ruta=None):
+    """
+    Engine compartido para `ruta` (por defecto la DB configurada)
+
+    - Archivo: QueuePool, una conexión por hilo activo y reutilizada después
+    - :memory: StaticPool, una sola conexión (cada conexión nueva sería otra DB vacía)
+
+    Raises:
+        DatabaseError: si la ruta no es la configurada ni fue autorizada
+    """
+    ruta = _normalizar(ruta) if ruta else DB_PATH
+    if ruta != ":memory:" and ruta not in _RUTAS_PERMITIDAS:
+        raise DatabaseError("Base de datos no registrada.", details=ruta)
+
+    motor = _MOTORES.get(ruta)
+    if motor is not None:
+        return motor
+
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": BUSY_TIMEOUT_MS / 1000,
+        "cached_statements": SENTENCIAS_EN_CACHE,
+    }
+
+    if ruta == ":memory:":
+        motor = create_engine("sqlite://", poolclass=StaticPool, connect_args=connect_args)
+    else:
+        motor = create_engine(
+            f"sqlite:///{ruta}",
+            poolclass=QueuePool,
+            pool_size=5,
+            max_overflow=5,
+            connect_args=connect_args,
+        )
+        event.listen(motor, "connect", _configurar_conexion)
+
+    _MOTORES[ruta] = motor
+    return motor
+
+
 # ─────────────────────────────────────────────
 # Motor y fábrica de sesiones
 # ─────────────────────────────────────────────
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+engine = obtener_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -45,12 +143,20 @@ SessionLocal = sessionmaker(
 
 def init_db() -> None:
     """
-    Crea todas las tablas definidas en schema.py si no existen.
+    Deja el esquema al día con las migraciones versionadas (core/db/migraciones.py).
     Debe llamarse una vez al arrancar LOBO (ver main.py).
+
+    Si PRAGMA user_version ya es la última versión no se toca nada más:
+    sin create_all ni reflexión de tablas en cada arranque.
     """
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Base de datos inicializada correctamente en: %s", DB_PATH)
+        from core.db.migraciones import migrar
+
+        aplicadas = migrar()
+        if aplicadas:
+            logger.info("Base de datos migrada (%s) en: %s", ", ".join(aplicadas), DB_PATH)
+        else:
+            logger.debug("Base de datos al día en: %s", DB_PATH)
     except Exception as e:
         raise DatabaseError(
             "No se pudo inicializar la base de datos.",
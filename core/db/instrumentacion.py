@@ -0,0 +1,243 @@
+# core/db/instrumentacion.py
+"""
+Instrumentación de SQL por comando (perfil_sql on/off)
+
+- Eventos before/after_cursor_execute del engine: solo se enganchan mientras
+  el perfil está activo, apagado no cuesta nada
+- Cada consulta se atribuye al comando que corre en ese hilo (el router
+  envuelve cada comando con PERFIL_SQL.medir); las de hilos de fondo van a
+  "(fondo)"
+- Por comando: consultas, tiempo SQL total, las N más lentas con sus
+  parámetros y las sentencias más repetidas (un N+1 se ve como una misma
+  sentencia repetida cientos de veces)
+- El acumulado se guarda en logs/benchmark.json, sección "sql"
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+TOP_LENTAS = 5
+TOP_REPETIDAS = 3
+LARGO_PARAMETROS = 200
+SIN_COMANDO = "(fondo)"
+
+
+class RegistroComando:
+    """Consultas de una ejecución de un comando"""
+
+    __slots__ = ("consultas", "ms", "lentas", "repetidas")
+
+    def __init__(self):
+        self.consultas = 0
+        self.ms = 0.0
+        self.lentas = []  # heap de (ms, sentencia, parámetros), las TOP_LENTAS mayores
+        self.repetidas = Counter()
+
+    def agregar(self, sentencia, parametros, ms):
+        self.consultas += 1
+        self.ms += ms
+        self.repetidas[sentencia] += 1
+
+        entrada = (ms, sentencia, parametros)
+        if len(self.lentas) < TOP_LENTAS:
+            heapq.heappush(self.lentas, entrada)
+        elif ms > self.lentas[0][0]:
+            heapq.heapreplace(self.lentas, entrada)
+
+    def resumen(self):
+        return {
+            'consultas': self.consultas,
+            'ms_sql': round(self.ms, 2),
+            'lentas': [
+                {'ms': round(ms, 3), 'sql': sentencia, 'parametros': parametros}
+                for ms, sentencia, parametros in sorted(self.lentas, key=lambda e: e[0], reverse=True)
+            ],
+            'repetidas': [
+                {'veces': veces, 'sql': sentencia}
+                for sentencia, veces in self.repetidas.most_common(TOP_REPETIDAS) if veces > 1
+            ],
+        }
+
+
+class PerfilSQL:
+    """Perfil de consultas SQL por comando"""
+
+    def __init__(self):
+        self.activo = False
+        self._engine = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._fondo = RegistroComando()
+        self.historial = {}  # comando -> acumulado para benchmark.json
+
+    # ===== Encendido =====
+
+    def activar(self, engine=None):
+        if self.activo:
+            return
+        if engine is None:
+            from core.db.db import engine
+
+        event.listen(engine, "before_cursor_execute", self._antes)
+        event.listen(engine, "after_cursor_execute", self._despues)
+        event.listen(engine, "handle_error", self._error)
+        event.listen(engine, "checkin", self._devuelta)
+        self._engine = engine
+        self.activo = True
+        logger.info("🔎 Perfil SQL activado")
+
+    def desactivar(self):
+        if not self.activo:
+            return
+
+        event.remove(self._engine, "before_cursor_execute", self._antes)
+        event.remove(self._engine, "after_cursor_execute", self._despues)
+        event.remove(self._engine, "handle_error", self._error)
+        event.remove(self._engine, "checkin", self._devuelta)
+        self._engine = None
+        self.activo = False
+        logger.info("🔎 Perfil SQL desactivado")
+
+    def reiniciar(self):
+        with self._lock:
+            self.historial = {}
+            self._fondo = RegistroComando()
+
+    # ===== Eventos del engine =====
+
+    def _antes(self, conn, cursor, sentencia, parametros, contexto, executemany):
+        conn.info.setdefault("perfil_sql_inicio", []).append(time.perf_counter())
+
+    def _despues(self, conn, cursor, sentencia, parametros, contexto, executemany):
+        pila = conn.info.get("perfil_sql_inicio")
+        if not pila:
+            return
+        ms = (time.perf_counter() - pila.pop()) * 1000
+
+        registro = getattr(self._local, "registro", None)
+        texto_parametros = repr(parametros)[:LARGO_PARAMETROS]
+        sentencia = " ".join(sentencia.split())
+
+        if registro is not None:
+            registro.agregar(sentencia, texto_parametros, ms)
+        else:
+            with self._lock:
+                self._fondo.agregar(sentencia, texto_parametros, ms)
+
+    def _error(self, contexto):
+        # Si la sentencia falla after_cursor_execute no llega: sacar su inicio de la pila
+        conn = contexto.connection
+        if conn is not None and not conn.closed:
+            pila = conn.info.get("perfil_sql_inicio")
+            if pila:
+                pila.pop()
+
+    def _devuelta(self, dbapi_conn, registro_conexion):
+        # Al volver al pool no queda ninguna sentencia en curso
+        registro_conexion.info.pop("perfil_sql_inicio", None)
+
+    # ===== Por comando =====
+
+    def medir(self, comando):
+        """Context manager que atribuye al comando las consultas de este hilo"""
+        # perfil y perfil_sql miden a otros comandos: no se cuentan a sí mismos
+        if not self.activo or comando in ("perfil_sql", "perfil"):
+            return nullcontext()
+        return self._medir(comando)
+
+    @contextmanager
+    def _medir(self, comando):
+        previo = getattr(self._local, "registro", None)
+        registro = RegistroComando()
+        self._local.registro = registro
+        try:
+            yield registro
+        finally:
+            self._local.registro = previo
+            self._cerrar(comando, registro)
+
+    def _cerrar(self, comando, registro):
+        resumen = registro.resumen()
+
+        with self._lock:
+            acumulado = self.historial.setdefault(comando, {
+                'ejecuciones': 0, 'consultas': 0, 'ms_sql': 0.0, 'max_consultas': 0, 'ultima': None
+            })
+            acumulado['ejecuciones'] += 1
+            acumulado['consultas'] += resumen['consultas']
+            acumulado['ms_sql'] = round(acumulado['ms_sql'] + resumen['ms_sql'], 2)
+            acumulado['max_consultas'] = max(acumulado['max_consultas'], resumen['consultas'])
+            acumulado['ultima'] = resumen
+
+        print(self.linea(comando, resumen))
+        self.guardar()
+
+    @staticmethod
+    def linea(comando, resumen):
+        texto = f"🔎 SQL [{comando}]: {resumen['consultas']} consultas, {resumen['ms_sql']:.1f} ms"
+        if resumen['repetidas']:
+            mayor = resumen['repetidas'][0]
+            texto += f" | repetida {mayor['veces']}x: {mayor['sql'][:70]}"
+        return texto
+
+    # ===== Reporte =====
+
+    def guardar(self):
+        from core.benchmark import guardar_benchmark
+
+        with self._lock:
+            datos = {'comandos': dict(self.historial), 'fondo': self._fondo.resumen()}
+        try:
+            guardar_benchmark("sql", datos)
+        except OSError as e:
+            logger.warning("No se pudo guardar el perfil SQL: %s", e)
+
+    def reporte(self):
+        with self._lock:
+            historial = sorted(self.historial.items(), key=lambda x: x[1]['consultas'], reverse=True)
+            fondo = self._fondo.resumen()
+
+        lineas = [f"\n🔎 Perfil SQL ({'activo' if self.activo else 'inactivo'})\n"]
+        if not historial and not fondo['consultas']:
+            lineas.append("   Sin consultas registradas")
+            return "\n".join(lineas)
+
+        lineas.append(f"   {'Comando':<24} {'Veces':>6} {'Consultas':>10} {'Máx':>6} {'ms SQL':>9}")
+        lineas.append("   " + "─" * 60)
+        for comando, datos in historial:
+            lineas.append(f"   {comando:<24} {datos['ejecuciones']:>6} {datos['consultas']:>10} "
+                          f"{datos['max_consultas']:>6} {datos['ms_sql']:>9.1f}")
+        lineas.append(f"   {SIN_COMANDO:<24} {'':>6} {fondo['consultas']:>10} {'':>6} {fondo['ms_sql']:>9.1f}")
+
+        return "\n".join(lineas)
+
+
+# ===== INSTANCIA GLOBAL =====
+PERFIL_SQL = PerfilSQL()
+
+
+def comando_perfil_sql(args):
+    """perfil_sql [on|off|ver|reset]"""
+    accion = args[0].lower() if args else ("off" if PERFIL_SQL.activo else "on")
+
+    if accion in ("on", "activar"):
+        PERFIL_SQL.activar()
+        return "[LOBO] 🔎 Perfil SQL activado: cada comando muestra sus consultas (logs/benchmark.json, sección 'sql')"
+    if accion in ("off", "desactivar"):
+        PERFIL_SQL.desactivar()
+        return "[LOBO] Perfil SQL desactivado"
+    if accion == "reset":
+        PERFIL_SQL.reiniciar()
+        return "[LOBO] Perfil SQL reiniciado"
+    if accion == "ver":
+        return PERFIL_SQL.reporte()
+
+    return "[LOBO] Uso: perfil_sql [on|off|ver|reset]"
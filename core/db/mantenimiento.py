@@ -0,0 +1,174 @@
+# core/db/mantenimiento.py
+"""
+Mantenimiento de lobo.db
+- quick_check antes de tocar nada (una DB dañada no se compacta)
+- PRAGMA optimize + ANALYZE: estadísticas frescas para el planificador
+- auto_vacuum=INCREMENTAL (se migra una vez con un VACUUM completo) e
+  incremental_vacuum para devolver al disco las páginas libres
+- Reporte de filas y páginas por tabla; tiempos de cada paso en la bitácora
+"""
+
+import logging
+import time
+
+from core.db.db import engine
+
+logger = logging.getLogger(__name__)
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _pragma(cursor, nombre):
+    fila = cursor.execute(f"PRAGMA {nombre}").fetchone()
+    return fila[0] if fila else None
+
+
+def asegurar_vacuum_incremental(cursor):
+    """
+    Pasa la DB a auto_vacuum=INCREMENTAL si aún no lo está
+
+    El modo solo cambia tras un VACUUM completo, así que se hace una vez.
+
+    Returns:
+        bool: True si hubo que migrar
+    """
+    if _pragma(cursor, "auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+        return False
+
+    logger.info("🔧 Migrando lobo.db a auto_vacuum=INCREMENTAL (VACUUM completo, solo una vez)")
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.execute("VACUUM")
+    return True
+
+
+def uso_por_tabla(cursor):
+    """
+    Filas y páginas de cada tabla (con sus índices)
+
+    Returns:
+        list[dict]: {'tabla', 'filas', 'paginas', 'bytes'}; páginas y bytes son
+                    None si SQLite no trae la tabla virtual dbstat
+    """
+    tablas = [fila[0] for fila in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    indices = dict(cursor.execute(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'"
+    ).fetchall())
+
+    paginas = {}
+    try:
+        for nombre, cantidad, tamano in cursor.execute("SELECT name, COUNT(*), SUM(pgsize) FROM dbstat GROUP BY name"):
+            tabla = indices.get(nombre, nombre)
+            previo = paginas.get(tabla, (0, 0))
+            paginas[tabla] = (previo[0] + cantidad, previo[1] + tamano)
+    except Exception:
+        paginas = None
+
+    reporte = []
+    for tabla in tablas:
+        filas = cursor.execute(f'SELECT COUNT(*) FROM "{tabla}"').fetchone()[0]
+        uso = paginas.get(tabla, (0, 0)) if paginas is not None else (None, None)
+        reporte.append({'tabla': tabla, 'filas': filas, 'paginas': uso[0], 'bytes': uso[1]})
+
+    return reporte
+
+
+def ejecutar_mantenimiento():
+    """
+    Corre todos los pasos y devuelve el reporte
+
+    Returns:
+        dict: {
+            'integridad': "ok" o lista de problemas,
+            'migrado': bool (se pasó a auto_vacuum incremental),
+            'tiempos': {paso: ms},
+            'tamano_antes' / 'tamano_despues': bytes,
+            'paginas_libres': páginas libres que quedaron,
+            'tablas': uso_por_tabla()
+        }
+    """
+    tiempos = {}
+
+    def medir(paso, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos[paso] = round((time.perf_counter() - inicio) * 1000, 1)
+        return resultado
+
+    # Conexión DBAPI directa: VACUUM no puede correr dentro de una transacción
+    conexion = engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        tamano_pagina = _pragma(cursor, "page_size")
+        tamano_antes = _pragma(cursor, "page_count") * tamano_pagina
+
+        problemas = medir("quick_check", lambda: [fila[0] for fila in cursor.execute("PRAGMA quick_check")])
+        integridad = "ok" if problemas == ["ok"] else problemas
+
+        migrado = False
+        if integridad == "ok":
+            migrado = medir("auto_vacuum", lambda: asegurar_vacuum_incremental(cursor))
+            medir("optimize", lambda: cursor.execute("PRAGMA optimize"))
+            medir("analyze", lambda: cursor.execute("ANALYZE"))
+            # Cada fila leída libera un lote de páginas: hay que consumirlas todas
+            medir("incremental_vacuum", lambda: cursor.execute("PRAGMA incremental_vacuum").fetchall())
+            conexion.commit()
+        else:
+            logger.error(f"❌ quick_check encontró problemas: {problemas[:5]}")
+
+        tablas = medir("reporte", lambda: uso_por_tabla(cursor))
+        tamano_despues = _pragma(cursor, "page_count") * tamano_pagina
+        libres = _pragma(cursor, "freelist_count")
+    finally:
+        conexion.close()
+
+    return {
+        'integridad': integridad,
+        'migrado': migrado,
+        'tiempos': tiempos,
+        'tamano_antes': tamano_antes,
+        'tamano_despues': tamano_despues,
+        'paginas_libres': libres,
+        'tablas': tablas,
+    }
+
+
+def registrar_en_bitacora(reporte, usuario="system"):
+    from core.context.logs import BITACORA
+
+    tiempos = ", ".join(f"{paso} {ms:.0f}ms" for paso, ms in reporte['tiempos'].items())
+    liberado = (reporte['tamano_antes'] - reporte['tamano_despues']) // 1024
+    BITACORA.registrar("sistema", "mantenimiento_db",
+                       f"integridad={'ok' if reporte['integridad'] == 'ok' else 'ERROR'}; "
+                       f"{liberado} KB liberados; {tiempos}",
+                       usuario)
+
+
+def _kb(valor):
+    return f"{valor / 1024:.0f} KB" if valor is not None else "—"
+
+
+def comando_mantenimiento_db(args):
+    """Corre el mantenimiento y muestra el uso por tabla"""
+    from core.context.global_session import SESSION
+
+    print("\n🔧 Mantenimiento de la base de datos...")
+    reporte = ejecutar_mantenimiento()
+    registrar_en_bitacora(reporte, SESSION.user.username if SESSION.user else "system")
+
+    print(f"\n   {'Tabla':<20} {'Filas':>8} {'Páginas':>8} {'Tamaño':>10}")
+    print("   " + "─" * 50)
+    for uso in reporte['tablas']:
+        paginas = uso['paginas'] if uso['paginas'] is not None else "—"
+        print(f"   {uso['tabla']:<20} {uso['filas']:>8} {paginas:>8} {_kb(uso['bytes']):>10}")
+
+    print("\n   Tiempos: " + ", ".join(f"{paso} {ms:.0f} ms" for paso, ms in reporte['tiempos'].items()))
+    if reporte['migrado']:
+        print("   auto_vacuum migrado a INCREMENTAL")
+
+    if reporte['integridad'] != "ok":
+        return f"[LOBO] ❌ quick_check encontró problemas: {'; '.join(reporte['integridad'][:5])}"
+
+    return (f"[LOBO] ✅ Mantenimiento completo: {_kb(reporte['tamano_antes'])} → "
+            f"{_kb(reporte['tamano_despues'])} ({reporte['paginas_libres']} páginas libres)")
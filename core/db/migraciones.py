@@ -0,0 +1,174 @@
+# core/db/migraciones.py
+"""
+Migraciones de esquema versionadas con PRAGMA user_version
+
+- Al arrancar se lee user_version (una sola consulta); si la DB está al día
+  no se refleja ni se crea nada
+- Las pendientes se aplican en orden, cada una en su propia transacción
+  junto con el nuevo user_version: o queda todo o no queda nada
+- Para cambiar el esquema: agregar una función al final de MIGRACIONES
+  (nunca editar ni reordenar las ya publicadas)
+- La migración 1 crea lo que falte del esquema actual; por eso las que
+  agregan columnas revisan antes si ya existen (en una DB nueva ya vienen).
+  Los índices sobre columnas nuevas van en su propia migración, no en la 1
+"""
+
+import json
+import logging
+
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from core.db.db import engine
+from core.db.schema import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _columnas(cursor, tabla):
+    return {fila[1] for fila in cursor.execute(f'PRAGMA table_info("{tabla}")')}
+
+
+def _agregar_columnas(cursor, tabla, columnas):
+    """
+    ALTER TABLE ... ADD COLUMN de las que falten
+
+    Returns:
+        set: nombres de las columnas agregadas
+    """
+    existentes = _columnas(cursor, tabla)
+    agregadas = set()
+    for nombre, tipo in columnas.items():
+        if nombre not in existentes:
+            cursor.execute(f'ALTER TABLE "{tabla}" ADD COLUMN {nombre} {tipo}')
+            agregadas.add(nombre)
+    return agregadas
+
+
+# ============================================================================
+# Migraciones (la posición en la lista + 1 es su versión)
+# ============================================================================
+
+def _m001_tablas_e_indices(cursor):
+    """Tablas e índices del esquema que aún no existan (antes: create_all en cada arranque)"""
+    for tabla in Base.metadata.sorted_tables:
+        cursor.execute(str(CreateTable(tabla, if_not_exists=True).compile(dialect=engine.dialect)))
+        for indice in tabla.indexes:
+            cursor.execute(str(CreateIndex(indice, if_not_exists=True).compile(dialect=engine.dialect)))
+
+
+def _m002_recurrencia_eventos(cursor):
+    """Campos de series y tipo de evento (antes: core/db/migration_agenda.py)"""
+    agregadas = _agregar_columnas(cursor, "eventos", {
+        'es_maestro': 'INTEGER DEFAULT 0',
+        'master_id': 'TEXT',
+        'modificado_manualmente': 'INTEGER DEFAULT 0',
+        'tipo_evento': "TEXT DEFAULT 'personal'",
+        'alarma_minutos': 'INTEGER DEFAULT 5',
+        'alarma_activa': 'INTEGER DEFAULT 1',
+        'color_custom': 'TEXT',
+    })
+
+    # Tipo deducido de las etiquetas, solo si la columna es nueva (no pisar lo que eligió el usuario)
+    if 'tipo_evento' not in agregadas:
+        return
+
+    tipos = (
+        ("clase", ("clase", "escuela", "universidad")),
+        ("trabajo", ("trabajo", "oficina", "junta")),
+        ("deporte", ("deporte", "gym", "ejercicio")),
+        ("estudio", ("estudio", "tarea", "examen")),
+        ("reunion", ("reunion", "meeting")),
+    )
+    cambios = []
+    for evento_id, etiquetas_json in cursor.execute("SELECT id, etiquetas FROM eventos").fetchall():
+        try:
+            etiquetas = json.loads(etiquetas_json) if etiquetas_json else []
+        except ValueError:
+            continue
+        tipo = next((t for t, claves in tipos if any(tag in claves for tag in etiquetas)), None)
+        if tipo:
+            cambios.append((tipo, evento_id))
+
+    cursor.executemany("UPDATE eventos SET tipo_evento = ? WHERE id = ?", cambios)
+
+
+def _m003_campos_recordatorios(cursor):
+    """Fecha límite, prioridad y estado de recordatorios (antes: core/db/migration_recordatorios.py)"""
+    agregadas = _agregar_columnas(cursor, "memory", {
+        'fecha_limite': 'DATE',
+        'hora_limite': 'TIME',
+        'prioridad': 'INTEGER DEFAULT 5',
+        'estado': "TEXT DEFAULT 'pendiente'",
+        'creado_por': "TEXT DEFAULT 'system'",
+    })
+
+    # ADD COLUMN ... DEFAULT ya llena las filas existentes con el default:
+    # la prioridad por tipo solo se calcula si la columna es nueva
+    if 'prioridad' in agregadas:
+        cursor.execute("""
+            UPDATE memory SET prioridad = CASE type
+                WHEN 'urgente' THEN 1 WHEN 'importante' THEN 2 WHEN 'tarea' THEN 3 ELSE 5 END
+        """)
+    cursor.execute("UPDATE memory SET estado = 'pendiente' WHERE estado IS NULL")
+
+
+MIGRACIONES = [
+    _m001_tablas_e_indices,
+    _m002_recurrencia_eventos,
+    _m003_campos_recordatorios,
+]
+
+VERSION_ACTUAL = len(MIGRACIONES)
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+def version_db():
+    """PRAGMA user_version de lobo.db"""
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrar():
+    """
+    Aplica las migraciones pendientes
+
+    Returns:
+        list[str]: nombres de las migraciones aplicadas (vacía si ya estaba al día)
+    """
+    version = version_db()
+    if version >= VERSION_ACTUAL:
+        return []
+
+    aplicadas = []
+
+    # DBAPI directa en modo autocommit: la transacción se abre y cierra a mano,
+    # así el DDL, los UPDATE y el user_version van juntos
+    conexion = engine.raw_connection()
+    driver = conexion.driver_connection
+    nivel_previo = driver.isolation_level
+    driver.isolation_level = None
+
+    try:
+        cursor = driver.cursor()
+        for numero in range(version + 1, VERSION_ACTUAL + 1):
+            migracion = MIGRACIONES[numero - 1]
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                migracion(cursor)
+                cursor.execute(f"PRAGMA user_version = {numero}")
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                logger.error("Falló la migración %d (%s)", numero, migracion.__name__)
+                raise
+
+            aplicadas.append(migracion.__name__)
+            logger.info("Migración %d aplicada: %s", numero, (migracion.__doc__ or migracion.__name__).strip())
+    finally:
+        driver.isolation_level = nivel_previo
+        conexion.close()
+
+    return aplicadas
@@ -3,6 +3,9 @@
 Script de migración para agregar campos de recurrencia a tabla Evento
 SIN PERDER DATOS EXISTENTES
 
+Reemplazado por core/db/migraciones.py (migración 2), que init_db()
+aplica sola al arrancar. Se conserva como referencia.
+
 Ejecutar UNA SOLA VEZ: python -m core.db.migration_agenda
 """
 
@@ -10,7 +13,7 @@ import sqlite3
 import os
 from datetime import datetime
 
-DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../database/lobo.db'))
+from core.db.db import DB_PATH  # Ruta única del registro (respeta LOBO_DB)
 
 
 def migrar_agenda():
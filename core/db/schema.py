@@ -73,7 +73,7 @@ class Evento(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     nombre = Column(String, nullable=False)
     descripcion = Column(String)
-    fecha_inicio = Column(Date, nullable=False)
+    fecha_inicio = Column(Date, nullable=False, index=True)
     hora_inicio = Column(Time, nullable=False)
     hora_fin = Column(Time, nullable=False)
     recurrencia = Column(SAEnum(RecurrenciaEnum), default=RecurrenciaEnum.unico)
@@ -94,4 +94,16 @@ class Evento(Base):
 
     def __repr__(self):
         tipo = "MAESTRO" if self.es_maestro else f"INSTANCIA({self.master_id[:8]})" if self.master_id else "ÚNICO"
-        return f"<Evento[{tipo}](nombre='{self.nombre}', fecha={self.fecha_inicio}, {self.hora_inicio}-{self.hora_fin})>"
\ No newline at end of file
+        return f"<Evento[{tipo}](nombre='{self.nombre}', fecha={self.fecha_inicio}, {self.hora_inicio}-{self.hora_fin})>"
+
+# Alarmas pendientes (persisten entre reinicios)
+class Alarma(Base):
+    __tablename__ = "alarmas"
+
+    evento_id = Column(String, primary_key=True)  # Una alarma pendiente por evento
+    disparo = Column(DateTime, nullable=False, index=True)  # Momento en que suena
+    anticipacion_minutos = Column(Integer, default=5)
+    creada_en = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Alarma(evento_id='{self.evento_id}', disparo={self.disparo})>"
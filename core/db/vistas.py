@@ -0,0 +1,122 @@
+# core/db/vistas.py
+"""
+Modelos de solo lectura (vistas) para las rutas de visualización
+
+- Se cargan con SELECT de columnas (sin identity map ni estado ORM)
+- Clases con __slots__: menos memoria por fila y sin DetachedInstanceError
+- De solo lectura por convención: no se bloquea la asignación (costaría en
+  cada fila construida) y un cambio en la vista nunca llega a la DB
+- Para escribir se sigue usando el modelo ORM de core.db.schema
+"""
+
+from sqlalchemy import select
+from core.db.schema import Evento, MemoryNote
+
+
+class EventoVista:
+    """Proyección de una fila de `eventos` (solo lectura: no se guarda)"""
+
+    __slots__ = (
+        "id", "nombre", "descripcion", "fecha_inicio", "hora_inicio", "hora_fin",
+        "recurrencia", "etiquetas", "es_maestro", "master_id", "modificado_manualmente",
+        "tipo_evento", "alarma_minutos", "alarma_activa", "color_custom"
+    )
+
+    COLUMNAS = (
+        Evento.id, Evento.nombre, Evento.descripcion, Evento.fecha_inicio,
+        Evento.hora_inicio, Evento.hora_fin, Evento.recurrencia, Evento.etiquetas,
+        Evento.es_maestro, Evento.master_id, Evento.modificado_manualmente,
+        Evento.tipo_evento, Evento.alarma_minutos, Evento.alarma_activa, Evento.color_custom
+    )
+
+    def __init__(self, id, nombre, descripcion, fecha_inicio, hora_inicio, hora_fin,
+                 recurrencia, etiquetas, es_maestro, master_id, modificado_manualmente,
+                 tipo_evento, alarma_minutos, alarma_activa, color_custom):
+        self.id = id
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.fecha_inicio = fecha_inicio
+        self.hora_inicio = hora_inicio
+        self.hora_fin = hora_fin
+        self.recurrencia = recurrencia
+        self.etiquetas = etiquetas or []
+        self.es_maestro = bool(es_maestro)
+        self.master_id = master_id
+        self.modificado_manualmente = bool(modificado_manualmente)
+        self.tipo_evento = tipo_evento or "personal"
+        self.alarma_minutos = alarma_minutos
+        self.alarma_activa = alarma_activa
+        self.color_custom = color_custom
+
+    @property
+    def es_serie(self):
+        """True si es maestro o instancia de una serie recurrente"""
+        return self.es_maestro or self.master_id is not None
+
+    def __repr__(self):
+        tipo = "MAESTRO" if self.es_maestro else f"INSTANCIA({self.master_id[:8]})" if self.master_id else "ÚNICO"
+        return f"<EventoVista[{tipo}](nombre='{self.nombre}', fecha={self.fecha_inicio}, {self.hora_inicio}-{self.hora_fin})>"
+
+
+class RecordatorioVista:
+    """Proyección de una fila de `memory` (solo lectura: no se guarda)"""
+
+    __slots__ = (
+        "id", "type", "content", "timestamp", "fecha_limite", "hora_limite",
+        "prioridad", "estado", "creado_por"
+    )
+
+    COLUMNAS = (
+        MemoryNote.id, MemoryNote.type, MemoryNote.content, MemoryNote.timestamp,
+        MemoryNote.fecha_limite, MemoryNote.hora_limite, MemoryNote.prioridad,
+        MemoryNote.estado, MemoryNote.creado_por
+    )
+
+    def __init__(self, id, type, content, timestamp, fecha_limite, hora_limite,
+                 prioridad, estado, creado_por):
+        self.id = id
+        self.type = type
+        self.content = content
+        self.timestamp = timestamp
+        self.fecha_limite = fecha_limite
+        self.hora_limite = hora_limite
+        self.prioridad = prioridad
+        self.estado = estado
+        self.creado_por = creado_por
+
+    def __repr__(self):
+        return f"<RecordatorioVista(type='{self.type}', content='{self.content}', estado='{self.estado}')>"
+
+
+def _proyectar(session, vista, criterios, orden, limite):
+    stmt = select(*vista.COLUMNAS)
+    if criterios:
+        stmt = stmt.where(*criterios)
+    if orden:
+        stmt = stmt.order_by(*orden)
+    if limite:
+        stmt = stmt.limit(limite)
+
+    # Ruta rápida: filas como tuplas planas, sin construir objetos Row ni entidades ORM
+    return [vista(*fila) for fila in session.execute(stmt).tuples()]
+
+
+def consultar_eventos(session, *criterios, orden=(Evento.fecha_inicio, Evento.hora_inicio), limite=None):
+    """
+    SELECT de columnas sobre `eventos`
+
+    Args:
+        session: sesión abierta (se puede cerrar justo después)
+        *criterios: expresiones SQLAlchemy para el WHERE
+        orden: columnas ORDER BY
+        limite: LIMIT opcional
+
+    Returns:
+        list[EventoVista]
+    """
+    return _proyectar(session, EventoVista, criterios, orden, limite)
+
+
+def consultar_recordatorios(session, *criterios, orden=(MemoryNote.timestamp.desc(),), limite=None):
+    """SELECT de columnas sobre `memory` -> list[RecordatorioVista]"""
+    return _proyectar(session, RecordatorioVista, criterios, orden, limite)
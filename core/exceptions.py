@@ -127,3 +127,17 @@ class ConfigError(LOBOError):
 
     def __init__(self, message: str = "Error de configuración.", details: str = ""):
         super().__init__(message, module="config", details=details)
+
+
+# ─────────────────────────────────────────────
+# Google Sheets
+# ─────────────────────────────────────────────
+
+class SheetsError(LOBOError):
+    """
+    Fallo al escribir o leer en Google Sheets tras agotar los reintentos.
+    Ejemplos: trozo de un lote rechazado, cuota excedida de forma persistente.
+    """
+
+    def __init__(self, message: str = "Error en Google Sheets.", details: str = ""):
+        super().__init__(message, module="sheets", details=details)
@@ -0,0 +1,209 @@
+# core/lobo_google/escritor_lotes.py
+"""
+Escritor por lotes a nivel de spreadsheet
+- Acumula rangos de MUCHAS hojas ("'03-09 Nov'!I1:I60") y los envía juntos
+- 1 values_batch_clear + 1 values_batch_update + 1 batch_update de formato por envío
+- Cuerpos grandes se parten en trozos por bytes serializados y por número de
+  elementos, sin separar los elementos de una misma hoja si se puede evitar
+- Cada trozo se reintenta por separado; el informe dice cuántos trozos se usaron
+- Los repeatCell contiguos con el mismo estilo se fusionan antes de enviar
+"""
+
+import json
+import logging
+import time
+from gspread.utils import absolute_range_name
+from core.lobo_google.estilos import fusionar_formatos, repeat_cell
+from core.lobo_google.rate_limiter import RATE_LIMITER
+from core.exceptions import SheetsError
+
+logger = logging.getLogger(__name__)
+
+# Margen holgado bajo el tamaño práctico de un request del API de Sheets
+MAX_BYTES_PAYLOAD = 2 * 1024 * 1024
+# Elementos por trozo: requests de formato o rangos de valores
+MAX_ELEMENTOS_TROZO = 500
+
+REINTENTOS_TROZO = 3
+ESPERA_REINTENTO = 2.0  # segundos, se duplica en cada intento
+
+
+def _tamano(item):
+    return len(json.dumps(item, ensure_ascii=False).encode('utf-8'))
+
+
+def trozos_por_tamano(items, max_bytes=MAX_BYTES_PAYLOAD, max_elementos=MAX_ELEMENTOS_TROZO, clave=None):
+    """
+    Parte una lista en trozos consecutivos (el orden global se conserva)
+
+    Args:
+        items: elementos serializables a JSON
+        max_bytes: tamaño serializado máximo por trozo
+        max_elementos: número máximo de elementos por trozo
+        clave: función item -> hoja. Si se da, los cortes se hacen en el último
+               cambio de hoja del trozo, para no repartir una hoja en dos trozos
+
+    Returns:
+        list[list]: trozos
+    """
+    trozos = []
+    trozo = []
+    bytes_trozo = 0
+    corte = 0  # índice en `trozo` donde empieza la hoja actual
+
+    for item in items:
+        tamano = _tamano(item)
+
+        if trozo and (bytes_trozo + tamano > max_bytes or len(trozo) >= max_elementos):
+            if clave is not None and 0 < corte:
+                # Cortar antes de la hoja a medias y arrastrarla al trozo siguiente
+                trozos.append(trozo[:corte])
+                trozo = trozo[corte:]
+                bytes_trozo = sum(_tamano(i) for i in trozo)
+                # Si la hoja arrastrada más el elemento tampoco caben, la hoja va sola
+                if bytes_trozo + tamano > max_bytes or len(trozo) >= max_elementos:
+                    trozos.append(trozo)
+                    trozo = []
+                    bytes_trozo = 0
+            else:
+                trozos.append(trozo)
+                trozo = []
+                bytes_trozo = 0
+            corte = 0
+
+        if clave is not None and trozo and clave(item) != clave(trozo[-1]):
+            corte = len(trozo)
+
+        trozo.append(item)
+        bytes_trozo += tamano
+
+    if trozo:
+        trozos.append(trozo)
+
+    return trozos
+
+
+def _hoja_de_rango(rango):
+    return rango.rsplit('!', 1)[0]
+
+
+def _hoja_de_dato(dato):
+    return _hoja_de_rango(dato['range'])
+
+
+def _hoja_de_formato(request):
+    # Todos los requests de formato de LOBO llevan un 'range' con sheetId
+    cuerpo = next(iter(request.values()), {})
+    return cuerpo.get('range', {}).get('sheetId') if isinstance(cuerpo, dict) else None
+
+
+class EscritorLotes:
+    """
+    Acumula limpiezas, valores y formato de varias hojas y los envía juntos
+
+    Uso:
+        escritor = EscritorLotes(spreadsheet)
+        escritor.limpiar(hoja, "I1:I60")
+        escritor.escribir(hoja, "I1:I60", valores)
+        escritor.formatear(*requests)
+        informe = escritor.enviar()
+    """
+
+    def __init__(self, spreadsheet, value_input_option='RAW',
+                 max_bytes=MAX_BYTES_PAYLOAD, max_elementos=MAX_ELEMENTOS_TROZO):
+        self.spreadsheet = spreadsheet
+        self.value_input_option = value_input_option
+        self.max_bytes = max_bytes
+        self.max_elementos = max_elementos
+
+        self._limpiezas = []
+        self._datos = []
+        self._formatos = []
+
+    @staticmethod
+    def _rango(hoja, rango):
+        titulo = hoja if isinstance(hoja, str) else hoja.title
+        return absolute_range_name(titulo, rango)
+
+    def limpiar(self, hoja, rango):
+        self._limpiezas.append(self._rango(hoja, rango))
+
+    def escribir(self, hoja, rango, valores):
+        self._datos.append({'range': self._rango(hoja, rango), 'values': valores})
+
+    def formatear(self, *requests):
+        self._formatos.extend(requests)
+
+    def formatear_rango(self, hoja, rango, formato):
+        """Equivalente a worksheet.format(rango, formato), pero acumulado en el lote"""
+        self._formatos.append(repeat_cell(hoja.id, rango, formato))
+
+    def __len__(self):
+        return len(self._limpiezas) + len(self._datos) + len(self._formatos)
+
+    def enviar(self):
+        """
+        Envía lo acumulado: primero limpiezas, luego valores y al final formato
+
+        Returns:
+            dict: informe {'trozos': {'limpieza', 'valores', 'formato'},
+                           'requests': int, 'reintentos': int}
+
+        Raises:
+            SheetsError: si algún trozo falla tras agotar sus reintentos
+                         (los demás trozos sí se envían)
+        """
+        informe = {'trozos': {}, 'requests': 0, 'reintentos': 0}
+        fallidos = []
+        formatos = fusionar_formatos(self._formatos)
+
+        fases = [
+            ('limpieza', self._limpiezas, _hoja_de_rango,
+             lambda rangos: self.spreadsheet.values_batch_clear(body={'ranges': rangos})),
+            ('valores', self._datos, _hoja_de_dato,
+             lambda datos: self.spreadsheet.values_batch_update(
+                 body={'valueInputOption': self.value_input_option, 'data': datos})),
+            ('formato', formatos, _hoja_de_formato,
+             lambda requests: self.spreadsheet.batch_update({'requests': requests})),
+        ]
+
+        for fase, items, clave, enviar_trozo in fases:
+            trozos = trozos_por_tamano(items, self.max_bytes, self.max_elementos, clave)
+            informe['trozos'][fase] = len(trozos)
+
+            for n, trozo in enumerate(trozos, 1):
+                ok, reintentos = self._enviar_trozo(enviar_trozo, trozo)
+                informe['requests'] += 1 + reintentos
+                informe['reintentos'] += reintentos
+                if not ok:
+                    fallidos.append(f"{fase} {n}/{len(trozos)}")
+
+        logger.debug(f"📤 Lote enviado: {len(self._limpiezas)} limpiezas, {len(self._datos)} rangos, "
+                     f"{len(formatos)}/{len(self._formatos)} formatos (tras fusionar) en {informe['trozos']} trozos")
+
+        self._limpiezas.clear()
+        self._datos.clear()
+        self._formatos.clear()
+
+        if fallidos:
+            raise SheetsError("No se pudo enviar parte del lote.", details=", ".join(fallidos))
+
+        return informe
+
+    @staticmethod
+    def _enviar_trozo(enviar_trozo, trozo):
+        """Envía un trozo con reintentos y espera exponencial. Retorna (ok, reintentos)"""
+        espera = ESPERA_REINTENTO
+
+        for intento in range(REINTENTOS_TROZO + 1):
+            RATE_LIMITER.wait_if_needed()
+            try:
+                enviar_trozo(trozo)
+                return True, intento
+            except Exception as e:
+                if intento == REINTENTOS_TROZO:
+                    logger.error(f"❌ Trozo de {len(trozo)} elementos falló tras {intento} reintentos: {e}")
+                    return False, intento
+                logger.warning(f"⚠️  Trozo falló ({e}); reintentando en {espera:.0f}s...")
+                time.sleep(espera)
+                espera *= 2
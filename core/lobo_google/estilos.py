@@ -0,0 +1,181 @@
+# core/lobo_google/estilos.py
+"""
+Registro de estilos de celda para los requests de formato
+- Cada estilo se construye una vez por clave (tipo de evento, prioridad, encabezado)
+  y los formatos idénticos comparten el mismo dict
+- Formatos estáticos (encabezados): se recuerda por hoja cuáles ya se aplicaron
+  para no reenviarlos en cada sync; las copias de la plantilla heredan los de ella
+- fusionar_formatos() junta repeatCell contiguos con el mismo estilo en uno solo
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+RUTA_ESTILOS_APLICADOS = os.path.join("data", "estilos_hojas.json")
+
+
+def _clave_contenido(formato):
+    return json.dumps(formato, sort_keys=True, ensure_ascii=False)
+
+
+def _huella(definicion):
+    return hashlib.sha1(_clave_contenido(definicion).encode('utf-8')).hexdigest()[:12]
+
+
+def color(rgb):
+    """(r, g, b) -> color de la API"""
+    r, g, b = rgb
+    return {"red": r, "green": g, "blue": b}
+
+
+class RegistroEstilos:
+    """Estilos de celda deduplicados + formatos estáticos ya aplicados por hoja"""
+
+    def __init__(self, ruta=RUTA_ESTILOS_APLICADOS):
+        self.ruta = ruta
+        self._por_clave = {}  # clave -> formato canónico
+        self._por_contenido = {}  # json del formato -> formato canónico
+        self._aplicados = None  # {str(sheetId): {nombre: huella}}, se carga al primer uso
+
+    # ===== Estilos =====
+
+    def obtener(self, clave, fabrica):
+        """
+        Formato de celda para `clave`; `fabrica()` solo se llama la primera vez
+
+        Dos claves con el mismo contenido (p.ej. un tipo de evento y una
+        prioridad con el mismo color) devuelven el mismo dict.
+        """
+        formato = self._por_clave.get(clave)
+        if formato is None:
+            nuevo = fabrica()
+            formato = self._por_contenido.setdefault(_clave_contenido(nuevo), nuevo)
+            self._por_clave[clave] = formato
+        return formato
+
+    def __len__(self):
+        return len(self._por_contenido)
+
+    # ===== Formatos estáticos por hoja =====
+
+    def _cargar(self):
+        if self._aplicados is not None:
+            return self._aplicados
+
+        self._aplicados = {}
+        if os.path.exists(self.ruta):
+            try:
+                with open(self.ruta, 'r', encoding='utf-8') as f:
+                    self._aplicados = json.load(f)
+            except (OSError, ValueError):
+                self._aplicados = {}
+        return self._aplicados
+
+    def _guardar(self):
+        try:
+            os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+            with open(self.ruta, 'w', encoding='utf-8') as f:
+                json.dump(self._aplicados, f, indent=4)
+        except OSError as e:
+            logger.warning(f"⚠️  No se pudo guardar el registro de estilos: {e}")
+
+    def pendientes(self, sheet_id, estaticos):
+        """
+        Nombres de `estaticos` que la hoja aún no tiene (o que cambiaron)
+
+        Args:
+            sheet_id: id de la hoja
+            estaticos: {nombre: definición}; la definición entra en la huella,
+                       así que cambiar un encabezado lo vuelve a enviar
+        """
+        aplicados = self._cargar().get(str(sheet_id), {})
+        return [nombre for nombre, definicion in estaticos.items()
+                if aplicados.get(nombre) != _huella(definicion)]
+
+    def marcar(self, sheet_id, estaticos, nombres=None):
+        """Registra que la hoja ya tiene esos formatos estáticos (tras enviarlos)"""
+        aplicados = self._cargar().setdefault(str(sheet_id), {})
+        for nombre in (estaticos if nombres is None else nombres):
+            aplicados[nombre] = _huella(estaticos[nombre])
+        self._guardar()
+
+    def heredar(self, sheet_id_origen, sheet_id_copia):
+        """Una hoja duplicada trae los formatos que tenía su origen (la plantilla)"""
+        origen = self._cargar().get(str(sheet_id_origen))
+        if origen:
+            self._aplicados[str(sheet_id_copia)] = dict(origen)
+            self._guardar()
+
+    def olvidar(self, sheet_id):
+        if self._cargar().pop(str(sheet_id), None) is not None:
+            self._guardar()
+
+
+def repeat_cell(sheet_id, rango, formato, completo=False):
+    """
+    repeatCell para un rango de la API (dict con índices) o A1 ("B2:H31")
+
+    Args:
+        completo: reemplazar todo el userEnteredFormat (si no, solo las claves de `formato`)
+    """
+    if isinstance(rango, str):
+        from gspread.utils import a1_range_to_grid_range
+        rango = a1_range_to_grid_range(rango)
+
+    campos = "userEnteredFormat" if completo else "userEnteredFormat(" + ",".join(formato.keys()) + ")"
+    return {
+        "repeatCell": {
+            "range": {"sheetId": sheet_id, **rango},
+            "cell": {"userEnteredFormat": formato},
+            "fields": campos
+        }
+    }
+
+
+def _contiguos(a, b):
+    """Rango unido si `b` continúa a `a` hacia abajo o hacia la derecha; si no, None"""
+    claves = ("startRowIndex", "endRowIndex", "startColumnIndex", "endColumnIndex")
+    if a.get("sheetId") != b.get("sheetId") or any(k not in a or k not in b for k in claves):
+        return None
+
+    if (a["startColumnIndex"], a["endColumnIndex"]) == (b["startColumnIndex"], b["endColumnIndex"]) \
+            and a["endRowIndex"] == b["startRowIndex"]:
+        return {**a, "endRowIndex": b["endRowIndex"]}
+
+    if (a["startRowIndex"], a["endRowIndex"]) == (b["startRowIndex"], b["endRowIndex"]) \
+            and a["endColumnIndex"] == b["startColumnIndex"]:
+        return {**a, "endColumnIndex": b["endColumnIndex"]}
+
+    return None
+
+
+def fusionar_formatos(requests):
+    """
+    Junta repeatCell consecutivos con el mismo estilo y rangos contiguos
+
+    Solo se fusionan requests seguidos en la lista, así el orden de aplicación
+    (y por tanto el resultado en la hoja) no cambia.
+    """
+    resultado = []
+
+    for request in requests:
+        previo = resultado[-1] if resultado else None
+        if previo is not None and "repeatCell" in request and "repeatCell" in previo:
+            a, b = previo["repeatCell"], request["repeatCell"]
+            if a["fields"] == b["fields"] and _clave_contenido(a["cell"]) == _clave_contenido(b["cell"]):
+                rango = _contiguos(a["range"], b["range"])
+                if rango is not None:
+                    resultado[-1] = {"repeatCell": {**a, "range": rango}}
+                    continue
+
+        resultado.append(request)
+
+    return resultado
+
+
+# ===== INSTANCIA GLOBAL =====
+ESTILOS = RegistroEstilos()
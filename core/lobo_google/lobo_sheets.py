@@ -13,6 +13,7 @@ SCOPES = [
 # ===== CACHE GLOBAL =====
 _client_cache = None
 _spreadsheet_cache = None
+_historial_cache = {}  # nombre -> gspread.Spreadsheet
 
 
 def get_client():
@@ -51,6 +52,44 @@ def get_spreadsheet():
     return _spreadsheet_cache
 
 
+def get_spreadsheet_historial(nombre):
+    """
+    Obtiene el spreadsheet de historial (cacheado)
+
+    La primera vez se busca por nombre (búsqueda en Drive) y se guarda su key
+    en la configuración; después se abre directo por key.
+
+    Returns:
+        gspread.Spreadsheet
+    """
+    if nombre in _historial_cache:
+        return _historial_cache[nombre]
+
+    from core.config import Config
+    from core.lobo_google.rate_limiter import RATE_LIMITER
+
+    config = Config()
+    keys = config.data.setdefault('spreadsheets_historial', {})
+    client = get_client()
+
+    spreadsheet = None
+    if nombre in keys:
+        RATE_LIMITER.wait_if_needed()
+        try:
+            spreadsheet = client.open_by_key(keys[nombre])
+        except gspread.exceptions.SpreadsheetNotFound:
+            spreadsheet = None
+
+    if spreadsheet is None:
+        RATE_LIMITER.wait_if_needed()
+        spreadsheet = client.open(nombre)
+        keys[nombre] = spreadsheet.id
+        config.save_config()
+
+    _historial_cache[nombre] = spreadsheet
+    return spreadsheet
+
+
 def get_sheet(fecha=None):
     """
     Obtiene una hoja específica del spreadsheet
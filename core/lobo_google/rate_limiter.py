@@ -8,6 +8,7 @@ import time
 import threading
 import logging
 from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class GoogleSheetsRateLimiter:
         self.window_seconds = 60
         self.requests_timestamps = deque()
         self.lock = threading.Lock()
+        self._local = threading.local()  # Contador del hilo actual (contar_en_hilo)
 
         # Estadísticas
         self.total_requests = 0
@@ -38,6 +40,10 @@ class GoogleSheetsRateLimiter:
         Espera si se ha alcanzado el límite de requests
         Thread-safe
         """
+        contador = getattr(self._local, "contador", None)
+        if contador is not None:
+            contador['llamadas'] += 1
+
         with self.lock:
             now = time.time()
 
@@ -81,6 +87,27 @@ class GoogleSheetsRateLimiter:
                     f"En ventana: {len(self.requests_timestamps)}/{self.max_requests}"
                 )
 
+    @contextmanager
+    def contar_en_hilo(self):
+        """
+        Cuenta los requests que hace ESTE hilo mientras dura el bloque
+        (los de otros hilos y tareas de fondo no se suman)
+
+        Uso:
+            with RATE_LIMITER.contar_en_hilo() as contador:
+                ...
+            contador['llamadas']
+        """
+        previo = getattr(self._local, "contador", None)
+        contador = {'llamadas': 0}
+        self._local.contador = contador
+        try:
+            yield contador
+        finally:
+            self._local.contador = previo
+            if previo is not None:
+                previo['llamadas'] += contador['llamadas']
+
     def reset(self):
         """Resetea el contador (útil para testing)"""
         with self.lock:
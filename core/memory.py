@@ -2,6 +2,7 @@
 
 from core.db.db import SessionLocal  # migrado desde core.db.sessions
 from core.db.schema import MemoryNote
+from core.db.vistas import consultar_recordatorios
 from sqlalchemy import and_, func
 from sqlalchemy.orm.exc import NoResultFound
 from core.context.logs import BITACORA
@@ -70,45 +71,47 @@ class Memory:
         self.db.refresh(nota)
         return nota
 
+    # Las lecturas retornan RecordatorioVista (solo lectura); las escrituras buscan por ID
+
     def recall(self, mem_type=None, estado="pendiente", incluir_completadas=False):
-        query = self.db.query(MemoryNote)
+        criterios = []
         if mem_type:
-            query = query.filter_by(type=mem_type)
+            criterios.append(MemoryNote.type == mem_type)
         if not incluir_completadas and estado:
-            query = query.filter_by(estado=estado)
-        return query.order_by(MemoryNote.timestamp.desc()).all()
+            criterios.append(MemoryNote.estado == estado)
+        return consultar_recordatorios(self.db, *criterios)
 
     def recall_vencidos(self):
         hoy = date.today()
-        return self.db.query(MemoryNote).filter(
-            and_(
-                MemoryNote.fecha_limite < hoy,
-                MemoryNote.estado == "pendiente"
-            )
-        ).order_by(MemoryNote.fecha_limite.asc()).all()
+        return consultar_recordatorios(
+            self.db,
+            MemoryNote.fecha_limite < hoy,
+            MemoryNote.estado == "pendiente",
+            orden=(MemoryNote.fecha_limite.asc(),)
+        )
 
     def recall_proximos(self, dias=3):
         hoy = date.today()
         from datetime import timedelta
         fecha_limite = hoy + timedelta(days=dias)
 
-        return self.db.query(MemoryNote).filter(
-            and_(
-                MemoryNote.fecha_limite.between(hoy, fecha_limite),
-                MemoryNote.estado == "pendiente"
-            )
-        ).order_by(MemoryNote.fecha_limite.asc(), MemoryNote.prioridad.asc()).all()
+        return consultar_recordatorios(
+            self.db,
+            MemoryNote.fecha_limite.between(hoy, fecha_limite),
+            MemoryNote.estado == "pendiente",
+            orden=(MemoryNote.fecha_limite.asc(), MemoryNote.prioridad.asc())
+        )
 
     def recall_por_fecha(self, fecha):
         if isinstance(fecha, str):
             fecha = datetime.strptime(fecha, "%d/%m/%Y").date()
 
-        return self.db.query(MemoryNote).filter(
-            and_(
-                MemoryNote.fecha_limite == fecha,
-                MemoryNote.estado == "pendiente"
-            )
-        ).order_by(MemoryNote.hora_limite.asc(), MemoryNote.prioridad.asc()).all()
+        return consultar_recordatorios(
+            self.db,
+            MemoryNote.fecha_limite == fecha,
+            MemoryNote.estado == "pendiente",
+            orden=(MemoryNote.hora_limite.asc(), MemoryNote.prioridad.asc())
+        )
 
     def recall_por_semana(self, fecha_inicio):
         from datetime import timedelta
@@ -118,24 +121,24 @@ class Memory:
 
         fecha_fin = fecha_inicio + timedelta(days=6)
 
-        return self.db.query(MemoryNote).filter(
-            and_(
-                MemoryNote.fecha_limite.between(fecha_inicio, fecha_fin),
-                MemoryNote.estado == "pendiente"
+        return consultar_recordatorios(
+            self.db,
+            MemoryNote.fecha_limite.between(fecha_inicio, fecha_fin),
+            MemoryNote.estado == "pendiente",
+            orden=(
+                MemoryNote.fecha_limite.asc(),
+                MemoryNote.hora_limite.asc(),
+                MemoryNote.prioridad.asc()
             )
-        ).order_by(
-            MemoryNote.fecha_limite.asc(),
-            MemoryNote.hora_limite.asc(),
-            MemoryNote.prioridad.asc()
-        ).all()
+        )
 
     def recall_por_prioridad(self, prioridad_min=1, prioridad_max=5):
-        return self.db.query(MemoryNote).filter(
-            and_(
-                MemoryNote.prioridad.between(prioridad_min, prioridad_max),
-                MemoryNote.estado == "pendiente"
-            )
-        ).order_by(MemoryNote.prioridad.asc(), MemoryNote.fecha_limite.asc()).all()
+        return consultar_recordatorios(
+            self.db,
+            MemoryNote.prioridad.between(prioridad_min, prioridad_max),
+            MemoryNote.estado == "pendiente",
+            orden=(MemoryNote.prioridad.asc(), MemoryNote.fecha_limite.asc())
+        )
 
     def completar(self, note_id):
         try:
@@ -192,17 +195,15 @@ class Memory:
 
     def buscar_por_contenido(self, texto: str, mem_type: str = None, estado: str = "pendiente"):
         patron = f"%{texto}%"
-        query = self.db.query(MemoryNote).filter(
-            func.lower(MemoryNote.content).like(func.lower(patron))
-        )
+        criterios = [func.lower(MemoryNote.content).like(func.lower(patron))]
 
         if mem_type:
-            query = query.filter(MemoryNote.type == mem_type)
+            criterios.append(MemoryNote.type == mem_type)
 
         if estado:
-            query = query.filter(MemoryNote.estado == estado)
+            criterios.append(MemoryNote.estado == estado)
 
-        return query.all()
+        return consultar_recordatorios(self.db, *criterios, orden=(MemoryNote.id.asc(),))
 
     def eliminar_por_id(self, note_id: int) -> bool:
         try:
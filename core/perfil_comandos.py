@@ -0,0 +1,161 @@
+# core/perfil_comandos.py
+"""
+Perfil de comandos del router
+- Siempre activo y barato: duración de cada comando en una ventana móvil
+  por comando (histograma + percentiles), visible con stats_comandos
+- Bajo demanda: perfil <comando ...> corre el comando con cProfile y muestra
+  tiempo total, funciones con más tiempo acumulado, consultas SQL y llamadas
+  a la API de Sheets del hilo del comando (las que pasan por RATE_LIMITER);
+  el .prof queda en logs/ (pstats, snakeviz)
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+CARPETA_PERFILES = "logs"
+VENTANA = 200  # Últimas ejecuciones que se guardan por comando
+CUBETAS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+TOP_FUNCIONES = 15
+
+
+class HistogramaComandos:
+    """Duraciones recientes de cada comando"""
+
+    def __init__(self, ventana=VENTANA):
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._duraciones = {}  # comando -> deque de ms
+        self._totales = {}  # comando -> ejecuciones desde el arranque
+
+    def registrar(self, comando, ms):
+        with self._lock:
+            duraciones = self._duraciones.get(comando)
+            if duraciones is None:
+                duraciones = self._duraciones[comando] = deque(maxlen=self.ventana)
+            duraciones.append(ms)
+            self._totales[comando] = self._totales.get(comando, 0) + 1
+
+    @staticmethod
+    def _percentil(ordenadas, p):
+        return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+    def resumen(self):
+        """
+        Returns:
+            dict: {comando: {'ejecuciones', 'p50_ms', 'p90_ms', 'max_ms', 'cubetas'}}
+        """
+        with self._lock:
+            copia = {comando: sorted(duraciones) for comando, duraciones in self._duraciones.items()}
+            totales = dict(self._totales)
+
+        resumen = {}
+        for comando, ordenadas in copia.items():
+            cubetas = [0] * (len(CUBETAS_MS) + 1)
+            for ms in ordenadas:
+                cubetas[next((i for i, limite in enumerate(CUBETAS_MS) if ms < limite), len(CUBETAS_MS))] += 1
+
+            resumen[comando] = {
+                'ejecuciones': totales[comando],
+                'p50_ms': round(self._percentil(ordenadas, 0.5), 1),
+                'p90_ms': round(self._percentil(ordenadas, 0.9), 1),
+                'max_ms': round(ordenadas[-1], 1),
+                'cubetas': cubetas,
+            }
+        return resumen
+
+
+# ===== INSTANCIA GLOBAL =====
+HISTOGRAMA_COMANDOS = HistogramaComandos()
+
+
+def _barra(cubetas):
+    """Mini histograma de texto, una columna por cubeta"""
+    niveles = " ▁▂▃▄▅▆▇█"
+    mayor = max(cubetas) or 1
+    return "".join(niveles[round(c * (len(niveles) - 1) / mayor)] for c in cubetas)
+
+
+def comando_stats_comandos(args):
+    """Duraciones recientes de cada comando (p50, p90, máximo e histograma)"""
+    resumen = HISTOGRAMA_COMANDOS.resumen()
+    if not resumen:
+        return "[LOBO] Aún no se ha ejecutado ningún comando"
+
+    from core.benchmark import guardar_benchmark
+    try:
+        guardar_benchmark("comandos", {'cubetas_ms': list(CUBETAS_MS), 'comandos': resumen})
+    except OSError as e:
+        logger.warning("No se pudieron guardar las estadísticas de comandos: %s", e)
+
+    etiquetas = "<" + " <".join(str(c) for c in CUBETAS_MS) + f" ≥{CUBETAS_MS[-1]}"
+    lineas = [f"\n⏱️  Comandos (últimas {VENTANA} ejecuciones de cada uno)\n",
+              f"   {'Comando':<24} {'Veces':>6} {'p50 ms':>9} {'p90 ms':>9} {'máx ms':>9}  Histograma",
+              "   " + "─" * 78]
+    for comando, datos in sorted(resumen.items(), key=lambda x: x[1]['p90_ms'], reverse=True):
+        lineas.append(f"   {comando:<24} {datos['ejecuciones']:>6} {datos['p50_ms']:>9.1f} "
+                      f"{datos['p90_ms']:>9.1f} {datos['max_ms']:>9.1f}  {_barra(datos['cubetas'])}")
+    lineas.append(f"\n   Cubetas (ms): {etiquetas}")
+
+    return "\n".join(lineas)
+
+
+# ============================================================================
+# perfil <comando ...>
+# ============================================================================
+
+def comando_perfil(args):
+    """perfil <comando> [args...]: corre un comando con cProfile"""
+    from core.router import comandos
+    from core.db.instrumentacion import PERFIL_SQL
+    from core.lobo_google.rate_limiter import RATE_LIMITER
+
+    if not args:
+        return "[LOBO] Uso: perfil <comando> [argumentos]"
+
+    nombre, argumentos = args[0].lower(), args[1:]
+    funcion = comandos.get(nombre)
+    if funcion is None or nombre == "perfil":
+        return f"[LOBO] Comando no reconocido: '{nombre}'"
+
+    # SQL: se activa el perfil solo durante este comando si no estaba activo
+    sql_previo = PERFIL_SQL.activo
+    PERFIL_SQL.activar()
+
+    perfilador = cProfile.Profile()
+    try:
+        with RATE_LIMITER.contar_en_hilo() as sheets, PERFIL_SQL.medir(nombre) as sql:
+            inicio = time.perf_counter()
+            perfilador.enable()
+            try:
+                resultado = funcion(argumentos)
+            finally:
+                perfilador.disable()
+                total_ms = (time.perf_counter() - inicio) * 1000
+    finally:
+        if not sql_previo:
+            PERFIL_SQL.desactivar()
+
+    os.makedirs(CARPETA_PERFILES, exist_ok=True)
+    ruta = os.path.join(CARPETA_PERFILES, f"perfil_{nombre}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+    perfilador.dump_stats(ruta)
+
+    salida = io.StringIO()
+    pstats.Stats(perfilador, stream=salida).strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCIONES)
+
+    if resultado:
+        print(resultado)
+    print(salida.getvalue())
+    consultas, ms_sql = (sql.consultas, sql.ms) if sql is not None else (0, 0.0)
+    print(f"⏱️  {nombre}: {total_ms:.1f} ms | SQL: {consultas} consultas ({ms_sql:.1f} ms) | "
+          f"Sheets API: {sheets['llamadas']} llamadas")
+
+    return f"[LOBO] Perfil guardado en {ruta}"
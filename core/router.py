@@ -1,46 +1,92 @@
 # core/router.py
 from core.context.global_session import SESSION
-from modules.recordatorios.recordatorios import Recordatorios
-from modules.usuarios.usuarios import comando_nuevo_usuario, comando_eliminar_usuario
-from modules.bitacora.bitacora import comando_ver_bitacora, Bitacora
+from core.db.instrumentacion import PERFIL_SQL
+from core.perfil_comandos import HISTOGRAMA_COMANDOS
+from modules.bitacora.bitacora import Bitacora
+import importlib
 import shlex
-from modules.agenda.agenda import AgendaAPI
-from modules.alarma.alarma import AlarmManager
-from modules.agenda.agenda_optimizer import NUEVOS_COMANDOS
-from modules.agenda.agenda_fixes import COMANDOS_FIXES
+import threading
+import time
+
+
+# ===== REGISTRO PEREZOSO =====
+# Los módulos de cada comando se importan en su primer uso: importar agenda
+# arrastra gspread/google-auth y no hace falta para mostrar el prompt.
+
+class _InstanciaPerezosa:
+    """Proxy que crea la instancia real la primera vez que se usa (una sola vez aunque haya varios hilos)"""
+
+    def __init__(self, modulo, clase):
+        self._modulo = modulo
+        self._clase = clase
+        self._instancia = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        instancia = self._instancia
+        if instancia is None:
+            with self._lock:
+                if self._instancia is None:
+                    self._instancia = getattr(importlib.import_module(self._modulo), self._clase)()
+                instancia = self._instancia
+        return getattr(instancia, name)
+
+
+def _perezoso(modulo, funcion):
+    """Handler que importa `modulo.funcion` al despacharse por primera vez"""
+
+    def handler(args):
+        return getattr(importlib.import_module(modulo), funcion)(args)
+
+    handler.__name__ = funcion
+    return handler
+
+
+def _alarmas():
+    from modules.alarma.alarma import ALARMAS
+    return ALARMAS
 
 
 bitacora = Bitacora()
-recordatorios = Recordatorios()
-agenda = AgendaAPI()
-alarmas = AlarmManager()
+recordatorios = _InstanciaPerezosa("modules.recordatorios.recordatorios", "Recordatorios")
+agenda = _InstanciaPerezosa("modules.agenda.agenda", "AgendaAPI")
 
 comandos = {
     # ===== RECORDATORIOS =====
-    "guardar": recordatorios.guardar,
-    "recordar": recordatorios.recordar,
-    "completar": recordatorios.completar,
-    "eliminar_recuerdo": recordatorios.eliminar,
+    "guardar": lambda args: recordatorios.guardar(args),
+    "recordar": lambda args: recordatorios.recordar(args),
+    "completar": lambda args: recordatorios.completar(args),
+    "eliminar_recuerdo": lambda args: recordatorios.eliminar(args),
 
     # ===== USUARIOS =====
-    "nuevo_usuario": comando_nuevo_usuario,
-    "eliminar_usuario": comando_eliminar_usuario,
+    "nuevo_usuario": _perezoso("modules.usuarios.usuarios", "comando_nuevo_usuario"),
+    "eliminar_usuario": _perezoso("modules.usuarios.usuarios", "comando_eliminar_usuario"),
 
     # ===== BITÁCORA =====
-    "ver_bitacora": comando_ver_bitacora,
+    "ver_bitacora": _perezoso("modules.bitacora.bitacora", "comando_ver_bitacora"),
 
     # ===== AGENDA =====
-    "agregar_evento": agenda.agregar_evento,
-    "eliminar_evento": agenda.eliminar_evento,
-    "editar_evento": agenda.editar_evento,
-    "ver_eventos": agenda.ver_eventos,
-    "buscar_evento": agenda.buscar_evento,
-    "limpiar_agenda": agenda.clear_sheets,
-    "importar_agenda": agenda.importar_desde_sheets,
+    "agregar_evento": lambda args: agenda.agregar_evento(args),
+    "eliminar_evento": lambda args: agenda.eliminar_evento(args),
+    "editar_evento": lambda args: agenda.editar_evento(args),
+    "ver_eventos": lambda args: agenda.ver_eventos(args),
+    "buscar_evento": lambda args: agenda.buscar_evento(args),
+    "limpiar_agenda": lambda args: agenda.clear_sheets(args),
+    "importar_agenda": lambda args: agenda.importar_desde_sheets(args),
     "ver_disponibilidad": lambda args: _ver_disponibilidad(args),
-    **NUEVOS_COMANDOS,  # Esto agrega: guardar_plantilla, listar_plantillas, aplicar_plantilla, sincronizar_todo
+    "exportar_agenda": _perezoso("modules.agenda.renderizadores", "comando_exportar_agenda"),
+
+    # ===== PLANTILLAS (agenda_optimizer.NUEVOS_COMANDOS) =====
+    "guardar_plantilla": _perezoso("modules.agenda.agenda_optimizer", "comando_guardar_plantilla"),
+    "listar_plantillas": _perezoso("modules.agenda.agenda_optimizer", "comando_listar_plantillas"),
+    "aplicar_plantilla": _perezoso("modules.agenda.agenda_optimizer", "comando_aplicar_plantilla"),
+    "sincronizar_todo": _perezoso("modules.agenda.agenda_optimizer", "comando_sincronizar_todo"),
 
-    **COMANDOS_FIXES, # Agrega: sincronizar_real, limpiar_db_pasados, guardar_plantilla_desde, reordenar_hojas
+    # ===== FIXES (agenda_fixes.COMANDOS_FIXES) =====
+    "sincronizar_real": _perezoso("modules.agenda.agenda_fixes", "comando_sincronizar_real"),
+    "limpiar_db_pasados": _perezoso("modules.agenda.agenda_fixes", "comando_limpiar_db_pasados"),
+    "guardar_plantilla_desde": _perezoso("modules.agenda.agenda_fixes", "comando_guardar_plantilla_desde"),
+    "reordenar_hojas": _perezoso("modules.agenda.agenda_fixes", "comando_reordenar_hojas"),
 
     # ===== GESTIÓN DE HOJAS =====
     "inicializar_hojas": lambda args: _inicializar_hojas(),
@@ -50,27 +96,39 @@ comandos = {
 
     # ===== ALARMAS =====
     "programar_alarma": lambda args: "[ALARMA] " + (
-        str(alarmas.programar_alarma(args[0], int(args[1])) if len(args) >= 2 else alarmas.programar_alarma(args[0]))),
-    "cancelar_alarma": lambda args: "[ALARMA] " + (str(alarmas.cancelar_alarma(args[0]))),
+        str(_alarmas().programar_alarma(args[0], int(args[1])) if len(args) >= 2 else _alarmas().programar_alarma(args[0]))),
+    "cancelar_alarma": lambda args: "[ALARMA] " + (str(_alarmas().cancelar_alarma(args[0]))),
 
     # ===== SINCRONIZACIÓN =====
-    "sync_recordatorios": lambda args: _sync_recordatorios_sheets(),
+    "sync_recordatorios": lambda args: _sync_recordatorios_sheets(args),
     "sync_recordatorios_todas": lambda args: _sync_recordatorios_todas_hojas(),
 
+    # ===== RUNTIME =====
+    "tareas": lambda args: _ver_tareas(),
+    "mantenimiento_db": _perezoso("core.db.mantenimiento", "comando_mantenimiento_db"),
+    "perfil_sql": _perezoso("core.db.instrumentacion", "comando_perfil_sql"),
+    "perfil": _perezoso("core.perfil_comandos", "comando_perfil"),
+    "stats_comandos": _perezoso("core.perfil_comandos", "comando_stats_comandos"),
+
     # ===== AYUDA =====
     "ayuda": lambda args: _mostrar_ayuda(args),
     "help": lambda args: _mostrar_ayuda(args),
 }
 
 
-def _sync_recordatorios_sheets():
-    """Sincroniza recordatorios con Google Sheets (solo hoja actual)"""
+def _sync_recordatorios_sheets(args):
+    """Sincroniza recordatorios con Google Sheets (solo hojas con cambios)"""
     try:
-        from modules.recordatorios.recordatorios_sheets import actualizar_recordatorios_sheets
-        if actualizar_recordatorios_sheets():
-            return "[LOBO] ✅ Recordatorios sincronizados con Sheets (hoja actual)"
-        else:
-            return "[LOBO] ⚠️  Error al sincronizar recordatorios"
+        from modules.recordatorios.recordatorios_sheets import sincronizar_recordatorios, MODOS_SYNC
+
+        modo = args[0].lower() if args else "cambios"
+        if modo not in MODOS_SYNC:
+            return f"[LOBO] ❌ Modo inválido. Usa: sync_recordatorios [{'|'.join(MODOS_SYNC)}]"
+
+        hojas = sincronizar_recordatorios(modo)
+        if hojas:
+            return f"[LOBO] ✅ Recordatorios sincronizados ({hojas} hojas con cambios)"
+        return "[LOBO] ✅ Recordatorios ya estaban al día en Sheets"
     except Exception as e:
         return f"[LOBO] ❌ Error: {e}"
 
@@ -194,6 +252,12 @@ def _reordenar_hojas():
         return f"[LOBO] ❌ Error: {e}"
 
 
+def _ver_tareas():
+    """Estado de las tareas de fondo del runtime"""
+    from core.runtime import RUNTIME
+    return RUNTIME.supervisor.resumen()
+
+
 def _mostrar_ayuda(args):
     """Muestra ayuda de comandos"""
     if not args:
@@ -213,11 +277,12 @@ AGENDA
   ver_eventos [dia|semana|mes]
   editar_evento <id> campo=valor
   eliminar_evento <id>
-  buscar_evento "texto"
+  buscar_evento "texto" [--historico]   # --historico: incluye semanas archivadas
   ver_disponibilidad [fecha]
+  exportar_agenda [ics|csv|html|sheets] [semanas=N]   # Vistas locales sin cuota
 
 SINCRONIZACIÓN
-  sync_recordatorios
+  sync_recordatorios [inicio|cambios|completo]
   sync_recordatorios_todas
   limpiar_agenda
   importar_agenda
@@ -234,6 +299,12 @@ HOJAS MÚLTIPLES
 SISTEMA
   ayuda <comando>        # Ayuda específica
   ver_bitacora [limite]  # Solo admin
+  tareas                 # Tareas de fondo
+  mantenimiento_db       # ANALYZE, vacuum incremental y uso por tabla
+  perfil_sql [on|off|ver|reset]  # Consultas SQL por comando
+  perfil <comando ...>   # cProfile de un comando (logs/*.prof)
+  stats_comandos         # Duración de cada comando (p50/p90)
+  <comando> &            # Ejecutar en segundo plano
   salir / exit
 
 ═══════════════════════════════════════════════════════════
@@ -260,13 +331,17 @@ class Router:
 
         if nombre_comando in comandos:
             funcion = comandos[nombre_comando]
+            inicio = time.perf_counter()
             try:
-                resultado = funcion(argumentos)
+                with PERFIL_SQL.medir(nombre_comando):
+                    resultado = funcion(argumentos)
                 return resultado if resultado is not None else "[LOBO] ✅ Comando ejecutado."
             except Exception as e:
                 bitacora.registrar("router", "error", f"Error al ejecutar {nombre_comando}: {str(e)}",
                                    SESSION.user.username)
                 return f"[LOBO] ❌ Error al ejecutar '{nombre_comando}': {e}"
+            finally:
+                HISTOGRAMA_COMANDOS.registrar(nombre_comando, (time.perf_counter() - inicio) * 1000)
 
         # Sugerencias de comandos similares
         sugerencias = self._sugerir_comando(nombre_comando)
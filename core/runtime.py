@@ -0,0 +1,267 @@
+# core/runtime.py
+"""
+Runtime asíncrono de LOBO
+- Un solo event loop aloja el REPL y las tareas de fondo
+- gspread y SQLAlchemy son bloqueantes: se ejecutan fuera del loop vía en_executor()
+- Comandos (también los de '&') en un hilo propio y de a uno: comparten
+  Sessions globales (Memory, Recordatorios, AgendaAPI) que no son thread-safe
+- Tareas del Supervisor en otro hilo: abren sus propias sesiones, así una
+  sincronización o un VACUUM largos no detienen el siguiente comando
+- El Supervisor reinicia tareas que fallan con espera exponencial
+"""
+
+import asyncio
+import functools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Un hilo para comandos: nunca corren dos a la vez sobre las Sessions globales
+EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lobo-cmd")
+# Un hilo para tareas de fondo: entre ellas van de a una (el rate limiter serializa igual)
+EXECUTOR_FONDO = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lobo-fondo")
+
+
+async def en_executor(func, *args, executor=None, **kwargs):
+    """Ejecuta una función bloqueante fuera del event loop (por defecto en el hilo de comandos)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+# ============================================================================
+# Lector de líneas asíncrono
+# ============================================================================
+
+class LectorAsync:
+    """
+    Lee líneas de stdin en un hilo daemon dedicado.
+
+    El hilo solo llama a input() cuando el REPL lo pide, así los comandos
+    interactivos (confirmaciones [Y/N]) pueden usar input() sin competir por stdin.
+    """
+
+    def __init__(self):
+        self._peticiones = queue.Queue()
+        self._hilo = None
+
+    async def leer(self, prompt=""):
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._peticiones.put((prompt, futuro, loop))
+
+        if not self._hilo or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._bucle, name="lobo-stdin", daemon=True)
+            self._hilo.start()
+
+        return await futuro
+
+    def _bucle(self):
+        while True:
+            prompt, futuro, loop = self._peticiones.get()
+            try:
+                linea = input(prompt)
+                loop.call_soon_threadsafe(self._resolver, futuro, linea, None)
+            except BaseException as e:  # EOFError, KeyboardInterrupt en Windows
+                loop.call_soon_threadsafe(self._resolver, futuro, None, e)
+
+    @staticmethod
+    def _resolver(futuro, valor, error):
+        if futuro.done():
+            return
+        if error is not None:
+            futuro.set_exception(error)
+        else:
+            futuro.set_result(valor)
+
+
+# ============================================================================
+# Supervisor de tareas de fondo
+# ============================================================================
+
+class TareaFondo:
+    """Definición y estado de una tarea de fondo"""
+
+    def __init__(self, nombre, funcion, intervalo=None, retraso=0.0, executor=None):
+        self.nombre = nombre
+        self.funcion = funcion  # callable bloqueante sin argumentos
+        self.intervalo = intervalo  # segundos entre ejecuciones; None = una sola vez
+        self.retraso = retraso  # segundos antes de la primera ejecución
+        self.executor = executor or EXECUTOR_FONDO
+
+        self.task = None
+        self.ejecuciones = 0
+        self.fallos_seguidos = 0
+        self.ultima_ejecucion = None
+        self.ultimo_error = None
+        self.ultima_duracion = None
+
+
+class Supervisor:
+    """Ejecuta y vigila tareas de fondo dentro del event loop"""
+
+    BACKOFF_MAX = 15 * 60  # segundos
+
+    def __init__(self):
+        self.tareas = {}
+
+    def registrar(self, nombre, funcion, intervalo=None, retraso=0.0, executor=None):
+        """
+        Registra una tarea. Si el supervisor ya corre, la lanza de inmediato.
+
+        Args:
+            nombre: identificador único
+            funcion: callable bloqueante sin argumentos; debe abrir sus propias
+                     sesiones de DB (no las globales de los comandos)
+            intervalo: segundos entre ejecuciones (None = una sola vez)
+            retraso: segundos antes de la primera ejecución
+            executor: hilo donde corre (por defecto EXECUTOR_FONDO)
+        """
+        tarea = TareaFondo(nombre, funcion, intervalo, retraso, executor)
+        self.tareas[nombre] = tarea
+
+        try:
+            asyncio.get_running_loop()
+            tarea.task = asyncio.create_task(self._ejecutar(tarea), name=f"lobo-{nombre}")
+        except RuntimeError:
+            pass  # Sin loop todavía: se lanza en iniciar()
+
+        return tarea
+
+    def iniciar(self):
+        """Lanza las tareas registradas (llamar dentro del event loop)"""
+        for tarea in self.tareas.values():
+            if tarea.task is None or tarea.task.done():
+                tarea.task = asyncio.create_task(self._ejecutar(tarea), name=f"lobo-{tarea.nombre}")
+
+    async def detener(self):
+        pendientes = [t.task for t in self.tareas.values() if t.task and not t.task.done()]
+        for task in pendientes:
+            task.cancel()
+        await asyncio.gather(*pendientes, return_exceptions=True)
+
+    async def _ejecutar(self, tarea):
+        if tarea.retraso:
+            await asyncio.sleep(tarea.retraso)
+
+        while True:
+            inicio = time.perf_counter()
+            try:
+                await en_executor(tarea.funcion, executor=tarea.executor)
+                tarea.fallos_seguidos = 0
+                tarea.ultimo_error = None
+                espera = tarea.intervalo
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                tarea.fallos_seguidos += 1
+                tarea.ultimo_error = str(e)
+                logger.exception("Tarea de fondo '%s' falló: %s", tarea.nombre, e)
+
+                # Reintento con espera exponencial (30s, 60s, 120s... hasta BACKOFF_MAX)
+                espera = min(30 * 2 ** (tarea.fallos_seguidos - 1), self.BACKOFF_MAX)
+                if tarea.intervalo:
+                    espera = min(espera, tarea.intervalo)
+                if tarea.intervalo is None and tarea.fallos_seguidos >= 3:
+                    espera = None  # Tarea única: rendirse tras 3 intentos
+            finally:
+                tarea.ejecuciones += 1
+                tarea.ultima_ejecucion = datetime.now()
+                tarea.ultima_duracion = time.perf_counter() - inicio
+
+            if espera is None:
+                return
+            await asyncio.sleep(espera)
+
+    def resumen(self):
+        """Texto con el estado de las tareas (comando 'tareas')"""
+        if not self.tareas:
+            return "[LOBO] No hay tareas de fondo registradas."
+
+        lines = ["\n⚙️  Tareas de fondo:"]
+        for tarea in self.tareas.values():
+            if tarea.task and not tarea.task.done():
+                estado = "🟢 activa"
+            elif tarea.ultimo_error:
+                estado = "🔴 falló"
+            else:
+                estado = "⚪ terminada"
+
+            ultima = tarea.ultima_ejecucion.strftime("%H:%M:%S") if tarea.ultima_ejecucion else "—"
+            cada = f"cada {tarea.intervalo // 60:.0f} min" if tarea.intervalo else "una vez"
+            lines.append(f"  • {tarea.nombre:<22} {estado:<14} {cada:<14} última: {ultima} "
+                         f"({tarea.ejecuciones} ejecuciones)")
+            if tarea.ultimo_error:
+                lines.append(f"      └─ {tarea.ultimo_error[:70]}")
+
+        return "\n".join(lines)
+
+
+# ============================================================================
+# Runtime
+# ============================================================================
+
+class Runtime:
+    """Event loop de LOBO: REPL + supervisor de tareas"""
+
+    COMANDOS_SALIDA = ("exit", "quit", "salir")
+
+    def __init__(self):
+        self.supervisor = Supervisor()
+        self.lector = LectorAsync()
+
+    async def repl(self, brain, prompt="LOBO > "):
+        """
+        Bucle interactivo. Cada comando corre en el hilo de comandos (fuera del
+        loop); las tareas de fondo siguen en el suyo mientras tanto.
+
+        Un comando terminado en '&' se encola en el hilo de comandos y el
+        prompt vuelve de inmediato (solo para comandos que no piden
+        confirmación); corre cuando terminen los anteriores.
+        """
+        while True:
+            try:
+                command = await self.lector.leer(prompt)
+            except (EOFError, KeyboardInterrupt):
+                print("\nSaliendo de LOBO...")
+                break
+
+            if command.strip().lower() in self.COMANDOS_SALIDA:
+                break
+
+            if command.rstrip().endswith("&"):
+                self._lanzar_en_fondo(brain, command.rstrip()[:-1].strip())
+                continue
+
+            response = await en_executor(brain.handle_command, command)
+            print(response)
+
+    def _lanzar_en_fondo(self, brain, command):
+        def ejecutar():
+            print(f"\n{brain.handle_command(command)}")
+
+        nombre = f"cmd:{command.split()[0] if command.split() else '?'}"
+        self.supervisor.registrar(nombre, ejecutar, executor=EXECUTOR)
+        print(f"[LOBO] ⏳ '{command}' corriendo en segundo plano (ver 'tareas')")
+
+    async def main(self, brain):
+        """Punto de entrada: inicia las tareas de fondo y corre el REPL"""
+        self.supervisor.iniciar()
+        try:
+            await self.repl(brain)
+        finally:
+            await self.supervisor.detener()
+
+    def ejecutar(self, brain):
+        try:
+            asyncio.run(self.main(brain))
+        except KeyboardInterrupt:
+            print("\nSaliendo de LOBO...")
+
+
+# ===== INSTANCIA GLOBAL =====
+RUNTIME = Runtime()
@@ -0,0 +1,98 @@
+# core/tareas_fondo.py
+"""
+Tareas de fondo de LOBO
+Se registran en el Supervisor del runtime y corren en el executor de I/O
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+MINUTO = 60
+HORA = 60 * MINUTO
+DIA = 24 * HORA
+
+
+def _preparar_sheets():
+    """Arranque: crea las hojas semanales si hace falta y sincroniza recordatorios"""
+    from core.config import Config
+
+    config = Config()
+    if not config.data.get('hojas_inicializadas', False):
+        from modules.agenda.sheets_manager import SHEETS_MANAGER
+
+        resultado = SHEETS_MANAGER.inicializar_sistema()
+        if resultado['hojas_creadas'] > 0:
+            logger.info("Hojas múltiples inicializadas: %d creadas", resultado['hojas_creadas'])
+            config.data['hojas_inicializadas'] = True
+            config.save_config()
+
+    # Hojas antiguas que solo tienen la fecha en el nombre: guardar su lunes como metadata
+    from core.lobo_google.lobo_sheets import get_spreadsheet
+    from modules.agenda.calendario_hojas import CALENDARIO_HOJAS
+    CALENDARIO_HOJAS.etiquetar_pendientes(get_spreadsheet())
+
+    # Solo semana actual y siguiente, y solo si cambiaron desde la última sincronización
+    from modules.recordatorios.recordatorios_sheets import sincronizar_recordatorios
+    sincronizar_recordatorios("inicio")
+
+
+def _sync_recordatorios():
+    from modules.recordatorios.recordatorios_sheets import sincronizar_recordatorios
+    sincronizar_recordatorios("cambios")
+
+
+def _refrescar_alarmas():
+    from modules.alarma.alarma import ALARMAS
+    ALARMAS.rehidratar()
+
+
+def _revisar_archivado():
+    from modules.agenda.auto_archivar import tarea_archivado
+    tarea_archivado()
+
+
+def _extender_series():
+    from modules.agenda.agenda_logics_recurrentes import extender_series
+
+    nuevas = extender_series()
+    if not nuevas:
+        return
+
+    # Las instancias dentro del horizonte de alarmas entran en el siguiente refresco
+    from modules.agenda.agenda_logics import pintar_evento_sheets
+    for instancia in nuevas:
+        try:
+            pintar_evento_sheets(instancia)
+        except Exception as e:
+            logger.warning("No se pudo pintar la instancia %s: %s", instancia.id[:8], e)
+
+
+def _mantenimiento_db():
+    """Mantenimiento de lobo.db una vez por semana (la última corrida queda en la configuración)"""
+    from datetime import date
+    from core.config import Config
+
+    config = Config()
+    ultima = config.data.get('ultimo_mantenimiento_db')
+    if ultima and (date.today() - date.fromisoformat(ultima)).days < 7:
+        return
+
+    from core.db.mantenimiento import ejecutar_mantenimiento, registrar_en_bitacora
+
+    reporte = ejecutar_mantenimiento()
+    registrar_en_bitacora(reporte)
+    logger.info("Mantenimiento de DB: %s en %.0f ms", reporte['integridad'], sum(reporte['tiempos'].values()))
+
+    config.data['ultimo_mantenimiento_db'] = date.today().isoformat()
+    config.save_config()
+
+
+def registrar_tareas(supervisor):
+    """Registra las tareas periódicas por defecto"""
+    supervisor.registrar("preparar_sheets", _preparar_sheets)
+    supervisor.registrar("sync_recordatorios", _sync_recordatorios, intervalo=6 * HORA, retraso=6 * HORA)
+    supervisor.registrar("alarmas", _refrescar_alarmas, intervalo=1 * HORA, retraso=1 * HORA)
+    supervisor.registrar("archivado", _revisar_archivado, intervalo=30 * MINUTO, retraso=5 * MINUTO)
+    supervisor.registrar("extender_series", _extender_series, intervalo=24 * HORA, retraso=10 * MINUTO)
+    supervisor.registrar("mantenimiento_db", _mantenimiento_db, intervalo=1 * DIA, retraso=30 * MINUTO)
@@ -1,8 +1,7 @@
 # force_create_tables.py
-from core.db.schema import Base, Evento  # importa todos tus modelos aquí
-from core.db.db import engine
+from core.db.migraciones import migrar
 
 if __name__ == "__main__":
-    print("[INFO] Forzando creación de tablas nuevas si no existen...")
-    Base.metadata.create_all(bind=engine)  # crea SOLO las que falten
-    print("[SUCCESS] Tablas listas.")
+    print("[INFO] Aplicando migraciones pendientes (tablas nuevas, columnas, índices)...")
+    aplicadas = migrar()  # crea SOLO lo que falte
+    print(f"[SUCCESS] Tablas listas ({len(aplicadas)} migraciones aplicadas).")
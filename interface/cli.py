@@ -3,14 +3,6 @@ class CLI:
         self.brain = brain
 
     def run(self):
+        from core.runtime import RUNTIME
         print("Bienvenido a L.O.B.O. — Lex Operativa, Bellum Ordinatum")
-        while True:
-            try:
-                command = input("LOBO > ")
-                if command.lower() in ["exit", "quit"]:
-                    break
-                response = self.brain.handle_command(command)
-                print(response)
-            except KeyboardInterrupt:
-                print("\nSaliendo de LOBO...")
-                break
\ No newline at end of file
+        RUNTIME.ejecutar(self.brain)
@@ -13,6 +13,7 @@ from modules.agenda.agenda_logics_recurrentes import (
     eliminar_instancia, eliminar_serie, obtener_info_serie
 )
 from modules.agenda.conflictos import CONFLICTOS
+from modules.alarma.alarma import ALARMAS
 from core.db.schema import RecurrenciaEnum
 from datetime import date, datetime, timedelta
 from core.context.logs import BITACORA
@@ -164,15 +165,14 @@ class AgendaAPI:
                     try:
                         logics.pintar_evento_sheets(instancia)
                         pintadas += 1
-
-                        # Programar alarma para cada instancia
-                        if instancia.alarma_activa:
-                            self._programar_alarma_automatica(instancia)
                     except Exception as e:
                         BITACORA.registrar("agenda", "error_sheets",
                                            f"Error al pintar instancia: {e}",
                                            SESSION.user.username)
 
+                # Programar alarmas de toda la serie en un solo lote
+                self._programar_alarma_automatica(*[i for i in instancias if i.alarma_activa])
+
                 BITACORA.registrar("agenda", "agregar_serie",
                                    f"Serie creada: {nombre} ({len(instancias)} instancias)",
                                    SESSION.user.username)
@@ -224,6 +224,7 @@ class AgendaAPI:
             ok = logics.eliminar_evento_db(evento_id_completo)
             if not ok:
                 return "[AGENDA] ❌ No se pudo borrar de DB."
+            ALARMAS.cancelar_lote([evento_id_completo])
 
             # Crear objeto temporal para borrar de sheets
             from core.db.schema import Evento as EventoTemp
@@ -256,6 +257,7 @@ class AgendaAPI:
             ok = logics.eliminar_evento_db(evento_id_completo)
             if not ok:
                 return "[AGENDA] ❌ No se pudo borrar de DB."
+            ALARMAS.cancelar_lote([evento_id_completo])
 
             # Crear objeto temporal para borrar de sheets (ya que evento fue eliminado de DB)
             evento_temp = type('obj', (object,), {
@@ -303,6 +305,7 @@ class AgendaAPI:
             if opcion == "1" and not info['es_maestro']:
                 # Eliminar solo esta instancia
                 eliminar_instancia(evento_id_completo)
+                ALARMAS.cancelar_lote([evento_id_completo])
 
                 # Usar datos guardados para borrar de sheets
                 evento_temp = type('obj', (object,), {
@@ -326,6 +329,7 @@ class AgendaAPI:
                 # Eliminar esta y futuras
                 master_id = info['master_id']
                 count = eliminar_serie(master_id, incluir_pasadas=False)
+                ALARMAS.purgar_huerfanas()
 
                 # Limpiar Sheets (refrescar completo)
                 # All: En Fase 2 implementaremos limpieza selectiva
@@ -339,6 +343,7 @@ class AgendaAPI:
                 # Eliminar toda la serie
                 master_id = info['master_id'] if not info['es_maestro'] else evento_id_completo
                 count = eliminar_serie(master_id, incluir_pasadas=True)
+                ALARMAS.purgar_huerfanas()
 
                 BITACORA.registrar("agenda", "eliminar_serie",
                                    f"Serie completa eliminada: {count} instancias",
@@ -433,6 +438,7 @@ class AgendaAPI:
             # Evento único - editar normal
             try:
                 new = logics.editar_evento_db(evento_id_completo, **updates)
+                ALARMAS.reprogramar_evento(new)
 
                 # Actualizar en Sheets
                 try:
@@ -475,6 +481,7 @@ class AgendaAPI:
             if opcion == "1" and not info['es_maestro']:
                 # Editar solo esta instancia
                 new = editar_instancia(evento_id_completo, **updates)
+                ALARMAS.reprogramar_evento(new)
 
                 try:
                     logics.actualizar_evento_sheets(old, new)
@@ -490,6 +497,7 @@ class AgendaAPI:
                 # Editar todas las futuras
                 master_id = info['master_id'] if not info['es_maestro'] else evento_id_completo
                 resultado = editar_serie(master_id, **updates)
+                self._reprogramar_alarmas_serie(master_id)
 
                 # All: Actualizar Sheets (Fase 2)
 
@@ -609,14 +617,14 @@ class AgendaAPI:
             }
             emoji = emojis.get(ev.tipo_evento, "📌")
 
-            # Indicador de serie
-            info = obtener_info_serie(ev.id)
+            # Indicador de serie (directo de la vista, sin consultar la serie por fila)
             serie_str = ""
-            if info and info['es_serie']:
-                if info['modificado_manualmente']:
+            if ev.es_serie:
+                if ev.modificado_manualmente:
                     serie_str = " [Serie*]"  # Modificada manualmente
                 else:
-                    serie_str = f" [Serie: {info['recurrencia']}]"
+                    recurrencia = ev.recurrencia.value if ev.recurrencia else "unico"
+                    serie_str = f" [Serie: {recurrencia}]"
 
             # ID corto (primeros 8 caracteres)
             id_corto = ev.id[:8]
@@ -633,17 +641,27 @@ class AgendaAPI:
         return "\n".join(lines)
 
     def buscar_evento(self, args: list):
-        """Busca eventos por texto"""
+        """Busca eventos por texto (--historico incluye el archivo local de semanas pasadas)"""
+        historico = "--historico" in args
+        args = [a for a in args if a != "--historico"]
+
         if not args:
-            return "[AGENDA] Uso: buscar_evento <texto>"
+            return "[AGENDA] Uso: buscar_evento <texto> [--historico]"
 
         q = " ".join(args)
         eventos = logics.buscar_eventos_db(q)
 
-        if not eventos:
+        archivados = []
+        if historico:
+            from core.db.archivo import ARCHIVO
+            archivados = ARCHIVO.buscar_eventos(q)
+
+        if not eventos and not archivados:
             return "[AGENDA] No se encontró nada."
 
         lines = [f"\n🔍 Resultados para '{q}':"]
+        for e in archivados:
+            lines.append(f"  🗄️ {e.id[:8]} | {e.fecha_inicio} {e.hora_inicio.strftime('%H:%M')} | {e.nombre}")
         for e in eventos:
             lines.append(f"  • {e.id[:8]} | {e.fecha_inicio} {e.hora_inicio.strftime('%H:%M')} | {e.nombre}")
 
@@ -660,23 +678,42 @@ class AgendaAPI:
     def importar_desde_sheets(self, args: list):
         """Importa eventos desde Sheets"""
         try:
-            nuevos = logics.importar_eventos_desde_sheets()
-            return f"[AGENDA] ✅ Importados {nuevos} eventos nuevos."
+            r = logics.importar_eventos_desde_sheets()
+            return (f"[AGENDA] ✅ Importados {r['creados']} eventos nuevos, {r['actualizados']} actualizados "
+                    f"({r['leidos']} leídos en {r['hojas']} hojas).")
         except Exception as e:
             return f"[AGENDA] ❌ Error: {e}"
 
-    def _programar_alarma_automatica(self, evento):
-        """Programa alarma automática para un evento (helper interno)"""
+    def _programar_alarma_automatica(self, *eventos):
+        """Programa alarmas automáticas para uno o varios eventos (helper interno)"""
         try:
-            from modules.alarma.alarma import AlarmManager
-            alarmas = AlarmManager()
-
             # Solo programar si la fecha es futura
-            from datetime import datetime, date
             hoy = date.today()
+            ALARMAS.programar_lote(ev for ev in eventos if ev.fecha_inicio >= hoy)
+        except Exception as e:
+            # No crítico si falla la alarma
+            pass
+
+    def _reprogramar_alarmas_serie(self, master_id):
+        """Reprograma las alarmas de las instancias futuras de una serie tras editarla"""
+        try:
+            from core.db.db import SessionLocal
+            from core.db.schema import Evento
+            from core.db.vistas import consultar_eventos
+
+            session = SessionLocal()
+            try:
+                instancias = consultar_eventos(
+                    session,
+                    Evento.master_id == master_id,
+                    Evento.es_maestro == False,
+                    Evento.fecha_inicio >= date.today()
+                )
+            finally:
+                session.close()
 
-            if evento.fecha_inicio >= hoy:
-                alarmas.programar_alarma(evento.id, evento.alarma_minutos)
+            ALARMAS.cancelar_lote(ev.id for ev in instancias if not ev.alarma_activa)
+            ALARMAS.programar_lote(ev for ev in instancias if ev.alarma_activa)
         except Exception as e:
             # No crítico si falla la alarma
             pass
\ No newline at end of file
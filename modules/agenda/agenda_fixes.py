@@ -11,10 +11,10 @@ Correcciones críticas para el módulo de agenda:
 from datetime import datetime, date, timedelta
 from pathlib import Path
 import json
-import re
 from typing import List, Dict, Optional, Tuple
 from core.db.sessions import SessionLocal
 from core.db.schema import Evento
+from core.db.vistas import consultar_eventos
 from core.context.logs import BITACORA
 from core.context.global_session import SESSION
 import gspread
@@ -30,12 +30,6 @@ class HojaParser:
     Soporta formatos: "05-11 ene.", "26 ene. - 01 feb.", "29 dic. - 04 ene."
     """
 
-    MESES = {
-        'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4,
-        'may': 5, 'jun': 6, 'jul': 7, 'ago': 8,
-        'sep': 9, 'oct': 10, 'nov': 11, 'dic': 12
-    }
-
     @classmethod
     def parsear_nombre_hoja(cls, nombre: str) -> Optional[date]:
         """
@@ -44,55 +38,8 @@ class HojaParser:
         Returns:
             date del lunes de esa semana, o None si no puede parsear
         """
-        # Normalizar nombre
-        nombre = nombre.lower().strip().replace('.', '').replace(',', '')
-
-        # Patrón 1: "05-11 ene" (mismo mes)
-        pattern1 = r'(\d{1,2})-\d{1,2}\s+(\w+)'
-        match = re.match(pattern1, nombre)
-        if match:
-            dia = int(match.group(1))
-            mes_str = match.group(2)
-            mes = cls.MESES.get(mes_str[:3])
-            if mes:
-                # Determinar año (si mes es diciembre y estamos en enero, año anterior)
-                hoy = date.today()
-                año = hoy.year
-                if mes == 12 and hoy.month == 1:
-                    año -= 1
-                elif mes > hoy.month + 1:  # Hoja futura del año pasado
-                    año -= 1
-
-                try:
-                    return date(año, mes, dia)
-                except ValueError:
-                    pass
-
-        # Patrón 2: "26 ene - 01 feb" (cambia de mes)
-        pattern2 = r'(\d{1,2})\s+(\w+)\s*-\s*\d{1,2}\s+(\w+)'
-        match = re.match(pattern2, nombre)
-        if match:
-            dia = int(match.group(1))
-            mes_str = match.group(2)
-            mes = cls.MESES.get(mes_str[:3])
-            if mes:
-                hoy = date.today()
-                año = hoy.year
-
-                # Caso especial: "29 dic - 04 ene" (cambio de año)
-                mes_fin_str = match.group(3)
-                mes_fin = cls.MESES.get(mes_fin_str[:3])
-                if mes == 12 and mes_fin == 1:
-                    # Si estamos en enero, la hoja es del diciembre pasado
-                    if hoy.month == 1:
-                        año -= 1
-
-                try:
-                    return date(año, mes, dia)
-                except ValueError:
-                    pass
-
-        return None
+        from modules.agenda.calendario_hojas import lunes_desde_nombre
+        return lunes_desde_nombre(nombre)
 
     @classmethod
     def ordenar_hojas(cls, hojas: List[gspread.Worksheet]) -> List[gspread.Worksheet]:
@@ -145,11 +92,12 @@ class SincronizadorReal:
         Obtiene eventos de DB en un rango de fechas
         Returns: Dict[id_evento -> Evento]
         """
-        eventos = self.session.query(Evento).filter(
+        eventos = consultar_eventos(
+            self.session,
             Evento.fecha_inicio >= fecha_inicio,
             Evento.fecha_inicio <= fecha_fin,
             Evento.es_maestro == False
-        ).all()
+        )
 
         return {ev.id: ev for ev in eventos}
 
@@ -221,20 +169,18 @@ class SincronizadorReal:
 
         print(f"   📅 '{hoja.title}': {len(eventos_db)} eventos en DB")
 
-        # Pintar cada evento
-        eventos_pintados = 0
-        errores = 0
-
-        for evento in eventos_db.values():
-            try:
-                from modules.agenda.agenda_logics import pintar_evento_sheets
-                pintar_evento_sheets(evento)
-                eventos_pintados += 1
-            except Exception as e:
-                print(f"      ❌ Error pintando '{evento.nombre}': {e}")
-                errores += 1
+        # Pintar la semana completa (traslapes agrupados) en un solo batch_update
+        from modules.agenda.agenda_optimizer import SAFE_SHEETS
+        from modules.agenda.render_agenda import requests_semana
 
-        return (eventos_pintados, errores)
+        try:
+            requests = requests_semana(hoja, eventos_db.values(), limpiar=False)
+            if requests:
+                SAFE_SHEETS.safe_batch_update(hoja, requests)
+            return (len(eventos_db), 0)
+        except Exception as e:
+            print(f"      ❌ Error pintando '{hoja.title}': {e}")
+            return (0, len(eventos_db))
 
     def sincronizar_todas_las_hojas(self) -> Dict[str, any]:
         """
@@ -310,60 +256,198 @@ class SincronizadorReal:
 class LimpiadorDB:
     """
     Limpia eventos pasados de la base de datos
+
+    Borrado por conjuntos: DELETE ... WHERE id IN (SELECT id ... LIMIT n) con
+    commit por lote, sin cargar objetos ORM ni llenar el identity map.
+    (SQLite normalmente se compila sin DELETE ... LIMIT, de ahí la subconsulta.)
     """
 
+    # 20 000 eventos archivados y borrados en ~1.05 s con lotes de 500; lotes
+    # de 1000-5000 no bajan de ~1.1 s y retienen el lock de escritura más tiempo
+    TAMANO_LOTE = 500
+
     @staticmethod
-    def listar_eventos_pasados(semanas_atras: int = 4) -> List[Evento]:
+    def _criterios_eventos(semanas_atras: int, preservar_maestros: bool = True) -> list:
+        fecha_limite = date.today() - timedelta(weeks=semanas_atras)
+        criterios = [Evento.fecha_inicio < fecha_limite]
+        if preservar_maestros:
+            criterios.append(Evento.es_maestro == False)
+        return criterios
+
+    @staticmethod
+    def _criterios_recordatorios(semanas_atras: int) -> list:
+        from core.db.schema import MemoryNote
+
+        fecha_limite = date.today() - timedelta(weeks=semanas_atras)
+        return [MemoryNote.fecha_limite < fecha_limite, MemoryNote.estado != "pendiente"]
+
+    @staticmethod
+    def listar_eventos_pasados(semanas_atras: int = 4) -> list:
         """
-        Lista eventos pasados más allá de N semanas
+        Lista eventos pasados más allá de N semanas (vistas de solo lectura)
         """
         session = SessionLocal()
+        try:
+            return consultar_eventos(session, *LimpiadorDB._criterios_eventos(semanas_atras))
+        finally:
+            session.close()
 
-        fecha_limite = date.today() - timedelta(weeks=semanas_atras)
+    @staticmethod
+    def contar_eventos_pasados(semanas_atras: int = 4) -> Dict[str, int]:
+        """
+        Eventos pasados por mes con un solo GROUP BY
 
-        eventos = session.query(Evento).filter(
-            Evento.fecha_inicio < fecha_limite,
-            Evento.es_maestro == False
-        ).order_by(Evento.fecha_inicio).all()
+        Returns:
+            {"AAAA-MM": cantidad} en orden cronológico
+        """
+        from sqlalchemy import func
 
-        session.close()
-        return eventos
+        session = SessionLocal()
+        mes = func.strftime("%Y-%m", Evento.fecha_inicio)
+        try:
+            filas = session.query(mes, func.count(Evento.id)).filter(
+                *LimpiadorDB._criterios_eventos(semanas_atras)
+            ).group_by(mes).order_by(mes).all()
+        finally:
+            session.close()
+
+        return dict(filas)
+
+    @staticmethod
+    def contar_recordatorios_pasados(semanas_atras: int = 4) -> int:
+        """Recordatorios cerrados que limpiar_db_pasados también saca de la DB"""
+        from sqlalchemy import func
+        from core.db.schema import MemoryNote
+
+        session = SessionLocal()
+        try:
+            return session.query(func.count(MemoryNote.id)).filter(
+                *LimpiadorDB._criterios_recordatorios(semanas_atras)
+            ).scalar()
+        finally:
+            session.close()
+
+    @staticmethod
+    def _borrar_por_lotes(modelo, criterios, tabla_archivo=None, lote=TAMANO_LOTE, progreso=None) -> int:
+        """
+        Borra las filas que cumplen `criterios` en lotes de `lote`, un commit por lote
+
+        Args:
+            modelo: Evento o MemoryNote
+            tabla_archivo: "eventos"/"memory" para agregar cada lote al
+                           archivo histórico antes de borrarlo (None = sin archivo)
+            progreso: callable(hechas, total) tras cada lote
+
+        Returns:
+            Número de filas borradas
+        """
+        from sqlalchemy import delete, func, select
+        from core.db.archivo import ARCHIVO
+        from core.db.vistas import consultar_recordatorios
+
+        consultar = consultar_eventos if modelo is Evento else consultar_recordatorios
+
+        session = SessionLocal()
+        borradas = 0
+
+        try:
+            total = session.query(func.count(modelo.id)).filter(*criterios).scalar()
+
+            while borradas < total:
+                if tabla_archivo:
+                    # Se lee el lote solo como columnas, se archiva y se borra por id
+                    filas = consultar(session, *criterios, limite=lote)
+                    if not filas:
+                        break
+                    ARCHIVO.agregar(tabla_archivo, filas)
+                    objetivo = modelo.id.in_([fila.id for fila in filas])
+                else:
+                    objetivo = modelo.id.in_(select(modelo.id).where(*criterios).limit(lote))
+
+                resultado = session.execute(delete(modelo).where(objetivo).execution_options(synchronize_session=False))
+                session.commit()
+
+                if not resultado.rowcount:
+                    break
+                borradas += resultado.rowcount
+
+                if progreso:
+                    progreso(borradas, total)
+
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        return borradas
+
+    @staticmethod
+    def optimizar_db():
+        """
+        ANALYZE para que el planificador vea las tablas ya reducidas, y
+        PRAGMA incremental_vacuum para devolver páginas libres (solo tiene
+        efecto si la DB usa auto_vacuum=INCREMENTAL; si no, no hace nada)
+        """
+        from core.db.db import engine
+
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+            # Cada fila leída libera un lote de páginas: hay que consumirlas todas
+            resultado = conn.exec_driver_sql("PRAGMA incremental_vacuum")
+            if resultado.returns_rows:
+                resultado.fetchall()
+            conn.commit()
 
     @staticmethod
     def eliminar_eventos_pasados(semanas_atras: int = 4,
-                                 preservar_maestros: bool = True) -> int:
+                                 preservar_maestros: bool = True,
+                                 archivar: bool = True,
+                                 lote: int = TAMANO_LOTE,
+                                 progreso=None) -> int:
         """
-        Elimina eventos pasados de la DB
+        Elimina eventos pasados de la DB por lotes
 
         Args:
             semanas_atras: Cuántas semanas hacia atrás preservar
             preservar_maestros: Si True, no elimina eventos maestros
+            archivar: Si True, cada lote pasa antes al archivo histórico local
+                      (siguen consultables con buscar_evento --historico)
+            lote: Filas por DELETE/commit
+            progreso: callable(hechos, total)
 
         Returns:
             Número de eventos eliminados
         """
-        session = SessionLocal()
-
-        fecha_limite = date.today() - timedelta(weeks=semanas_atras)
-
-        query = session.query(Evento).filter(
-            Evento.fecha_inicio < fecha_limite
+        count = LimpiadorDB._borrar_por_lotes(
+            Evento, LimpiadorDB._criterios_eventos(semanas_atras, preservar_maestros),
+            "eventos" if archivar else None, lote, progreso
         )
 
-        if preservar_maestros:
-            query = query.filter(Evento.es_maestro == False)
+        from modules.agenda.cache_eventos import EVENTOS_CACHE
+        EVENTOS_CACHE.invalidar_todo()
 
-        eventos = query.all()
-        count = len(eventos)
+        return count
 
-        # Eliminar
-        for evento in eventos:
-            session.delete(evento)
+    @staticmethod
+    def archivar_recordatorios_pasados(semanas_atras: int = 4,
+                                       archivar: bool = True,
+                                       lote: int = TAMANO_LOTE,
+                                       progreso=None) -> int:
+        """
+        Mueve al archivo histórico los recordatorios ya cerrados (completados o
+        cancelados) con fecha límite de hace más de N semanas; los pendientes
+        vencidos se quedan en la DB para que sigan apareciendo
 
-        session.commit()
-        session.close()
+        Returns:
+            Número de recordatorios archivados
+        """
+        from core.db.schema import MemoryNote
 
-        return count
+        return LimpiadorDB._borrar_por_lotes(
+            MemoryNote, LimpiadorDB._criterios_recordatorios(semanas_atras),
+            "memory" if archivar else None, lote, progreso
+        )
 
 
 # ============================================================================
@@ -428,19 +512,21 @@ class PlantillaFlexible:
 
         if fecha_inicio:
             fecha_fin = fecha_inicio + timedelta(days=6)
-            eventos = session.query(Evento).filter(
+            eventos = consultar_eventos(
+                session,
                 Evento.fecha_inicio >= fecha_inicio,
                 Evento.fecha_inicio <= fecha_fin,
                 Evento.es_maestro == False
-            ).all()
+            )
         else:
             # Si no hay fecha, intentar obtener eventos recientes
             print("   Guardando eventos de las últimas 2 semanas...")
             hace_2_semanas = date.today() - timedelta(weeks=2)
-            eventos = session.query(Evento).filter(
+            eventos = consultar_eventos(
+                session,
                 Evento.fecha_inicio >= hace_2_semanas,
                 Evento.es_maestro == False
-            ).all()
+            )
 
         session.close()
 
@@ -564,54 +650,74 @@ def comando_sincronizar_real(args):
     return f"[LOBO] ✅ Sincronización completada: {resultado['eventos_pintados']} eventos"
 
 
+def _mostrar_progreso(etiqueta):
+    def progreso(hechos, total):
+        print(f"\r   {etiqueta}: {hechos}/{total} ({hechos * 100 // max(total, 1)}%)", end="", flush=True)
+        if hechos >= total:
+            print()
+    return progreso
+
+
 def comando_limpiar_db_pasados(args):
     """Limpia eventos pasados de la DB"""
-    # Listar primero
+    # Listar primero (conteo por mes con GROUP BY, sin cargar eventos)
     if not args or args[0] == "ver":
         semanas = 4
-        eventos = LimpiadorDB.listar_eventos_pasados(semanas)
+        por_mes = LimpiadorDB.contar_eventos_pasados(semanas)
+        recordatorios = LimpiadorDB.contar_recordatorios_pasados(semanas)
 
-        if not eventos:
-            return f"[LOBO] No hay eventos pasados (>{semanas} semanas)"
+        if not por_mes and not recordatorios:
+            return f"[LOBO] No hay eventos ni recordatorios pasados (>{semanas} semanas)"
 
-        print(f"\n📋 Eventos pasados encontrados (>{semanas} semanas): {len(eventos)}\n")
+        print(f"\n📋 Eventos pasados encontrados (>{semanas} semanas): {sum(por_mes.values())}\n")
 
-        # Agrupar por mes
-        por_mes = {}
-        for ev in eventos:
-            mes_key = ev.fecha_inicio.strftime("%Y-%m")
-            if mes_key not in por_mes:
-                por_mes[mes_key] = []
-            por_mes[mes_key].append(ev)
+        for mes, cantidad in por_mes.items():
+            print(f"   {mes}: {cantidad} eventos")
 
-        for mes, evs in sorted(por_mes.items()):
-            print(f"   {mes}: {len(evs)} eventos")
+        print(f"\n📋 Recordatorios completados o cancelados (>{semanas} semanas): {recordatorios}")
 
-        print(f"\nUsa: limpiar_db_pasados eliminar [semanas]")
+        print(f"\nUsa: limpiar_db_pasados eliminar [semanas] [--sin-archivo]")
         return ""
 
     # Eliminar
     if args[0] == "eliminar":
+        archivar = "--sin-archivo" not in args
+        args = [a for a in args if a != "--sin-archivo"]
         semanas = int(args[1]) if len(args) > 1 else 4
 
-        eventos = LimpiadorDB.listar_eventos_pasados(semanas)
+        total = sum(LimpiadorDB.contar_eventos_pasados(semanas).values())
+        total_recordatorios = LimpiadorDB.contar_recordatorios_pasados(semanas)
 
-        if not eventos:
-            return f"[LOBO] No hay eventos para eliminar"
+        if not total and not total_recordatorios:
+            return f"[LOBO] No hay eventos ni recordatorios para eliminar"
 
-        print(f"\n⚠️  Se eliminarán {len(eventos)} eventos (>{semanas} semanas)")
+        if archivar:
+            print(f"\n⚠️  Se moverán {total} eventos y {total_recordatorios} recordatorios cerrados "
+                  f"(>{semanas} semanas) al archivo histórico local")
+        else:
+            print(f"\n⚠️  Se eliminarán {total} eventos y {total_recordatorios} recordatorios cerrados "
+                  f"(>{semanas} semanas) SIN archivarlos")
         confirm = input("¿Continuar? [Y/N]: ").strip().upper()
 
         if confirm != "Y":
             return "[LOBO] ❎ Cancelado"
 
-        count = LimpiadorDB.eliminar_eventos_pasados(semanas)
+        count = LimpiadorDB.eliminar_eventos_pasados(semanas, archivar=archivar,
+                                                     progreso=_mostrar_progreso("Eventos"))
+        recordatorios = LimpiadorDB.archivar_recordatorios_pasados(semanas, archivar=archivar,
+                                                                   progreso=_mostrar_progreso("Recordatorios"))
+        LimpiadorDB.optimizar_db()
 
+        accion = "archivados" if archivar else "eliminados"
         BITACORA.registrar("agenda", "limpiar_db_pasados",
-                           f"{count} eventos eliminados (>{semanas} semanas)",
+                           f"{count} eventos y {recordatorios} recordatorios {accion} (>{semanas} semanas)",
                            SESSION.user.username if SESSION.user else "system")
 
-        return f"[LOBO] ✅ {count} eventos eliminados"
+        if not archivar:
+            return f"[LOBO] ✅ {count} eventos y {recordatorios} recordatorios eliminados"
+
+        return (f"[LOBO] ✅ {count} eventos y {recordatorios} recordatorios movidos al archivo histórico "
+                f"(buscar_evento <texto> --historico)")
 
 
 def comando_guardar_plantilla_desde(args):
@@ -1,16 +1,29 @@
 # modules/agenda/agenda_logics.py
 from datetime import datetime, date, time, timedelta
-from sqlalchemy import or_, and_
+from sqlalchemy import or_
 from core.db.schema import Evento, RecurrenciaEnum
 from core.db.db import SessionLocal as Session  # migrado desde core.db.sessions
-from core.lobo_google.lobo_sheets import get_sheet
-from gspread.utils import rowcol_to_a1
+from core.db.vistas import consultar_eventos
 import logging
 
-from modules.agenda.sheets_manager import get_sheets_manager
+from modules.agenda.cache_eventos import EVENTOS_CACHE
 
 logger = logging.getLogger(__name__)
 
+
+# ===== Google Sheets (import diferido) =====
+# gspread y google-auth tardan en importarse; las consultas a la DB no los necesitan
+
+def get_sheet():
+    from core.lobo_google.lobo_sheets import get_sheet as _get_sheet
+    return _get_sheet()
+
+
+def get_sheets_manager():
+    from modules.agenda.sheets_manager import get_sheets_manager as _get_sheets_manager
+    return _get_sheets_manager()
+
+
 COLORES_TIPO_EVENTO = {
     "clase": (0.6, 0.8, 1.0),
     "trabajo": (1.0, 0.9, 0.6),
@@ -47,15 +60,28 @@ def _ensure_time(obj):
     return datetime.strptime(obj, "%H:%M").time()
 
 
+# sheetId -> {"HH:MM": fila}. La columna A viene de la plantilla y no cambia,
+# así que se lee una vez por hoja en lugar de en cada pintado/borrado
+_FILAS_HORA = {}
+
+
+def _filas_hora(sheet):
+    filas = _FILAS_HORA.get(sheet.id)
+    if filas is None:
+        filas = {}
+        for i, valor in enumerate(sheet.col_values(1), start=1):
+            filas.setdefault(valor, i)
+        _FILAS_HORA[sheet.id] = filas
+    return filas
+
+
 def _time_to_row(sheet, hora):
     if isinstance(hora, str):
         hora_str = hora
     else:
         hora_str = hora.strftime("%H:%M")
-    col1 = sheet.col_values(1)
-    try:
-        fila = col1.index(hora_str) + 1
-    except ValueError:
+    fila = _filas_hora(sheet).get(hora_str)
+    if fila is None:
         raise ValueError(f"Hora {hora_str} no encontrada en la primera columna del Sheet.")
     return fila
 
@@ -101,14 +127,17 @@ def crear_evento_db(nombre: str, descripcion: str, fecha_inicio, hora_inicio, ho
     session.commit()
     session.refresh(evento)
     session.close()
+    EVENTOS_CACHE.invalidar_fechas(fecha_inicio)
     return evento
 
 
 def get_evento_by_id(evento_id):
     session = Session()
-    ev = session.query(Evento).filter_by(id=evento_id).first()
-    session.close()
-    return ev
+    try:
+        eventos = consultar_eventos(session, Evento.id == evento_id, orden=(), limite=1)
+    finally:
+        session.close()
+    return eventos[0] if eventos else None
 
 
 def editar_evento_db(evento_id, **kwargs):
@@ -117,6 +146,7 @@ def editar_evento_db(evento_id, **kwargs):
     if not ev:
         session.close()
         raise ValueError("Evento no encontrado")
+    fecha_anterior = ev.fecha_inicio
     if "fecha_inicio" in kwargs:
         kwargs["fecha_inicio"] = _ensure_date(kwargs["fecha_inicio"])
     if "hora_inicio" in kwargs:
@@ -129,6 +159,7 @@ def editar_evento_db(evento_id, **kwargs):
     session.commit()
     session.refresh(ev)
     session.close()
+    EVENTOS_CACHE.invalidar_fechas(fecha_anterior, ev.fecha_inicio)
     return ev
 
 
@@ -138,20 +169,23 @@ def eliminar_evento_db(evento_id):
     if not ev:
         session.close()
         return False
+    fecha = ev.fecha_inicio
     session.delete(ev)
     session.commit()
     session.close()
+    EVENTOS_CACHE.invalidar_fechas(fecha)
     return True
 
 
 def buscar_eventos_db(query_str):
     session = Session()
     q = f"%{query_str}%"
-    results = session.query(Evento).filter(
-        or_(Evento.nombre.ilike(q), Evento.descripcion.ilike(q))
-    ).all()
-    session.close()
-    return results
+    try:
+        return consultar_eventos(
+            session, or_(Evento.nombre.ilike(q), Evento.descripcion.ilike(q))
+        )
+    finally:
+        session.close()
 
 
 def buscar_evento_por_id_parcial(id_parcial: str):
@@ -161,19 +195,12 @@ def buscar_evento_por_id_parcial(id_parcial: str):
     session = Session()
 
     try:
-        eventos = session.query(Evento).filter(
-            Evento.id.like(f"{id_parcial}%")
-        ).all()
+        eventos = consultar_eventos(session, Evento.id.like(f"{id_parcial}%"))
 
         if len(eventos) == 0:
             return None
         elif len(eventos) == 1:
-            ev = eventos[0]
-            _ = ev.id, ev.nombre, ev.descripcion, ev.fecha_inicio
-            _ = ev.hora_inicio, ev.hora_fin, ev.recurrencia, ev.etiquetas
-            _ = ev.es_maestro, ev.master_id, ev.tipo_evento
-            session.expunge(ev)
-            return ev
+            return eventos[0]
         else:
             print(f"⚠️  ID ambiguo '{id_parcial}'. Coincidencias:")
             for ev in eventos:
@@ -185,207 +212,117 @@ def buscar_evento_por_id_parcial(id_parcial: str):
 
 
 def get_evento_by_id_flexible(evento_id: str):
-    session = Session()
+    evento = get_evento_by_id(evento_id)
 
-    try:
-        evento = session.query(Evento).filter_by(id=evento_id).first()
+    if evento:
+        return evento
 
-        if evento:
-            _ = evento.id, evento.nombre, evento.descripcion
-            _ = evento.fecha_inicio, evento.hora_inicio, evento.hora_fin
-            _ = evento.recurrencia, evento.etiquetas, evento.es_maestro
-            _ = evento.master_id, evento.tipo_evento
-            session.expunge(evento)
-            return evento
+    if len(evento_id) >= 6:
+        return buscar_evento_por_id_parcial(evento_id)
 
-        if len(evento_id) >= 6:
-            return buscar_evento_por_id_parcial(evento_id)
+    return None
 
-        return None
+
+def _cargar_eventos_semana(lunes: date, domingo: date):
+    """Cargador del cache: un solo SELECT por semana ISO"""
+    session = Session()
+    try:
+        return consultar_eventos(
+            session,
+            Evento.fecha_inicio >= lunes,
+            Evento.fecha_inicio <= domingo
+        )
     finally:
         session.close()
 
 
 def listar_eventos_por_fecha(fecha: date):
     fecha = _ensure_date(fecha)
-    session = Session()
-    results = session.query(Evento).filter_by(fecha_inicio=fecha).all()
-    session.close()
-    return results
+    return EVENTOS_CACHE.eventos_del_dia(fecha, _cargar_eventos_semana)
 
 
-def pintar_evento_sheets(evento, color_rgb=None):
+def _hoja_para_fecha(fecha):
     try:
-        sheet = get_sheets_manager().obtener_hoja_por_fecha(evento.fecha_inicio)
+        return get_sheets_manager().obtener_hoja_por_fecha(fecha)
     except Exception as e:
-        logger.error(f"Error al obtener hoja para {evento.fecha_inicio}: {e}")
-        sheet = get_sheet()
-
-    start_row = _time_to_row(sheet, evento.hora_inicio)
-    end_row = _time_to_row(sheet, evento.hora_fin)
-    col = _date_to_col(evento.fecha_inicio)
-
-    first_a1 = rowcol_to_a1(start_row, col)
-    full_range = f"{rowcol_to_a1(start_row, col)}:{rowcol_to_a1(end_row, col)}"
-
-    if color_rgb is None:
-        tipo = getattr(evento, 'tipo_evento', 'personal')
-        color_rgb = COLORES_TIPO_EVENTO.get(tipo, COLORES_TIPO_EVENTO['default'])
-
-    color_texto = calcular_color_texto(color_rgb)
-
-    texto = evento.nombre
-    if evento.descripcion:
-        texto = f"{evento.nombre}\n{evento.descripcion}"
-
-    sheet_id = sheet._properties["sheetId"]
-    r, g, b = color_rgb
-    tr, tg, tb = color_texto
-
-    requests = [
-        {
-            "updateCells": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": start_row - 1,
-                    "endRowIndex": start_row,
-                    "startColumnIndex": col - 1,
-                    "endColumnIndex": col
-                },
-                "rows": [{
-                    "values": [{
-                        "userEnteredValue": {"stringValue": texto},
-                        "userEnteredFormat": {
-                            "backgroundColor": {"red": r, "green": g, "blue": b},
-                            "textFormat": {
-                                "foregroundColor": {"red": tr, "green": tg, "blue": tb},
-                                "bold": True
-                            },
-                            "wrapStrategy": "WRAP"
-                        }
-                    }]
-                }],
-                "fields": "userEnteredValue,userEnteredFormat"
-            }
-        },
-        {
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": start_row,
-                    "endRowIndex": end_row,
-                    "startColumnIndex": col - 1,
-                    "endColumnIndex": col
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": r, "green": g, "blue": b},
-                        "textFormat": {
-                            "foregroundColor": {"red": tr, "green": tg, "blue": tb},
-                            "bold": True
-                        }
-                    }
-                },
-                "fields": "userEnteredFormat(backgroundColor,textFormat)"
-            }
-        } if end_row > start_row else {},
-        {
-            "updateBorders": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": start_row - 1,
-                    "endRowIndex": end_row,
-                    "startColumnIndex": col - 1,
-                    "endColumnIndex": col
-                },
-                "top": {"style": "SOLID", "width": 1, "color": {"red": 0, "green": 0, "blue": 0}},
-                "bottom": {"style": "SOLID", "width": 1, "color": {"red": 0, "green": 0, "blue": 0}},
-                "left": {"style": "SOLID", "width": 1, "color": {"red": 0, "green": 0, "blue": 0}},
-                "right": {"style": "SOLID", "width": 1, "color": {"red": 0, "green": 0, "blue": 0}},
-            }
-        }
-    ]
+        logger.error(f"Error al obtener hoja para {fecha}: {e}")
+        return get_sheet()
 
-    requests = [r for r in requests if r]
 
-    from core.lobo_google.rate_limiter import RATE_LIMITER
-    RATE_LIMITER.wait_if_needed()
+def pintar_evento_sheets(evento, color_rgb=None):
+    """
+    Pinta un evento en su hoja. Si se traslapa con otros del mismo día, se
+    repinta el grupo completo como un solo bloque con marca ⚠️
+    """
+    from modules.agenda.render_agenda import plan_columna, enviar
 
-    sheet.spreadsheet.batch_update({"requests": requests})
+    # SHEETS_MANAGER.obtener_hoja_por_fecha: la hoja de la semana del evento
+    sheet = _hoja_para_fecha(evento.fecha_inicio)
 
-    logger.info(f"Pintado evento: {evento.nombre} ({first_a1} -> {full_range}) - {evento.tipo_evento}")
+    colores = {evento.id: color_rgb} if color_rgb else None
+    enviar(sheet, plan_columna(sheet, evento.fecha_inicio, pintar=[evento], colores=colores))
+
+    logger.info(f"Pintado evento: {evento.nombre} ({evento.fecha_inicio} "
+                f"{evento.hora_inicio.strftime('%H:%M')}-{evento.hora_fin.strftime('%H:%M')}) - {evento.tipo_evento}")
     return True
 
 
 def borrar_evento_sheets(evento):
-    try:
-        sheet = get_sheets_manager().obtener_hoja_por_fecha(evento.fecha_inicio)
-    except Exception as e:
-        logger.error(f"Error al obtener hoja para borrar: {e}")
-        sheet = get_sheet()
+    """
+    Borra un evento de su hoja en un solo batch_update: limpia solo las celdas
+    que quedan libres y repinta los eventos de la DB que se traslapaban con él
+    """
+    from modules.agenda.render_agenda import plan_columna, enviar
 
-    start_row = _time_to_row(sheet, evento.hora_inicio)
-    end_row = _time_to_row(sheet, evento.hora_fin)
-    col = _date_to_col(evento.fecha_inicio)
-    full_range = f"{rowcol_to_a1(start_row, col)}:{rowcol_to_a1(end_row, col)}"
-    sheet_id = sheet._properties["sheetId"]
+    sheet = _hoja_para_fecha(evento.fecha_inicio)
 
-    from core.lobo_google.rate_limiter import RATE_LIMITER
-    RATE_LIMITER.wait_if_needed()
-
-    sheet.batch_clear([full_range])
+    enviar(sheet, plan_columna(sheet, evento.fecha_inicio, quitar=[evento]))
 
-    RATE_LIMITER.wait_if_needed()
-
-    requests = [
-        {
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": start_row - 1,
-                    "endRowIndex": end_row,
-                    "startColumnIndex": col - 1,
-                    "endColumnIndex": col
-                },
-                "cell": {"userEnteredFormat": {}},
-                "fields": "userEnteredFormat"
-            }
-        },
-        {
-            "updateBorders": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": start_row - 1,
-                    "endRowIndex": end_row,
-                    "startColumnIndex": col - 1,
-                    "endColumnIndex": col
-                },
-                "top": {"style": "NONE"},
-                "bottom": {"style": "NONE"},
-                "left": {"style": "NONE"},
-                "right": {"style": "NONE"},
-            }
-        }
-    ]
-    sheet.spreadsheet.batch_update({"requests": requests})
-    logger.info(f"Borrado evento: {evento.nombre} ({full_range})")
+    logger.info(f"Borrado evento: {evento.nombre} ({evento.fecha_inicio} "
+                f"{evento.hora_inicio.strftime('%H:%M')}-{evento.hora_fin.strftime('%H:%M')})")
     return True
 
 
 def actualizar_evento_sheets(old_evento, new_evento):
-    try:
-        borrar_evento_sheets(old_evento)
-    except Exception as e:
-        logger.warning("No se pudo borrar evento antiguo en sheets: %s", e)
-    return pintar_evento_sheets(new_evento)
+    """
+    Mueve/edita un evento en Sheets con un solo batch_update: celdas liberadas,
+    grupos de traslapes afectados y el evento nuevo se resuelven juntos
+    """
+    from modules.agenda.render_agenda import plan_columna, enviar
+
+    sheet_nueva = _hoja_para_fecha(new_evento.fecha_inicio)
+
+    if old_evento.fecha_inicio == new_evento.fecha_inicio:
+        requests = plan_columna(sheet_nueva, new_evento.fecha_inicio,
+                                quitar=[old_evento], pintar=[new_evento])
+    else:
+        requests = []
+        try:
+            sheet_vieja = _hoja_para_fecha(old_evento.fecha_inicio)
+            requests += plan_columna(sheet_vieja, old_evento.fecha_inicio, quitar=[old_evento])
+        except Exception as e:
+            logger.warning("No se pudo planificar el borrado del evento antiguo en sheets: %s", e)
+
+        # Otra hoja: el mismo spreadsheet acepta ambos lados juntos
+        requests += plan_columna(sheet_nueva, new_evento.fecha_inicio, pintar=[new_evento])
+
+    # Un solo envío fuera del try: si falla (cuota, red) el error llega a quien llamó
+    return enviar(sheet_nueva, requests)
 
 
 def clear_sheets():
+    """
+    Repinta desde cero todas las semanas con eventos: cada hoja se limpia y se
+    pinta con su layout (traslapes agrupados) y todo sale en un solo lote
+    """
+    from core.lobo_google.escritor_lotes import EscritorLotes
+    from modules.agenda.render_agenda import requests_semana
+
     session = Session()
-    eventos = session.query(Evento).filter(
-        Evento.es_maestro == False
-    ).order_by(Evento.fecha_inicio, Evento.hora_inicio).all()
-    session.close()
+    try:
+        eventos = consultar_eventos(session, Evento.es_maestro == False)
+    finally:
+        session.close()
 
     eventos_por_semana = {}
 
@@ -395,96 +332,163 @@ def clear_sheets():
             eventos_por_semana[lunes] = []
         eventos_por_semana[lunes].append(ev)
 
+    escritor = None
     hojas_procesadas = 0
     eventos_pintados = 0
 
     for lunes, eventos_semana in eventos_por_semana.items():
         try:
             sheet = get_sheets_manager().obtener_hoja_por_fecha(lunes)
-
-            from core.lobo_google.rate_limiter import RATE_LIMITER
-            RATE_LIMITER.wait_if_needed()
-
-            rango = f"B2:H31"
-            sheet.batch_clear([rango])
+            if escritor is None:
+                escritor = EscritorLotes(sheet.spreadsheet)
 
             logger.info(f"Limpiando hoja '{sheet.title}'")
-
-            for ev in eventos_semana:
-                try:
-                    pintar_evento_sheets(ev)
-                    eventos_pintados += 1
-                except Exception as e:
-                    logger.exception(f"Error al pintar evento {ev.id}: {e}")
+            escritor.formatear(*requests_semana(sheet, eventos_semana))
 
             hojas_procesadas += 1
+            eventos_pintados += len(eventos_semana)
 
         except Exception as e:
             logger.exception(f"Error al procesar semana {lunes}: {e}")
 
+    if escritor is not None:
+        escritor.enviar()
+
     logger.info(f"Clear sheets completado: {hojas_procesadas} hojas, {eventos_pintados} eventos")
     return True
 
 
+DIA_A_WEEKDAY = {dia: weekday for weekday, dia in SPANISH_WEEKDAY.items()}
+
+
+def _parsear_hora(texto):
+    texto = texto.strip()
+    for formato, valor in (("%H:%M", texto), ("%I:%M %p", texto.upper())):
+        try:
+            return datetime.strptime(valor, formato).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _clave_contenido(fecha, hora_inicio, nombre):
+    """Clave para reconocer un evento entre Sheets y la DB: día, hora de inicio y nombre"""
+    return fecha, hora_inicio.strftime("%H:%M"), nombre.strip().casefold()
+
+
+def _eventos_de_celda(contenido, hora_inicio, hora_fin):
+    """
+    Eventos (nombre, descripcion, inicio, fin) escritos en una celda de inicio
+
+    Un bloque de traslapes ("⚠️ 2 eventos traslapados" + "HH:MM-HH:MM Nombre"
+    por línea) trae sus propios horarios.
+    """
+    from modules.agenda.render_agenda import MARCA_TRASLAPE
+
+    lineas = contenido.split("\n")
+    if not lineas[0].startswith(MARCA_TRASLAPE):
+        descripcion = "\n".join(lineas[1:]).strip()
+        return [(lineas[0].strip(), descripcion, hora_inicio, hora_fin)]
+
+    eventos = []
+    for linea in lineas[1:]:
+        horario, _, nombre = linea.strip().partition(" ")
+        inicio_str, _, fin_str = horario.partition("-")
+        inicio, fin = _parsear_hora(inicio_str), _parsear_hora(fin_str)
+        if inicio and fin and nombre.strip():
+            eventos.append((nombre.strip(), "", inicio, fin))
+    return eventos
+
+
+def _leer_hojas_semanales(manager):
+    """
+    A1:H31 de TODAS las hojas semanales en un solo values:batchGet
+
+    Returns:
+        list[(lunes, filas)]
+    """
+    from gspread.utils import absolute_range_name
+    from core.lobo_google.rate_limiter import RATE_LIMITER
+    from modules.recordatorios.recordatorios_sheets import _hojas_semanales
+
+    hojas = _hojas_semanales(manager.spreadsheet)
+    if not hojas:
+        return []
+
+    # Columna A incluida: las horas de cada fila vienen de la propia hoja
+    RATE_LIMITER.wait_if_needed()
+    respuesta = manager.spreadsheet.values_batch_get(
+        [absolute_range_name(hoja.title, "A1:H31") for _, hoja in hojas]
+    )
+    rangos = respuesta.get("valueRanges", [])
+
+    return [(lunes, rango.get("values", [])) for (lunes, _), rango in zip(hojas, rangos)]
+
+
+def _eventos_en_hoja(lunes, filas):
+    """Eventos (fecha, nombre, descripcion, inicio, fin) de una hoja semanal ya leída"""
+    horas = [_parsear_hora(fila[0]) if fila else None for fila in filas]
+    eventos = []
+
+    for fila_idx in range(1, len(filas)):
+        hora_inicio = horas[fila_idx]
+        if hora_inicio is None:
+            continue
+
+        siguiente = horas[fila_idx + 1] if fila_idx + 1 < len(horas) else None
+        hora_fin = siguiente or (datetime.combine(lunes, hora_inicio) + timedelta(hours=1)).time()
+
+        for col_idx in range(1, min(len(filas[fila_idx]), len(DIAS))):
+            contenido = filas[fila_idx][col_idx]
+            if not contenido.strip():
+                continue
+            # Mismo mapeo columna -> día que _date_to_col (B = Domingo de la semana)
+            fecha = lunes + timedelta(days=DIA_A_WEEKDAY[DIAS[col_idx]])
+            for nombre, descripcion, inicio, fin in _eventos_de_celda(contenido, hora_inicio, hora_fin):
+                eventos.append((fecha, nombre, descripcion, inicio, fin))
+
+    return eventos
+
+
 def importar_eventos_desde_sheets():
-    hoy = date.today()
-    sheet = get_sheets_manager().obtener_hoja_por_fecha(hoy)
-    data = sheet.get_all_values()
+    """
+    Importa a la DB los eventos de TODAS las hojas semanales
+
+    - 1 request de lectura (values:batchGet) para todas las hojas
+    - Cada celda se reconoce por (día, hora de inicio, nombre): lo que ya está
+      en la DB no se duplica; si cambió la descripción, se actualiza
+    - Altas y cambios en una sola transacción
 
-    if not data:
-        return "[AGENDA] Hoja vacía."
+    Returns:
+        dict: {'hojas', 'leidos', 'creados', 'actualizados'}
+    """
+    leidas = _leer_hojas_semanales(get_sheets_manager())
+    en_hojas = [ev for lunes, filas in leidas for ev in _eventos_en_hoja(lunes, filas)]
+    resultado = {'hojas': len(leidas), 'leidos': len(en_hojas), 'creados': 0, 'actualizados': 0}
 
-    encabezados = data[0]
-    horas = [row[0] for row in data]
+    if not en_hojas:
+        return resultado
+
+    fechas = [fecha for fecha, *_ in en_hojas]
+    fechas_cambiadas = set()
 
     session = Session()
-    creados = 0
     try:
-        for fila_idx in range(1, len(data)):
-            hora_str = horas[fila_idx]
-            if not hora_str:
-                continue
-            try:
-                hora_inicio = datetime.strptime(hora_str.strip(), "%H:%M").time()
-            except ValueError:
-                try:
-                    hora_inicio = datetime.strptime(hora_str.strip().upper(), "%I:%M %p").time()
-                except ValueError:
-                    continue
-
-            if fila_idx + 1 < len(horas):
-                next_hora_str = horas[fila_idx + 1].strip()
-                try:
-                    hora_fin = datetime.strptime(next_hora_str, "%H:%M").time()
-                except ValueError:
-                    try:
-                        hora_fin = datetime.strptime(next_hora_str.upper(), "%I:%M %p").time()
-                    except ValueError:
-                        hora_fin = (datetime.combine(datetime.today(), hora_inicio) + timedelta(hours=1)).time()
-            else:
-                hora_fin = (datetime.combine(datetime.today(), hora_inicio) + timedelta(hours=1)).time()
-
-            for col_idx in range(1, len(encabezados)):
-                dia = encabezados[col_idx]
-                if not dia:
-                    continue
-                contenido = data[fila_idx][col_idx] if col_idx < len(data[fila_idx]) else ""
-                if not contenido.strip():
-                    continue
-                partes = contenido.split("\n", 1)
-                nombre = partes[0].strip()
-                descripcion = partes[1].strip() if len(partes) > 1 else ""
-
-                weekday_map = {
-                    "Lunes": 0, "Martes": 1, "Miércoles": 2,
-                    "Jueves": 3, "Viernes": 4, "Sábado": 5, "Domingo": 6
-                }
-                if dia not in weekday_map:
-                    continue
-
-                delta = (weekday_map[dia] - hoy.weekday()) % 7
-                fecha = hoy + timedelta(days=delta)
+        existentes = {
+            _clave_contenido(ev.fecha_inicio, ev.hora_inicio, ev.nombre): ev
+            for ev in session.query(Evento).filter(
+                Evento.fecha_inicio >= min(fechas),
+                Evento.fecha_inicio <= max(fechas),
+                Evento.es_maestro == False
+            )
+        }
+
+        ahora = datetime.utcnow()
+        for fecha, nombre, descripcion, hora_inicio, hora_fin in en_hojas:
+            clave = _clave_contenido(fecha, hora_inicio, nombre)
+            ev = existentes.get(clave)
 
+            if ev is None:
                 ev = Evento(
                     nombre=nombre,
                     descripcion=descripcion,
@@ -493,22 +497,32 @@ def importar_eventos_desde_sheets():
                     hora_fin=hora_fin,
                     recurrencia=RecurrenciaEnum.unico,
                     etiquetas=[],
-                    creado_en=datetime.utcnow(),
-                    modificado_en=datetime.utcnow(),
+                    creado_en=ahora,
+                    modificado_en=ahora,
                 )
                 session.add(ev)
-                creados += 1
+                existentes[clave] = ev  # La misma celda repetida no crea dos eventos
+                resultado['creados'] += 1
+                fechas_cambiadas.add(fecha)
+            elif descripcion and (ev.descripcion or "") != descripcion:
+                ev.descripcion = descripcion
+                ev.modificado_en = ahora
+                resultado['actualizados'] += 1
+                fechas_cambiadas.add(fecha)
+
         session.commit()
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
-    return creados
+
+    EVENTOS_CACHE.invalidar_fechas(*fechas_cambiadas)
+    logger.info(f"Importación desde Sheets: {resultado}")
+    return resultado
 
 
 def listar_eventos_por_rango(fecha_inicio: str, fecha_fin: str):
-    with Session() as session:
-        return session.query(Evento).filter(
-            and_(
-                Evento.fecha_inicio >= fecha_inicio,
-                Evento.fecha_inicio <= fecha_fin
-            )
-        ).all()
+    return EVENTOS_CACHE.eventos_entre(
+        _ensure_date(fecha_inicio), _ensure_date(fecha_fin), _cargar_eventos_semana
+    )
@@ -6,12 +6,31 @@ Sistema de eventos recurrentes - Opción C (Maestro + Instancias)
 from datetime import datetime, date, time, timedelta
 from core.db.schema import Evento, RecurrenciaEnum
 from core.db.db import SessionLocal as Session  # migrado desde core.db.sessions
+from modules.agenda.cache_eventos import EVENTOS_CACHE
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _siguiente_fecha(fecha_actual, recurrencia):
+    """Fecha de la siguiente instancia de una serie (None si no es recurrente)"""
+    if recurrencia == RecurrenciaEnum.diario:
+        return fecha_actual + timedelta(days=1)
+    elif recurrencia == RecurrenciaEnum.semanal:
+        return fecha_actual + timedelta(weeks=1)
+    elif recurrencia == RecurrenciaEnum.mensual:
+        if fecha_actual.month == 12:
+            return fecha_actual.replace(year=fecha_actual.year + 1, month=1)
+        try:
+            return fecha_actual.replace(month=fecha_actual.month + 1)
+        except ValueError:
+            import calendar
+            ultimo_dia = calendar.monthrange(fecha_actual.year, fecha_actual.month + 1)[1]
+            return fecha_actual.replace(month=fecha_actual.month + 1, day=ultimo_dia)
+    return None
+
+
 def crear_evento_recurrente(nombre, descripcion, fecha_inicio, hora_inicio, hora_fin,
                             recurrencia: RecurrenciaEnum, etiquetas=None, tipo_evento="personal",
                             alarma_minutos=5, semanas_futuras=12):
@@ -79,21 +98,8 @@ def crear_evento_recurrente(nombre, descripcion, fecha_inicio, hora_inicio, hora
             session.add(instancia)
             instancias.append(instancia)
 
-            if recurrencia == RecurrenciaEnum.diario:
-                fecha_actual += timedelta(days=1)
-            elif recurrencia == RecurrenciaEnum.semanal:
-                fecha_actual += timedelta(weeks=1)
-            elif recurrencia == RecurrenciaEnum.mensual:
-                if fecha_actual.month == 12:
-                    fecha_actual = fecha_actual.replace(year=fecha_actual.year + 1, month=1)
-                else:
-                    try:
-                        fecha_actual = fecha_actual.replace(month=fecha_actual.month + 1)
-                    except ValueError:
-                        import calendar
-                        ultimo_dia = calendar.monthrange(fecha_actual.year, fecha_actual.month + 1)[1]
-                        fecha_actual = fecha_actual.replace(month=fecha_actual.month + 1, day=ultimo_dia)
-            else:
+            fecha_actual = _siguiente_fecha(fecha_actual, recurrencia)
+            if fecha_actual is None:
                 break
 
         session.commit()
@@ -102,6 +108,8 @@ def crear_evento_recurrente(nombre, descripcion, fecha_inicio, hora_inicio, hora
         for inst in instancias:
             session.refresh(inst)
 
+        EVENTOS_CACHE.invalidar_fechas(fecha_inicio, *(inst.fecha_inicio for inst in instancias))
+
         logger.info(f"Serie creada: {nombre} con {len(instancias)} instancias")
 
         return {
@@ -129,6 +137,8 @@ def editar_instancia(instancia_id, **kwargs):
         if instancia.es_maestro:
             raise ValueError("No puedes editar el maestro directamente. Usa editar_serie()")
 
+        fecha_anterior = instancia.fecha_inicio
+
         for key, value in kwargs.items():
             if hasattr(instancia, key):
                 setattr(instancia, key, value)
@@ -139,6 +149,8 @@ def editar_instancia(instancia_id, **kwargs):
         session.commit()
         session.refresh(instancia)
 
+        EVENTOS_CACHE.invalidar_fechas(fecha_anterior, instancia.fecha_inicio)
+
         logger.info(f"Instancia {instancia_id} editada manualmente")
 
         return instancia
@@ -160,6 +172,8 @@ def editar_serie(master_id, **kwargs):
         if not maestro:
             raise ValueError("Evento maestro no encontrado")
 
+        fechas_afectadas = {maestro.fecha_inicio}
+
         for key, value in kwargs.items():
             if hasattr(maestro, key):
                 setattr(maestro, key, value)
@@ -173,13 +187,19 @@ def editar_serie(master_id, **kwargs):
         ).all()
 
         for instancia in instancias:
+            fechas_afectadas.add(instancia.fecha_inicio)
             for key, value in kwargs.items():
                 if hasattr(instancia, key):
                     setattr(instancia, key, value)
             instancia.modificado_en = datetime.utcnow()
+            fechas_afectadas.add(instancia.fecha_inicio)
+
+        fechas_afectadas.add(maestro.fecha_inicio)
 
         session.commit()
 
+        EVENTOS_CACHE.invalidar_fechas(*fechas_afectadas)
+
         logger.info(f"Serie {master_id} editada: maestro + {len(instancias)} instancias")
 
         return {
@@ -207,9 +227,12 @@ def eliminar_instancia(instancia_id):
         if instancia.es_maestro:
             raise ValueError("No puedes eliminar el maestro directamente. Usa eliminar_serie()")
 
+        fecha = instancia.fecha_inicio
         session.delete(instancia)
         session.commit()
 
+        EVENTOS_CACHE.invalidar_fechas(fecha)
+
         logger.info(f"Instancia {instancia_id} eliminada")
 
         return True
@@ -238,14 +261,18 @@ def eliminar_serie(master_id, incluir_pasadas=False):
             query = query.filter(Evento.fecha_inicio >= hoy)
 
         instancias = query.all()
+        fechas_afectadas = {maestro.fecha_inicio}
 
         for instancia in instancias:
+            fechas_afectadas.add(instancia.fecha_inicio)
             session.delete(instancia)
 
         session.delete(maestro)
 
         session.commit()
 
+        EVENTOS_CACHE.invalidar_fechas(*fechas_afectadas)
+
         logger.info(f"Serie {master_id} eliminada: maestro + {len(instancias)} instancias")
 
         return len(instancias)
@@ -343,3 +370,83 @@ def obtener_info_serie(evento_id):
         logger.error(f"Error en obtener_info_serie: {e}")
         session.close()
         return None
+
+
+def extender_series(semanas_futuras=12):
+    """
+    Genera las instancias que faltan para que cada serie cubra las próximas
+    `semanas_futuras` semanas (las series se crean con un horizonte fijo).
+
+    Pensado para correr periódicamente como tarea de fondo.
+
+    Returns:
+        list[Evento]: instancias creadas
+    """
+    from sqlalchemy import func
+
+    limite = date.today() + timedelta(weeks=semanas_futuras)
+    session = Session()
+
+    try:
+        ultimas = dict(session.query(
+            Evento.master_id, func.max(Evento.fecha_inicio)
+        ).filter(
+            Evento.es_maestro == False,
+            Evento.master_id.isnot(None)
+        ).group_by(Evento.master_id).all())
+
+        maestros = session.query(Evento).filter(
+            Evento.es_maestro == True,
+            Evento.recurrencia != RecurrenciaEnum.unico
+        ).all()
+
+        nuevas = []
+        for maestro in maestros:
+            ultima = ultimas.get(maestro.id)
+            if ultima is None:
+                continue
+
+            fecha_actual = _siguiente_fecha(ultima, maestro.recurrencia)
+            while fecha_actual is not None and fecha_actual <= limite:
+                nuevas.append(Evento(
+                    id=str(uuid.uuid4()),
+                    nombre=maestro.nombre,
+                    descripcion=maestro.descripcion,
+                    fecha_inicio=fecha_actual,
+                    hora_inicio=maestro.hora_inicio,
+                    hora_fin=maestro.hora_fin,
+                    recurrencia=maestro.recurrencia,
+                    etiquetas=list(maestro.etiquetas or []),
+                    tipo_evento=maestro.tipo_evento,
+                    alarma_minutos=maestro.alarma_minutos,
+                    alarma_activa=maestro.alarma_activa,
+                    es_maestro=False,
+                    master_id=maestro.id,
+                    modificado_manualmente=False,
+                    creado_en=datetime.utcnow(),
+                    modificado_en=datetime.utcnow()
+                ))
+                fecha_actual = _siguiente_fecha(fecha_actual, maestro.recurrencia)
+
+        if not nuevas:
+            return []
+
+        session.add_all(nuevas)
+        session.commit()
+
+        for inst in nuevas:
+            session.refresh(inst)
+            session.expunge(inst)
+
+        EVENTOS_CACHE.invalidar_fechas(*(inst.fecha_inicio for inst in nuevas))
+
+        logger.info(f"Series extendidas: {len(nuevas)} instancias nuevas hasta {limite}")
+
+        return nuevas
+
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error al extender series: {e}")
+        raise
+    finally:
+        session.close()
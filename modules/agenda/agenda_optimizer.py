@@ -17,6 +17,7 @@ import json
 from pathlib import Path
 from core.db.sessions import SessionLocal
 from core.db.schema import Evento, RecurrenciaEnum
+from core.db.vistas import consultar_eventos
 from core.context.logs import BITACORA
 from core.context.global_session import SESSION
 import uuid
@@ -115,11 +116,12 @@ class PlantillaSemana:
         session = SessionLocal()
 
         # Obtener eventos de esta semana
-        eventos = session.query(Evento).filter(
+        eventos = consultar_eventos(
+            session,
             Evento.fecha_inicio >= lunes,
             Evento.fecha_inicio <= domingo,
             Evento.es_maestro == False
-        ).all()
+        )
 
         session.close()
 
@@ -206,6 +208,7 @@ class PlantillaSemana:
 
         session = SessionLocal()
         eventos_creados = 0
+        fechas_creadas = set()
 
         # Aplicar a cada semana
         for offset_semana in range(num_semanas):
@@ -250,10 +253,14 @@ class PlantillaSemana:
 
                 session.add(evento)
                 eventos_creados += 1
+                fechas_creadas.add(fecha_evento)
 
         session.commit()
         session.close()
 
+        from modules.agenda.cache_eventos import EVENTOS_CACHE
+        EVENTOS_CACHE.invalidar_fechas(*fechas_creadas)
+
         print(f"✅ Plantilla '{nombre}' aplicada: {eventos_creados} eventos creados")
 
         BITACORA.registrar("agenda", "plantilla_aplicada",
@@ -6,20 +6,21 @@ Se debe ejecutar los domingos a las 23:59
 Opciones de automatización:
 1. Cron job (Linux/Mac)
 2. Task Scheduler (Windows)
-3. Integrar en LOBO como tarea en background
+3. Integrar en LOBO como tarea en background (ver tarea_archivado)
 """
 
 from datetime import datetime, date
 from modules.agenda.sheets_manager import SHEETS_MANAGER
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s'
-)
-
 logger = logging.getLogger(__name__)
 
+# Semanas pasadas que se quedan en la DB; lo anterior va al archivo histórico local
+SEMANAS_EN_DB = 4
+# Clave de data/config.json que habilita mover filas de la DB al archivo desde
+# la tarea de fondo (apagada: solo con limpiar_db_pasados eliminar, que confirma)
+CLAVE_ARCHIVADO_DB = 'archivado_db_automatico'
+
 
 def ejecutar_archivado():
     """Ejecuta el archivado de hojas antiguas"""
@@ -54,7 +55,51 @@ def ejecutar_archivado():
         return False
 
 
+def tarea_archivado():
+    """
+    Versión para el runtime de LOBO: se consulta periódicamente y archiva
+    una sola vez por semana, en cuanto la semana anterior ya terminó.
+
+    La última semana procesada se guarda en la configuración para no repetir
+    el archivado tras reiniciar.
+
+    Las filas de la DB solo se mueven al archivo histórico si la configuración
+    tiene CLAVE_ARCHIVADO_DB en true; por defecto eso queda para el comando
+    limpiar_db_pasados, que pide confirmación.
+    """
+    from core.config import Config
+
+    config = Config()
+    anio, semana, _ = date.today().isocalendar()
+    clave = f"{anio}-W{semana:02d}"
+
+    if config.data.get('ultima_semana_archivada') == clave:
+        return False
+
+    hojas_archivadas = SHEETS_MANAGER.archivar_semanas_antiguas()
+    if hojas_archivadas:
+        logger.info(f"✅ Archivadas: {', '.join(hojas_archivadas)}")
+
+    # Filas de semanas pasadas: de las tablas de la DB al archivo histórico local
+    if config.data.get(CLAVE_ARCHIVADO_DB, False):
+        from modules.agenda.agenda_fixes import LimpiadorDB
+        eventos = LimpiadorDB.eliminar_eventos_pasados(SEMANAS_EN_DB)
+        recordatorios = LimpiadorDB.archivar_recordatorios_pasados(SEMANAS_EN_DB)
+        if eventos or recordatorios:
+            LimpiadorDB.optimizar_db()
+            logger.info(f"🗄️  Archivo local: {eventos} eventos y {recordatorios} recordatorios")
+
+    config.data['ultima_semana_archivada'] = clave
+    config.save_config()
+    return True
+
+
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s'
+    )
+
     print("=" * 70)
     print("  ARCHIVADO AUTOMÁTICO DE HOJAS ANTIGUAS")
     print("=" * 70)
@@ -0,0 +1,131 @@
+# modules/agenda/cache_eventos.py
+"""
+Cache en proceso de eventos agrupados por semana ISO
+- Evita repetir el mismo SELECT dentro de un comando (dashboard, disponibilidad, conflictos)
+- LRU: solo conserva las semanas consultadas más recientemente
+- Write-through: las funciones de escritura invalidan exactamente las semanas que tocan
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Semanas que se mantienen en memoria (~4 meses)
+MAX_SEMANAS_CACHE = 16
+
+
+def clave_semana(fecha: date):
+    """Retorna la clave (año ISO, semana ISO) de una fecha"""
+    iso = fecha.isocalendar()
+    return (iso[0], iso[1])
+
+
+class CacheEventosSemana:
+    """
+    Cache LRU de eventos por semana ISO.
+
+    Cada entrada guarda la tupla de eventos de lunes a domingo. Los lectores
+    piden días o rangos y el cache resuelve qué semanas necesita cargar.
+    """
+
+    def __init__(self, max_semanas: int = MAX_SEMANAS_CACHE):
+        self.max_semanas = max_semanas
+        self._semanas = OrderedDict()  # (año, semana) -> tuple(eventos)
+        self._versiones = {}  # (año, semana) -> contador de invalidaciones
+        self._generacion = 0  # Sube con invalidar_todo (cubre semanas aún sin versión)
+        self._lock = threading.RLock()
+
+        # Estadísticas
+        self.hits = 0
+        self.misses = 0
+        self.invalidaciones = 0
+
+    def obtener_semana(self, fecha: date, cargador):
+        """
+        Retorna los eventos de la semana de `fecha`
+
+        Args:
+            fecha: date dentro de la semana
+            cargador: callable(lunes, domingo) -> iterable de eventos
+        """
+        clave = clave_semana(fecha)
+
+        with self._lock:
+            if clave in self._semanas:
+                self._semanas.move_to_end(clave)
+                self.hits += 1
+                return self._semanas[clave]
+            self.misses += 1
+            version = (self._generacion, self._versiones.get(clave, 0))
+
+        # Cargar fuera del lock para no bloquear otros hilos durante el SQL
+        lunes = fecha - timedelta(days=fecha.weekday())
+        eventos = tuple(cargador(lunes, lunes + timedelta(days=6)))
+
+        with self._lock:
+            # Si alguien escribió en esta semana mientras cargábamos, no guardar datos viejos
+            if (self._generacion, self._versiones.get(clave, 0)) == version:
+                self._semanas[clave] = eventos
+                self._semanas.move_to_end(clave)
+                while len(self._semanas) > self.max_semanas:
+                    self._semanas.popitem(last=False)
+
+        return eventos
+
+    def eventos_del_dia(self, fecha: date, cargador):
+        """Eventos de un solo día"""
+        return [ev for ev in self.obtener_semana(fecha, cargador) if ev.fecha_inicio == fecha]
+
+    def eventos_entre(self, fecha_inicio: date, fecha_fin: date, cargador):
+        """Eventos entre dos fechas (inclusive), cargando solo las semanas faltantes"""
+        resultado = []
+        lunes = fecha_inicio - timedelta(days=fecha_inicio.weekday())
+
+        while lunes <= fecha_fin:
+            for ev in self.obtener_semana(lunes, cargador):
+                if fecha_inicio <= ev.fecha_inicio <= fecha_fin:
+                    resultado.append(ev)
+            lunes += timedelta(weeks=1)
+
+        return resultado
+
+    def invalidar_fechas(self, *fechas):
+        """Invalida las semanas que contienen las fechas dadas (ignora None)"""
+        claves = {clave_semana(f) for f in fechas if f is not None}
+
+        with self._lock:
+            for clave in claves:
+                self._versiones[clave] = self._versiones.get(clave, 0) + 1
+                self._semanas.pop(clave, None)
+            self.invalidaciones += len(claves)
+
+        if claves:
+            logger.debug(f"Cache de eventos invalidado: {sorted(claves)}")
+
+    def invalidar_todo(self):
+        """Vacía el cache completo (para operaciones masivas)"""
+        with self._lock:
+            # Una carga en curso de cualquier semana, con versión o sin ella, ya no se guarda
+            self._generacion += 1
+            self._versiones.clear()
+            self._semanas.clear()
+            self.invalidaciones += 1
+
+    def get_stats(self):
+        """Retorna estadísticas de uso"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'semanas_en_cache': len(self._semanas),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidaciones': self.invalidaciones,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# ===== INSTANCIA GLOBAL =====
+EVENTOS_CACHE = CacheEventosSemana()
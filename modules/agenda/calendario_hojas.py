@@ -0,0 +1,214 @@
+# modules/agenda/calendario_hojas.py
+"""
+Calendario de hojas semanales: nombre <-> lunes de la semana
+- Único lugar que genera y parsea nombres de hoja ("20-26 oct", "27 oct-02 nov")
+- Independiente del locale del proceso: meses en español fijos, no strftime('%b')
+- Patrón precompilado y caché LRU en ambos sentidos
+- Año explícito: cada hoja lleva su lunes ISO como developer metadata
+  ("lobo_lunes"); el nombre solo se usa para hojas antiguas sin metadata
+- Índice {lunes: hoja} cargado con UNA lectura de metadata del spreadsheet
+"""
+
+import logging
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+CLAVE_METADATA = "lobo_lunes"
+
+# Generación: siempre en español, sin depender del locale
+MESES_ABREV = ("ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic")
+
+# Parseo: también los nombres creados con locale en inglés (o "set" de algunos locales)
+_MESES_PARSEO = {
+    **{abrev: i for i, abrev in enumerate(MESES_ABREV, start=1)},
+    "jan": 1, "apr": 4, "aug": 8, "set": 9, "dec": 12,
+}
+
+# "20-26 oct", "27 oct-02 nov", "29 dic. - 04 ene." (ya normalizado: minúsculas, sin puntos)
+_PATRON_NOMBRE = re.compile(r"^(\d{1,2})\s*(?:([a-z]{3})[a-z]*)?\s*-\s*(\d{1,2})\s+([a-z]{3})[a-z]*$")
+
+
+def lunes_de(fecha):
+    return fecha - timedelta(days=fecha.weekday())
+
+
+@lru_cache(maxsize=512)
+def nombre_hoja(lunes):
+    """Nombre de la hoja de la semana que empieza en `lunes`"""
+    domingo = lunes + timedelta(days=6)
+    if lunes.month == domingo.month:
+        return f"{lunes.day:02d}-{domingo.day:02d} {MESES_ABREV[lunes.month - 1]}"
+    return f"{lunes.day:02d} {MESES_ABREV[lunes.month - 1]}-{domingo.day:02d} {MESES_ABREV[domingo.month - 1]}"
+
+
+def nombre_para_fecha(fecha):
+    return nombre_hoja(lunes_de(fecha))
+
+
+@lru_cache(maxsize=1024)
+def _parsear(nombre, hoy):
+    normalizado = nombre.lower().replace(".", "").replace(",", "").strip()
+    match = _PATRON_NOMBRE.match(normalizado)
+    if not match:
+        return None
+
+    dia, mes_inicio, _, mes_fin = match.groups()
+    mes = _MESES_PARSEO.get(mes_inicio or mes_fin)
+    if mes is None or mes_fin not in _MESES_PARSEO:
+        return None
+
+    # Sin año en el nombre: entre el año pasado, el actual y el siguiente, el
+    # que hace caer ese día en lunes; si varios (o ninguno), el más cercano a hoy
+    candidatos = []
+    for anio in (hoy.year - 1, hoy.year, hoy.year + 1):
+        try:
+            candidatos.append(date(anio, mes, int(dia)))
+        except ValueError:
+            continue
+    if not candidatos:
+        return None
+
+    lunes = [c for c in candidatos if c.weekday() == 0] or candidatos
+    return min(lunes, key=lambda c: abs((c - hoy).days))
+
+
+def lunes_desde_nombre(nombre, hoy=None):
+    """Lunes de la semana de una hoja a partir de su nombre (None si no es semanal)"""
+    return _parsear(nombre, hoy or date.today())
+
+
+# ============================================================================
+# Índice de hojas del spreadsheet
+# ============================================================================
+
+class CalendarioHojas:
+    """Índice {lunes: Worksheet} de las hojas semanales, con el año desde metadata"""
+
+    def __init__(self):
+        self._indice = None  # {lunes: Worksheet}
+        self._otras = []  # Hojas no semanales (plantilla, historial...)
+        self._sin_metadata = {}  # {sheetId: lunes} deducido del nombre
+
+    def invalidar(self):
+        self._indice = None
+
+    def cargar(self, spreadsheet, forzar=False):
+        """
+        Carga el índice con una sola lectura (propiedades + developer metadata)
+
+        Returns:
+            dict: {lunes: Worksheet}
+        """
+        if self._indice is not None and not forzar:
+            return self._indice
+
+        from gspread.worksheet import Worksheet
+        from core.lobo_google.rate_limiter import RATE_LIMITER
+
+        RATE_LIMITER.wait_if_needed()
+        datos = spreadsheet.fetch_sheet_metadata(params={"fields": "sheets(properties,developerMetadata)"})
+
+        indice = {}
+        otras = []
+        sin_metadata = {}
+        hoy = date.today()
+
+        for hoja in datos.get("sheets", []):
+            props = hoja["properties"]
+            worksheet = Worksheet(spreadsheet, props, spreadsheet.id, spreadsheet.client)
+
+            lunes = None
+            for meta in hoja.get("developerMetadata", []):
+                if meta.get("metadataKey") == CLAVE_METADATA:
+                    try:
+                        lunes = date.fromisoformat(meta["metadataValue"])
+                    except (KeyError, ValueError):
+                        lunes = None
+                    break
+
+            if lunes is None:
+                lunes = lunes_desde_nombre(props["title"], hoy)
+                if lunes is not None:
+                    sin_metadata[props["sheetId"]] = lunes
+
+            if lunes is None or lunes in indice:
+                otras.append(worksheet)
+            else:
+                indice[lunes] = worksheet
+
+        self._indice = indice
+        self._otras = otras
+        self._sin_metadata = sin_metadata
+        return indice
+
+    def hojas(self, spreadsheet, forzar=False):
+        """list[(lunes, Worksheet)] en orden cronológico"""
+        return sorted(self.cargar(spreadsheet, forzar).items(), key=lambda x: x[0])
+
+    def otras(self, spreadsheet):
+        self.cargar(spreadsheet)
+        return list(self._otras)
+
+    def hoja_para(self, spreadsheet, fecha):
+        """
+        Hoja de la semana de `fecha` o None
+
+        Si no está en el índice se recarga una vez (pudo crearse desde la web).
+        """
+        lunes = lunes_de(fecha)
+        hoja = self.cargar(spreadsheet).get(lunes)
+        if hoja is None:
+            hoja = self.cargar(spreadsheet, forzar=True).get(lunes)
+        return hoja
+
+    def registrar(self, lunes, hoja):
+        if self._indice is not None:
+            self._indice[lunes] = hoja
+
+    def quitar(self, lunes):
+        if self._indice is not None:
+            self._indice.pop(lunes, None)
+
+    @staticmethod
+    def request_metadata(sheet_id, lunes):
+        """createDeveloperMetadata con el lunes ISO de la hoja"""
+        return {
+            "createDeveloperMetadata": {
+                "developerMetadata": {
+                    "metadataKey": CLAVE_METADATA,
+                    "metadataValue": lunes.isoformat(),
+                    "location": {"sheetId": sheet_id},
+                    "visibility": "DOCUMENT"
+                }
+            }
+        }
+
+    def etiquetar_pendientes(self, spreadsheet):
+        """
+        Guarda como metadata el lunes de las hojas que solo lo tenían en el
+        nombre (hojas antiguas), en un solo batch_update
+
+        Returns:
+            int: hojas etiquetadas
+        """
+        self.cargar(spreadsheet)
+        if not self._sin_metadata:
+            return 0
+
+        from core.lobo_google.rate_limiter import RATE_LIMITER
+
+        requests = [self.request_metadata(sheet_id, lunes) for sheet_id, lunes in self._sin_metadata.items()]
+        RATE_LIMITER.wait_if_needed()
+        spreadsheet.batch_update({"requests": requests})
+
+        etiquetadas = len(self._sin_metadata)
+        self._sin_metadata = {}
+        logger.info(f"🏷️  {etiquetadas} hojas etiquetadas con su lunes ({CLAVE_METADATA})")
+        return etiquetadas
+
+
+# ===== INSTANCIA GLOBAL =====
+CALENDARIO_HOJAS = CalendarioHojas()
@@ -4,14 +4,16 @@ Sistema de detección y resolución de conflictos de horarios
 """
 
 from datetime import datetime, date, time, timedelta
-from core.db.db import SessionLocal  # migrado desde core.db.sessions
-from core.db.schema import Evento
-from sqlalchemy import and_
+from modules.agenda.agenda_logics import listar_eventos_por_fecha
 
 
 class GestorConflictos:
-    def __init__(self):
-        self.db = SessionLocal()
+    def _eventos_del_dia(self, fecha):
+        """Instancias del día (sin maestros), servidas desde el cache de eventos"""
+        return sorted(
+            (ev for ev in listar_eventos_por_fecha(fecha) if not ev.es_maestro),
+            key=lambda ev: ev.hora_inicio
+        )
 
     def detectar_conflictos(self, fecha, hora_inicio, hora_fin, evento_id_excluir=None):
         if isinstance(fecha, str):
@@ -21,17 +23,10 @@ class GestorConflictos:
         if isinstance(hora_fin, str):
             hora_fin = datetime.strptime(hora_fin, "%H:%M").time()
 
-        query = self.db.query(Evento).filter(
-            and_(
-                Evento.fecha_inicio == fecha,
-                Evento.es_maestro == False
-            )
-        )
-
-        if evento_id_excluir:
-            query = query.filter(Evento.id != evento_id_excluir)
-
-        eventos_dia = query.all()
+        eventos_dia = [
+            ev for ev in self._eventos_del_dia(fecha)
+            if ev.id != evento_id_excluir
+        ]
 
         conflictos = []
 
@@ -60,12 +55,7 @@ class GestorConflictos:
         if isinstance(hora_maxima, str):
             hora_maxima = datetime.strptime(hora_maxima, "%H:%M").time()
 
-        eventos = self.db.query(Evento).filter(
-            and_(
-                Evento.fecha_inicio == fecha,
-                Evento.es_maestro == False
-            )
-        ).order_by(Evento.hora_inicio).all()
+        eventos = self._eventos_del_dia(fecha)
 
         bloques_libres = []
         hora_actual = hora_minima
@@ -0,0 +1,324 @@
+# modules/agenda/render_agenda.py
+"""
+Render de eventos en las columnas de día de las hojas semanales
+- Construye los requests de pintar/limpiar celdas (sin llamar al API)
+- Layout por día: los eventos que se traslapan forman un solo bloque con
+  marca ⚠️ y sus nombres apilados en la celda de inicio
+- Planificador de ediciones: compara el layout del día antes y después del
+  cambio y emite UN solo batch_update que limpia lo liberado y repinta solo
+  los bloques afectados
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+BORDE_SOLIDO = {"style": "SOLID", "width": 1, "color": {"red": 0, "green": 0, "blue": 0}}
+BORDE_NINGUNO = {"style": "NONE"}
+
+# Área de eventos de la plantilla: B2:H31 (columna A = horas, fila 1 = días)
+FILA_PRIMERA, FILA_ULTIMA = 2, 31
+COL_PRIMERA, COL_ULTIMA = 2, 8
+
+MARCA_TRASLAPE = "⚠️"
+COLOR_TRASLAPE = (1.0, 0.6, 0.4)
+
+
+def _rango_columna(sheet_id, fila_inicio, fila_fin, col, col_fin=None):
+    """Rango de la API (índices base 0, fin exclusivo) para filas [inicio, fin] de columnas [col, col_fin]"""
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": fila_inicio - 1,
+        "endRowIndex": fila_fin,
+        "startColumnIndex": col - 1,
+        "endColumnIndex": col_fin or col
+    }
+
+
+def _estilo_evento(color_rgb):
+    """Formato de un bloque de evento, uno por color (ver core.lobo_google.estilos)"""
+    from core.lobo_google.estilos import ESTILOS, color
+    from modules.agenda.agenda_logics import calcular_color_texto
+
+    def fabrica():
+        return {
+            "backgroundColor": color(color_rgb),
+            "textFormat": {"foregroundColor": color(calcular_color_texto(color_rgb)), "bold": True},
+            "wrapStrategy": "WRAP"
+        }
+
+    return ESTILOS.obtener(("evento", tuple(color_rgb)), fabrica)
+
+
+def requests_pintar(sheet_id, fila_inicio, fila_fin, col, texto, color_rgb):
+    """Formato en todo el bloque (una vez), texto en la primera celda y borde alrededor"""
+    rango = _rango_columna(sheet_id, fila_inicio, fila_fin, col)
+
+    return [
+        {
+            "repeatCell": {
+                "range": rango,
+                "cell": {"userEnteredFormat": _estilo_evento(color_rgb)},
+                "fields": "userEnteredFormat"
+            }
+        },
+        {
+            "updateCells": {
+                "range": _rango_columna(sheet_id, fila_inicio, fila_inicio, col),
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": texto}}]}],
+                "fields": "userEnteredValue"
+            }
+        },
+        {
+            "updateBorders": {
+                "range": rango,
+                "top": BORDE_SOLIDO, "bottom": BORDE_SOLIDO, "left": BORDE_SOLIDO, "right": BORDE_SOLIDO,
+            }
+        }
+    ]
+
+
+def requests_limpiar(sheet_id, fila_inicio, fila_fin, col, col_fin=None):
+    """Valor, formato y bordes de vuelta a vacío, en el mismo batch_update"""
+    rango = _rango_columna(sheet_id, fila_inicio, fila_fin, col, col_fin)
+    return [
+        {
+            "updateCells": {
+                "range": rango,
+                "fields": "userEnteredValue,userEnteredFormat"
+            }
+        },
+        {
+            "updateBorders": {
+                "range": rango,
+                "top": BORDE_NINGUNO, "bottom": BORDE_NINGUNO, "left": BORDE_NINGUNO, "right": BORDE_NINGUNO,
+            }
+        }
+    ]
+
+
+def _color_evento(evento):
+    from modules.agenda.agenda_logics import COLORES_TIPO_EVENTO
+
+    tipo = getattr(evento, 'tipo_evento', 'personal')
+    return COLORES_TIPO_EVENTO.get(tipo, COLORES_TIPO_EVENTO['default'])
+
+
+def _texto_evento(evento):
+    descripcion = getattr(evento, 'descripcion', None)
+    if descripcion:
+        return f"{evento.nombre}\n{descripcion}"
+    return evento.nombre
+
+
+def requests_evento(sheet, evento, color_rgb=None):
+    """Requests para pintar un evento suelto en su hoja (sin mirar traslapes)"""
+    from modules.agenda.agenda_logics import _date_to_col, _time_to_row
+
+    fila_inicio = _time_to_row(sheet, evento.hora_inicio)
+    fila_fin = _time_to_row(sheet, evento.hora_fin)
+    col = _date_to_col(evento.fecha_inicio)
+
+    return requests_pintar(sheet.id, fila_inicio, fila_fin, col, _texto_evento(evento),
+                           color_rgb or _color_evento(evento))
+
+
+def _tramos(filas):
+    """Agrupa filas en tramos contiguos: {3,4,5,9} -> [(3, 5), (9, 9)]"""
+    tramos = []
+    for fila in sorted(filas):
+        if tramos and fila == tramos[-1][1] + 1:
+            tramos[-1] = (tramos[-1][0], fila)
+        else:
+            tramos.append((fila, fila))
+    return tramos
+
+
+def _filas_evento(sheet, evento):
+    from modules.agenda.agenda_logics import _time_to_row
+    return set(range(_time_to_row(sheet, evento.hora_inicio), _time_to_row(sheet, evento.hora_fin) + 1))
+
+
+# ============================================================================
+# Layout de un día
+# ============================================================================
+
+def _minutos(hora):
+    return hora.hour * 60 + hora.minute
+
+
+def agrupar_traslapes(eventos):
+    """
+    Agrupa los eventos de un día en cadenas de traslapes
+
+    Mismo criterio que GestorConflictos._hay_traslape (inicio1 < fin2 y
+    fin1 > inicio2): eventos que solo se tocan (10:00-11:00 y 11:00-12:00)
+    quedan en grupos distintos. El orden es estable para que dos renders
+    del mismo día produzcan los mismos requests.
+    """
+    orden = sorted(eventos, key=lambda ev: (_minutos(ev.hora_inicio), _minutos(ev.hora_fin),
+                                            ev.nombre, str(getattr(ev, 'id', None) or '')))
+    grupos = []
+    fin_grupo = None
+
+    for ev in orden:
+        if grupos and _minutos(ev.hora_inicio) < fin_grupo:
+            grupos[-1].append(ev)
+            fin_grupo = max(fin_grupo, _minutos(ev.hora_fin))
+        else:
+            grupos.append([ev])
+            fin_grupo = _minutos(ev.hora_fin)
+
+    return grupos
+
+
+def _texto_traslape(grupo):
+    lineas = [f"{MARCA_TRASLAPE} {len(grupo)} eventos traslapados"]
+    lineas += [f"{ev.hora_inicio.strftime('%H:%M')}-{ev.hora_fin.strftime('%H:%M')} {ev.nombre}"
+               for ev in grupo]
+    return "\n".join(lineas)
+
+
+def bloques_dia(sheet, eventos, colores=None):
+    """
+    Layout de una columna: un bloque por evento suelto y uno por grupo de traslapes
+
+    Args:
+        sheet: hoja de la semana
+        eventos: eventos del día (sin maestros)
+        colores: {evento_id: rgb} para forzar el color de un evento suelto
+
+    Returns:
+        list[dict]: {'filas', 'texto', 'color', 'eventos'} por fila de inicio
+    """
+    colores = colores or {}
+    bloques = []
+
+    for grupo in agrupar_traslapes(eventos):
+        filas = set()
+        visibles = []
+        for ev in grupo:
+            try:
+                filas |= _filas_evento(sheet, ev)
+                visibles.append(ev)
+            except ValueError:
+                logger.debug(f"'{ev.nombre}' queda fuera del horario de la hoja")
+
+        if not visibles:
+            continue
+
+        if len(visibles) == 1:
+            ev = visibles[0]
+            texto = _texto_evento(ev)
+            color = colores.get(getattr(ev, 'id', None)) or _color_evento(ev)
+        else:
+            texto = _texto_traslape(visibles)
+            color = COLOR_TRASLAPE
+
+        bloques.append({
+            'filas': set(range(min(filas), max(filas) + 1)),
+            'texto': texto,
+            'color': color,
+            'eventos': visibles
+        })
+
+    return bloques
+
+
+def _requests_bloque(sheet_id, col, bloque):
+    return requests_pintar(sheet_id, min(bloque['filas']), max(bloque['filas']), col,
+                           bloque['texto'], bloque['color'])
+
+
+def _sin_maestros(eventos):
+    return [ev for ev in eventos if not getattr(ev, 'es_maestro', False)]
+
+
+def requests_semana(sheet, eventos, limpiar=True):
+    """
+    Render completo de una hoja: limpia B2:H31 y pinta el layout de cada día
+
+    Determinista: el mismo conjunto de eventos produce siempre los mismos
+    requests, así que un resync no necesita pasadas de reparación.
+    """
+    from modules.agenda.agenda_logics import _date_to_col
+
+    requests = []
+    if limpiar:
+        requests += requests_limpiar(sheet.id, FILA_PRIMERA, FILA_ULTIMA, COL_PRIMERA, COL_ULTIMA)
+
+    por_dia = {}
+    for ev in _sin_maestros(eventos):
+        por_dia.setdefault(ev.fecha_inicio, []).append(ev)
+
+    for fecha in sorted(por_dia):
+        col = _date_to_col(fecha)
+        for bloque in bloques_dia(sheet, por_dia[fecha]):
+            requests += _requests_bloque(sheet.id, col, bloque)
+
+    return requests
+
+
+def plan_columna(sheet, fecha, quitar=(), pintar=(), colores=None):
+    """
+    Requests que dejan la columna de `fecha` como indica la DB tras un cambio
+
+    Args:
+        sheet: hoja de la semana de `fecha`
+        fecha: día de la columna
+        quitar: eventos que ya no están en esta columna (versión anterior)
+        pintar: eventos nuevos o editados a pintar en esta columna
+        colores: {evento_id: rgb} para forzar colores (ver bloques_dia)
+
+    Returns:
+        list: requests (limpiar lo liberado + repintar bloques afectados)
+    """
+    from modules.agenda.agenda_logics import _date_to_col, listar_eventos_por_fecha
+
+    col = _date_to_col(fecha)
+    fuera = {ev.id for ev in [*quitar, *pintar] if getattr(ev, 'id', None)}
+    base = [ev for ev in _sin_maestros(listar_eventos_por_fecha(fecha)) if ev.id not in fuera]
+
+    # Filas liberadas: el bloque COMPLETO donde estaba lo quitado (con su grupo de traslapes)
+    quitados = {id(ev) for ev in quitar}
+    liberadas = set()
+    for bloque in bloques_dia(sheet, [*base, *quitar]):
+        if any(id(ev) in quitados for ev in bloque['eventos']):
+            liberadas |= bloque['filas']
+
+    nuevos = {id(ev) for ev in pintar}
+    bloques = bloques_dia(sheet, [*base, *pintar], colores)
+    afectados = [b for b in bloques
+                 if b['filas'] & liberadas or any(id(ev) in nuevos for ev in b['eventos'])]
+
+    # La fila de fin de un bloque es la de inicio del siguiente: si se repinta
+    # uno, sus vecinos de fila también, en orden, para que cada texto quede visible
+    crecio = True
+    while crecio:
+        filas_afectadas = set().union(*(b['filas'] for b in afectados))
+        vecinos = [b for b in bloques if b not in afectados and b['filas'] & filas_afectadas]
+        afectados += vecinos
+        crecio = bool(vecinos)
+
+    ocupadas = set().union(*(b['filas'] for b in bloques))
+
+    requests = []
+    for fila_inicio, fila_fin in _tramos(liberadas - ocupadas):
+        requests += requests_limpiar(sheet.id, fila_inicio, fila_fin, col)
+
+    for bloque in bloques:
+        if bloque in afectados:
+            requests += _requests_bloque(sheet.id, col, bloque)
+
+    return requests
+
+
+def enviar(sheet, requests):
+    """Un solo batch_update para todo el plan"""
+    if not requests:
+        return False
+
+    from core.lobo_google.rate_limiter import RATE_LIMITER
+    RATE_LIMITER.wait_if_needed()
+    sheet.spreadsheet.batch_update({"requests": requests})
+    return True
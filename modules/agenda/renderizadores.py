@@ -0,0 +1,479 @@
+# modules/agenda/renderizadores.py
+"""
+Backends de render de la agenda
+- Todos parten de la misma proyección semanal (proyectar_semana)
+- Sheets: la hoja semanal de Google Sheets (gasta cuota del API)
+- ICS / CSV / HTML: archivos locales en exports/, sin cuota; un año entero
+  se regenera en milisegundos
+- renderizar(): corre los backends pedidos y, si Sheets falla (cuota, red),
+  cae a los locales para que siempre haya una vista actualizada
+"""
+
+import csv
+import html
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+RUTA_EXPORTS = "exports"
+
+# Semanas por defecto de exportar_agenda: un año en local, actual + siguiente en Sheets
+SEMANAS_LOCALES = 52
+SEMANAS_SHEETS = 2
+
+# Grilla de las vistas locales: la misma que la columna A de la plantilla (07:00-21:30)
+HORA_INICIO_GRILLA = 7
+SLOTS_GRILLA = 30
+MINUTOS_SLOT = 30
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+
+# ============================================================================
+# Proyección semanal compartida
+# ============================================================================
+
+def lunes_de(fecha):
+    return fecha - timedelta(days=fecha.weekday())
+
+
+def proyectar_semana(lunes, eventos, recordatorios=()):
+    """
+    Vista de una semana lista para cualquier backend
+
+    Args:
+        lunes: lunes de la semana
+        eventos: eventos de la semana (los maestros se ignoran)
+        recordatorios: recordatorios pendientes con fecha_limite en la semana
+
+    Returns:
+        dict: {'lunes', 'dias': {fecha: [grupos de traslapes]},
+               'eventos': [...], 'recordatorios': {fecha: [...]}}
+    """
+    from modules.agenda.render_agenda import agrupar_traslapes
+
+    fechas = [lunes + timedelta(days=i) for i in range(7)]
+    por_dia = {fecha: [] for fecha in fechas}
+    for ev in eventos:
+        if not getattr(ev, 'es_maestro', False) and ev.fecha_inicio in por_dia:
+            por_dia[ev.fecha_inicio].append(ev)
+
+    recs = {fecha: [] for fecha in fechas}
+    for rec in recordatorios:
+        if rec.fecha_limite in recs:
+            recs[rec.fecha_limite].append(rec)
+
+    dias = {fecha: agrupar_traslapes(evs) for fecha, evs in por_dia.items()}
+    return {
+        'lunes': lunes,
+        'dias': dias,
+        'eventos': [ev for grupos in dias.values() for grupo in grupos for ev in grupo],
+        'recordatorios': recs,
+    }
+
+
+def cargar_proyecciones(desde=None, semanas=1):
+    """
+    Proyecciones de `semanas` semanas desde la de `desde` (por defecto, la actual)
+
+    Una consulta de eventos y una de recordatorios para todo el rango.
+    """
+    from core.db.db import SessionLocal as Session
+    from core.db.schema import Evento
+    from core.db.vistas import consultar_eventos
+    from core.memory import Memory
+
+    primer_lunes = lunes_de(desde or date.today())
+    ultimo_domingo = primer_lunes + timedelta(weeks=semanas, days=-1)
+
+    session = Session()
+    try:
+        eventos = consultar_eventos(
+            session,
+            Evento.fecha_inicio >= primer_lunes,
+            Evento.fecha_inicio <= ultimo_domingo,
+            Evento.es_maestro == False
+        )
+    finally:
+        session.close()
+
+    recordatorios = [r for r in Memory().recall(estado="pendiente")
+                     if r.fecha_limite and primer_lunes <= r.fecha_limite <= ultimo_domingo]
+
+    eventos_por_semana = {}
+    for ev in eventos:
+        eventos_por_semana.setdefault(lunes_de(ev.fecha_inicio), []).append(ev)
+    recs_por_semana = {}
+    for rec in recordatorios:
+        recs_por_semana.setdefault(lunes_de(rec.fecha_limite), []).append(rec)
+
+    lunes_semanas = [primer_lunes + timedelta(weeks=i) for i in range(semanas)]
+    return [proyectar_semana(lunes, eventos_por_semana.get(lunes, []), recs_por_semana.get(lunes, []))
+            for lunes in lunes_semanas]
+
+
+def _hora(t):
+    return t.strftime('%H:%M')
+
+
+def _slot(hora):
+    """Índice de slot (0..SLOTS_GRILLA) de una hora, recortado a la grilla"""
+    minutos = hora.hour * 60 + hora.minute - HORA_INICIO_GRILLA * 60
+    return max(0, min(SLOTS_GRILLA, minutos // MINUTOS_SLOT))
+
+
+def _horas_grilla():
+    inicio = datetime.combine(date.today(), datetime.min.time()) + timedelta(hours=HORA_INICIO_GRILLA)
+    return [(inicio + timedelta(minutes=MINUTOS_SLOT * i)).strftime('%H:%M') for i in range(SLOTS_GRILLA)]
+
+
+def bloques_grilla(proyeccion):
+    """
+    Bloques de la grilla semanal de las vistas locales
+
+    Returns:
+        list[dict]: {'dia': 0..6, 'slot': inicio, 'slots': alto, 'texto', 'color', 'traslape'}
+    """
+    from modules.agenda.render_agenda import COLOR_TRASLAPE, MARCA_TRASLAPE, _color_evento, _texto_evento
+
+    bloques = []
+    for fecha, grupos in proyeccion['dias'].items():
+        dia = (fecha - proyeccion['lunes']).days
+        for grupo in grupos:
+            inicio = min(_slot(ev.hora_inicio) for ev in grupo)
+            fin = max(_slot(ev.hora_fin) for ev in grupo)
+            if fin <= inicio:
+                if inicio >= SLOTS_GRILLA:
+                    continue  # Fuera del horario de la grilla
+                fin = inicio + 1
+
+            if len(grupo) == 1:
+                texto, color, traslape = _texto_evento(grupo[0]), _color_evento(grupo[0]), False
+            else:
+                lineas = [f"{MARCA_TRASLAPE} {len(grupo)} eventos traslapados"]
+                lineas += [f"{_hora(ev.hora_inicio)}-{_hora(ev.hora_fin)} {ev.nombre}" for ev in grupo]
+                texto, color, traslape = "\n".join(lineas), COLOR_TRASLAPE, True
+
+            bloques.append({'dia': dia, 'slot': inicio, 'slots': fin - inicio,
+                            'texto': texto, 'color': color, 'traslape': traslape})
+    return bloques
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class Renderizador:
+    """Interfaz de un backend: recibe proyecciones semanales y las publica"""
+
+    nombre = ""
+    local = True  # False = consume cuota de un servicio externo
+
+    def renderizar(self, proyecciones):
+        """
+        Returns:
+            str: destino escrito (ruta o descripción)
+        """
+        raise NotImplementedError
+
+
+class RenderizadorSheets(Renderizador):
+    """
+    Hojas semanales de Google Sheets: eventos y recordatorios en un lote por tipo
+
+    Solo repinta semanas que ya tienen hoja (índice de CALENDARIO_HOJAS, una
+    lectura de metadata): crear hojas queda para el SheetsManager, así un
+    export largo no llena el spreadsheet de semanas futuras ni gasta cuota
+    """
+
+    nombre = "sheets"
+    local = False
+
+    def renderizar(self, proyecciones):
+        from core.lobo_google.escritor_lotes import EscritorLotes
+        from modules.agenda.agenda_logics import get_sheets_manager
+        from modules.agenda.calendario_hojas import CALENDARIO_HOJAS
+        from modules.agenda.render_agenda import requests_semana
+        from modules.recordatorios.recordatorios_sheets import _sincronizar_hojas
+
+        manager = get_sheets_manager()
+        existentes = dict(CALENDARIO_HOJAS.hojas(manager.spreadsheet))
+        escritor = EscritorLotes(manager.spreadsheet)
+        hojas = []
+
+        for proyeccion in proyecciones:
+            sheet = existentes.get(proyeccion['lunes'])
+            if sheet is None:
+                continue
+            escritor.formatear(*requests_semana(sheet, proyeccion['eventos']))
+            hojas.append((proyeccion['lunes'], sheet))
+
+        if hojas:
+            escritor.enviar()
+            _sincronizar_hojas(manager, hojas)
+
+        omitidas = len(proyecciones) - len(hojas)
+        return f"{len(hojas)} hojas de Google Sheets" + (f" ({omitidas} semanas sin hoja omitidas)" if omitidas else "")
+
+
+class RenderizadorICS(Renderizador):
+    """Un .ics con los eventos (VEVENT) y los recordatorios con fecha (VTODO)"""
+
+    nombre = "ics"
+
+    def __init__(self, ruta=os.path.join(RUTA_EXPORTS, "agenda.ics")):
+        self.ruta = ruta
+
+    @staticmethod
+    def _escapar(texto):
+        return (str(texto).replace("\\", "\\\\").replace(";", "\\;")
+                .replace(",", "\\,").replace("\n", "\\n"))
+
+    @staticmethod
+    def _plegar(linea):
+        """Líneas de máximo 75 octetos (RFC 5545), continuadas con un espacio"""
+        partes = []
+        actual = ""
+        for caracter in linea:
+            if len((actual + caracter).encode('utf-8')) > (75 if not partes else 74):
+                partes.append(actual)
+                actual = ""
+            actual += caracter
+        partes.append(actual)
+        return "\r\n ".join(partes)
+
+    def renderizar(self, proyecciones):
+        sello = datetime.now().strftime('%Y%m%dT%H%M%S')
+        lineas = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//LOBO//Agenda//ES", "CALSCALE:GREGORIAN"]
+
+        for proyeccion in proyecciones:
+            for ev in proyeccion['eventos']:
+                dia = ev.fecha_inicio.strftime('%Y%m%d')
+                lineas += [
+                    "BEGIN:VEVENT",
+                    f"UID:{ev.id}@lobo",
+                    f"DTSTAMP:{sello}",
+                    f"DTSTART:{dia}T{ev.hora_inicio.strftime('%H%M%S')}",
+                    f"DTEND:{dia}T{ev.hora_fin.strftime('%H%M%S')}",
+                    f"SUMMARY:{self._escapar(ev.nombre)}",
+                ]
+                if ev.descripcion:
+                    lineas.append(f"DESCRIPTION:{self._escapar(ev.descripcion)}")
+                lineas += [f"CATEGORIES:{self._escapar(ev.tipo_evento)}", "END:VEVENT"]
+
+            for recs in proyeccion['recordatorios'].values():
+                for rec in recs:
+                    vence = rec.fecha_limite.strftime('%Y%m%d')
+                    if rec.hora_limite:
+                        vence += f"T{rec.hora_limite.strftime('%H%M%S')}"
+                    lineas += [
+                        "BEGIN:VTODO",
+                        f"UID:recordatorio-{rec.id}@lobo",
+                        f"DTSTAMP:{sello}",
+                        f"DUE{'' if rec.hora_limite else ';VALUE=DATE'}:{vence}",
+                        f"SUMMARY:{self._escapar(rec.content)}",
+                        f"PRIORITY:{rec.prioridad or 0}",
+                        "END:VTODO",
+                    ]
+
+        lineas.append("END:VCALENDAR")
+
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        with open(self.ruta, 'w', encoding='utf-8', newline='') as f:
+            f.write("\r\n".join(self._plegar(linea) for linea in lineas) + "\r\n")
+        return self.ruta
+
+
+class _RenderizadorGrilla(Renderizador):
+    """Base de las grillas semanales locales: un archivo por semana"""
+
+    extension = ""
+
+    def __init__(self, carpeta=os.path.join(RUTA_EXPORTS, "semanas")):
+        self.carpeta = carpeta
+
+    def _ruta(self, lunes):
+        return os.path.join(self.carpeta, f"{lunes.isoformat()}.{self.extension}")
+
+    def renderizar(self, proyecciones):
+        os.makedirs(self.carpeta, exist_ok=True)
+        for proyeccion in proyecciones:
+            self._escribir_semana(proyeccion, self._ruta(proyeccion['lunes']))
+        return f"{self.carpeta}/ ({len(proyecciones)} .{self.extension})"
+
+    def _escribir_semana(self, proyeccion, ruta):
+        raise NotImplementedError
+
+
+class RenderizadorCSV(_RenderizadorGrilla):
+    """Grilla Hora x Día en CSV; las celdas que continúan un bloque llevan '|'"""
+
+    nombre = "csv"
+    extension = "csv"
+
+    def _escribir_semana(self, proyeccion, ruta):
+        filas = [[hora] + [""] * 7 for hora in _horas_grilla()]
+        for bloque in bloques_grilla(proyeccion):
+            filas[bloque['slot']][bloque['dia'] + 1] = bloque['texto']
+            for slot in range(bloque['slot'] + 1, bloque['slot'] + bloque['slots']):
+                filas[slot][bloque['dia'] + 1] = "|"
+
+        lunes = proyeccion['lunes']
+        encabezado = ["Hora"] + [f"{dia} {(lunes + timedelta(days=i)).strftime('%d/%m')}"
+                                 for i, dia in enumerate(DIAS_SEMANA)]
+        recordatorios = ["Recordatorios"] + [
+            "\n".join(f"[P:{rec.prioridad}] {rec.content}" for rec in proyeccion['recordatorios'][fecha])
+            for fecha in sorted(proyeccion['recordatorios'])
+        ]
+
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(encabezado)
+            escritor.writerows(filas)
+            escritor.writerow(recordatorios)
+
+
+class RenderizadorHTML(_RenderizadorGrilla):
+    """Grilla Hora x Día en HTML, con colores por tipo y rowspan por bloque"""
+
+    nombre = "html"
+    extension = "html"
+
+    @staticmethod
+    def _css(rgb):
+        r, g, b = (round(c * 255) for c in rgb)
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def _escribir_semana(self, proyeccion, ruta):
+        lunes = proyeccion['lunes']
+        inicio_bloque = {(b['slot'], b['dia']): b for b in bloques_grilla(proyeccion)}
+        cubiertas = {(slot, b['dia']) for b in inicio_bloque.values()
+                     for slot in range(b['slot'] + 1, b['slot'] + b['slots'])}
+
+        partes = [
+            "<!DOCTYPE html>",
+            '<html lang="es"><head><meta charset="utf-8">',
+            f"<title>LOBO · Semana del {lunes.strftime('%d/%m/%Y')}</title>",
+            "<style>table{border-collapse:collapse;font-family:sans-serif;font-size:12px}"
+            "td,th{border:1px solid #ccc;padding:2px 4px;vertical-align:top;min-width:110px}"
+            "td.evento{border:1px solid #000;font-weight:bold;white-space:pre-line}"
+            "td.traslape{outline:2px solid #c00}</style>",
+            "</head><body>",
+            f"<h2>Semana del {lunes.strftime('%d/%m/%Y')}</h2>",
+            "<table><tr><th>Hora</th>" + "".join(
+                f"<th>{dia} {(lunes + timedelta(days=i)).strftime('%d/%m')}</th>"
+                for i, dia in enumerate(DIAS_SEMANA)) + "</tr>",
+        ]
+
+        for slot, hora in enumerate(_horas_grilla()):
+            celdas = [f"<th>{hora}</th>"]
+            for dia in range(7):
+                if (slot, dia) in cubiertas:
+                    continue
+                bloque = inicio_bloque.get((slot, dia))
+                if bloque is None:
+                    celdas.append("<td></td>")
+                    continue
+                clase = "evento traslape" if bloque['traslape'] else "evento"
+                celdas.append(f'<td class="{clase}" rowspan="{bloque["slots"]}" '
+                              f'style="background:{self._css(bloque["color"])}">'
+                              f"{html.escape(bloque['texto'])}</td>")
+            partes.append("<tr>" + "".join(celdas) + "</tr>")
+
+        partes.append("</table><h3>Recordatorios</h3><ul>")
+        for fecha in sorted(proyeccion['recordatorios']):
+            for rec in proyeccion['recordatorios'][fecha]:
+                partes.append(f"<li>{fecha.strftime('%d/%m')} [P:{rec.prioridad}] {html.escape(rec.content)}</li>")
+        partes.append("</ul></body></html>")
+
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write("\n".join(partes))
+
+
+RENDERIZADORES = {r.nombre: r for r in (RenderizadorSheets(), RenderizadorICS(),
+                                        RenderizadorCSV(), RenderizadorHTML())}
+LOCALES = tuple(nombre for nombre, r in RENDERIZADORES.items() if r.local)
+
+
+def registrar_renderizador(renderizador):
+    """Agrega (o reemplaza) un backend"""
+    RENDERIZADORES[renderizador.nombre] = renderizador
+
+
+def renderizar(backends=("sheets",), desde=None, semanas=1, respaldo=("ics", "html")):
+    """
+    Publica `semanas` semanas en los backends indicados
+
+    Si un backend remoto falla (cuota agotada, red), se generan los locales de
+    `respaldo` con las mismas proyecciones, que no gastan cuota.
+
+    Returns:
+        dict: {nombre: destino | "error: ..."} y 'ms' con el tiempo total
+    """
+    inicio = time.perf_counter()
+    proyecciones = cargar_proyecciones(desde, semanas)
+
+    resultado = {}
+    pendientes = list(backends)
+    while pendientes:
+        nombre = pendientes.pop(0)
+        if nombre in resultado:
+            continue
+        renderizador = RENDERIZADORES[nombre]
+        try:
+            resultado[nombre] = renderizador.renderizar(proyecciones)
+        except Exception as e:
+            resultado[nombre] = f"error: {e}"
+            if renderizador.local:
+                logger.exception(f"❌ Backend '{nombre}' falló: {e}")
+                continue
+            logger.warning(f"⚠️  Backend '{nombre}' falló ({e}); generando respaldo local: {', '.join(respaldo)}")
+            pendientes += [r for r in respaldo if r not in resultado]
+
+    resultado['ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+    return resultado
+
+
+def comando_exportar_agenda(args):
+    """
+    exportar_agenda [ics|csv|html|sheets|locales] [semanas=N] [desde=YYYY-MM-DD]
+
+    Por defecto 52 semanas para los backends locales y SEMANAS_SHEETS si solo
+    se pide sheets
+    """
+    elegidos = []
+    semanas = None
+    desde = None
+
+    for arg in args:
+        if arg.startswith("semanas="):
+            try:
+                semanas = max(1, int(arg.split("=", 1)[1]))
+            except ValueError:
+                return "[AGENDA] ❌ 'semanas' debe ser un número."
+        elif arg.startswith("desde="):
+            try:
+                desde = datetime.strptime(arg.split("=", 1)[1], "%Y-%m-%d").date()
+            except ValueError:
+                return "[AGENDA] ❌ Formato de 'desde' inválido. Usa YYYY-MM-DD."
+        elif arg == "locales":
+            elegidos += LOCALES
+        elif arg in RENDERIZADORES:
+            elegidos.append(arg)
+        else:
+            return f"[AGENDA] ❌ Backend desconocido '{arg}'. Opciones: {', '.join(RENDERIZADORES)}, locales"
+
+    if semanas is None:
+        semanas = SEMANAS_SHEETS if set(elegidos) == {"sheets"} else SEMANAS_LOCALES
+
+    resultado = renderizar(tuple(elegidos) or LOCALES, desde=desde, semanas=semanas)
+    ms = resultado.pop('ms')
+
+    lineas = [f"[AGENDA] 📤 {semanas} semanas exportadas en {ms:.0f} ms:"]
+    for nombre, destino in resultado.items():
+        icono = "❌" if str(destino).startswith("error:") else "✅"
+        lineas.append(f"   {icono} {nombre}: {destino}")
+    return "\n".join(lineas)
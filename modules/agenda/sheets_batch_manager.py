@@ -99,32 +99,19 @@ class SheetsBatchManager:
         self._wait_if_needed()
 
         try:
-            # Agrupar por worksheet
-            by_worksheet = {}
-            for update in updates:
-                ws_title = update['worksheet']
-                if ws_title not in by_worksheet:
-                    by_worksheet[ws_title] = []
-                by_worksheet[ws_title].append(update)
+            from core.lobo_google.escritor_lotes import EscritorLotes
 
-            # Ejecutar batch por worksheet
-            for ws_title, ws_updates in by_worksheet.items():
-                worksheet = self.get_worksheet(ws_title)
-                if not worksheet:
-                    logger.error(f"❌ Hoja '{ws_title}' no encontrada")
-                    continue
+            # Todas las hojas en un solo values_batch_update
+            escritor = EscritorLotes(self.spreadsheet, value_input_option='USER_ENTERED')
 
-                # Preparar batch_update
-                data = []
-                for upd in ws_updates:
-                    data.append({
-                        'range': upd['range'],
-                        'values': upd['values']
-                    })
+            for update in updates:
+                if not self.get_worksheet(update['worksheet']):
+                    logger.error(f"❌ Hoja '{update['worksheet']}' no encontrada")
+                    continue
+                escritor.escribir(update['worksheet'], update['range'], update['values'])
 
-                # Una sola llamada batch_update por worksheet
-                worksheet.batch_update(data, value_input_option='USER_ENTERED')
-                self._log_request(f"batch_update({ws_title})")
+            for _ in range(escritor.enviar()['requests']):
+                self._log_request("values_batch_update")
 
             return True
 
@@ -187,21 +174,18 @@ class SheetsBatchManager:
         self._wait_if_needed()
 
         try:
-            by_worksheet = {}
-            for clear in clears:
-                ws_title = clear['worksheet']
-                if ws_title not in by_worksheet:
-                    by_worksheet[ws_title] = []
-                by_worksheet[ws_title].append(clear['range'])
+            from core.lobo_google.escritor_lotes import EscritorLotes
 
-            for ws_title, ranges in by_worksheet.items():
-                worksheet = self.get_worksheet(ws_title)
-                if not worksheet:
+            # Todas las hojas en un solo values_batch_clear
+            escritor = EscritorLotes(self.spreadsheet)
+
+            for clear in clears:
+                if not self.get_worksheet(clear['worksheet']):
                     continue
+                escritor.limpiar(clear['worksheet'], clear['range'])
 
-                # batch_clear en una sola llamada
-                worksheet.batch_clear(ranges)
-                self._log_request(f"batch_clear({ws_title})")
+            for _ in range(escritor.enviar()['requests']):
+                self._log_request("values_batch_clear")
 
             return True
 
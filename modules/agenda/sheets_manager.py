@@ -10,6 +10,10 @@ from datetime import date, timedelta
 import gspread
 import logging
 
+from modules.agenda.calendario_hojas import (
+    CALENDARIO_HOJAS, lunes_de, lunes_desde_nombre, nombre_hoja, nombre_para_fecha
+)
+
 logger = logging.getLogger(__name__)
 
 # Configuración
@@ -41,32 +45,14 @@ class SheetsManager:
 
     def obtener_lunes_semana(self, fecha=None):
         """Retorna el lunes de la semana para una fecha"""
-        if fecha is None:
-            fecha = date.today()
-
-        # Calcular lunes (weekday 0)
-        dias_desde_lunes = fecha.weekday()
-        lunes = fecha - timedelta(days=dias_desde_lunes)
-
-        return lunes
+        return lunes_de(fecha or date.today())
 
     def nombre_hoja_para_fecha(self, fecha):
         """
         Genera nombre de hoja para una fecha
-        Formato: "21-27 Oct"
+        Formato: "21-27 oct" / "28 oct-03 nov" (ver calendario_hojas)
         """
-        lunes = self.obtener_lunes_semana(fecha)
-        domingo = lunes + timedelta(days=6)
-
-        # Formato corto
-        if lunes.month == domingo.month:
-            # Mismo mes: "21-27 Oct"
-            nombre = f"{lunes.day:02d}-{domingo.day:02d} {lunes.strftime('%b')}"
-        else:
-            # Meses diferentes: "28 Oct-03 Nov"
-            nombre = f"{lunes.day:02d} {lunes.strftime('%b')}-{domingo.day:02d} {domingo.strftime('%b')}"
-
-        return nombre
+        return nombre_para_fecha(fecha)
 
     def obtener_hoja_por_fecha(self, fecha):
         """
@@ -76,39 +62,59 @@ class SheetsManager:
         Returns:
             gspread.Worksheet
         """
-        nombre = self.nombre_hoja_para_fecha(fecha)
-
-        try:
-            hoja = self.spreadsheet.worksheet(nombre)
-            logger.info(f"Hoja encontrada: {nombre}")
+        # Índice por lunes (metadata): no depende del nombre exacto ni de su locale
+        hoja = CALENDARIO_HOJAS.hoja_para(self.spreadsheet, fecha)
+        if hoja is not None:
+            logger.debug(f"Hoja encontrada: {hoja.title}")
             return hoja
-        except gspread.exceptions.WorksheetNotFound:
-            logger.info(f"Hoja '{nombre}' no existe, creando...")
-            return self.crear_hoja_semana(fecha)
+
+        logger.info(f"Hoja '{self.nombre_hoja_para_fecha(fecha)}' no existe, creando...")
+        return self.crear_hoja_semana(fecha)
 
     def crear_hoja_semana(self, fecha):
         """
         Crea una hoja nueva para una semana específica
-        Copia el template
+        Copia el template y le guarda el lunes como metadata en el mismo batch_update
         """
-        nombre = self.nombre_hoja_para_fecha(fecha)
+        from gspread.worksheet import Worksheet
+        from core.lobo_google.estilos import ESTILOS
+        from core.lobo_google.rate_limiter import RATE_LIMITER
+
+        lunes = lunes_de(fecha)
+        nombre = nombre_hoja(lunes)
 
         if self.template_sheet is None:
             raise Exception(f"Template '{NOMBRE_TEMPLATE}' no disponible")
 
-        try:
-            # Duplicar template
-            nueva_hoja = self.template_sheet.duplicate(
-                new_sheet_name=nombre
-            )
+        # Id determinista por semana (p.ej. 20261019) para poder referenciarlo en la misma llamada
+        nuevo_id = int(lunes.strftime("%Y%m%d"))
 
-            logger.info(f"Hoja creada: {nombre}")
-            return nueva_hoja
+        try:
+            RATE_LIMITER.wait_if_needed()
+            respuesta = self.spreadsheet.batch_update({"requests": [
+                {
+                    "duplicateSheet": {
+                        "sourceSheetId": self.template_sheet.id,
+                        "newSheetId": nuevo_id,
+                        "newSheetName": nombre
+                    }
+                },
+                CALENDARIO_HOJAS.request_metadata(nuevo_id, lunes)
+            ]})
+            propiedades = respuesta["replies"][0]["duplicateSheet"]["properties"]
+            nueva_hoja = Worksheet(self.spreadsheet, propiedades, self.spreadsheet.id, self.spreadsheet.client)
 
         except Exception as e:
             logger.error(f"Error al crear hoja {nombre}: {e}")
             raise
 
+        # La copia trae el formato de la plantilla: no reenviar esos encabezados
+        ESTILOS.heredar(self.template_sheet.id, nueva_hoja.id)
+        CALENDARIO_HOJAS.registrar(lunes, nueva_hoja)
+
+        logger.info(f"Hoja creada: {nombre}")
+        return nueva_hoja
+
     def renombrar_hoja_actual(self):
         """
         Renombra la hoja 2 (hoja actual) al formato de semana
@@ -133,6 +139,7 @@ class SheetsManager:
 
             # Renombrar
             hoja_actual.update_title(nuevo_nombre)
+            CALENDARIO_HOJAS.invalidar()
             logger.info(f"Hoja renombrada: {hoja_actual.title} → {nuevo_nombre}")
 
             return True
@@ -150,17 +157,14 @@ class SheetsManager:
         """
         hoy = date.today()
         hojas_creadas = 0
+        existentes = CALENDARIO_HOJAS.cargar(self.spreadsheet)  # 1 lectura para todas las semanas
 
         for i in range(semanas):
             fecha_futura = hoy + timedelta(weeks=i)
-            nombre = self.nombre_hoja_para_fecha(fecha_futura)
 
-            try:
-                # Verificar si existe
-                self.spreadsheet.worksheet(nombre)
-                logger.info(f"Hoja '{nombre}' ya existe")
-            except gspread.exceptions.WorksheetNotFound:
-                # No existe, crear
+            if lunes_de(fecha_futura) in existentes:
+                logger.debug(f"Hoja '{existentes[lunes_de(fecha_futura)].title}' ya existe")
+            else:
                 self.crear_hoja_semana(fecha_futura)
                 hojas_creadas += 1
 
@@ -175,46 +179,97 @@ class SheetsManager:
             nombre_hoja: str - Nombre de la hoja a archivar
         """
         try:
-            # ===== USAR get_client EN LUGAR DE REIMPORTAR =====
-            from core.lobo_google.lobo_sheets import get_client
+            hoja_origen = self.spreadsheet.worksheet(nombre_hoja)
+        except Exception as e:
+            logger.error(f"Error al archivar hoja '{nombre_hoja}': {e}")
+            return False
 
-            client = get_client()
-            spreadsheet_historial = client.open(NOMBRE_HISTORIAL)
+        return bool(self.archivar_hojas([hoja_origen]))
 
-            # Obtener hoja a archivar
-            hoja_origen = self.spreadsheet.worksheet(nombre_hoja)
+    def archivar_hojas(self, hojas):
+        """
+        Mueve varias hojas al historial en pocas llamadas a la API
+        - El historial se abre una vez (cacheado por key)
+        - Un copy_to por hoja (la API no tiene copia en lote)
+        - Un solo batch_update con los deleteSheet de todas las originales
+        - Un solo recorte del historial al final
 
-            # Copiar a historial
-            hoja_origen.copy_to(spreadsheet_historial.id)
+        Args:
+            hojas: list[gspread.Worksheet] en orden cronológico
 
-            # Eliminar del spreadsheet actual
-            self.spreadsheet.del_worksheet(hoja_origen)
+        Returns:
+            list: Nombres de las hojas archivadas
+        """
+        if not hojas:
+            return []
 
-            logger.info(f"Hoja '{nombre_hoja}' archivada en '{NOMBRE_HISTORIAL}'")
+        from core.lobo_google.estilos import ESTILOS
+        from core.lobo_google.lobo_sheets import get_spreadsheet_historial
+        from core.lobo_google.rate_limiter import RATE_LIMITER
 
-            # Limpiar historial (mantener solo últimas 8)
-            self._limpiar_historial(spreadsheet_historial)
+        try:
+            spreadsheet_historial = get_spreadsheet_historial(NOMBRE_HISTORIAL)
+        except Exception as e:
+            logger.error(f"Error al abrir '{NOMBRE_HISTORIAL}': {e}")
+            return []
 
-            return True
+        # Copiar a historial; solo se borran las que se copiaron bien
+        copiadas = []
+        for hoja in hojas:
+            try:
+                RATE_LIMITER.wait_if_needed()
+                hoja.copy_to(spreadsheet_historial.id)
+                copiadas.append(hoja)
+            except Exception as e:
+                logger.error(f"Error al copiar '{hoja.title}' a '{NOMBRE_HISTORIAL}': {e}")
+
+        if not copiadas:
+            return []
 
+        # Eliminar todas del spreadsheet actual de una vez
+        try:
+            RATE_LIMITER.wait_if_needed()
+            self.spreadsheet.batch_update({
+                "requests": [{"deleteSheet": {"sheetId": hoja.id}} for hoja in copiadas]
+            })
         except Exception as e:
-            logger.error(f"Error al archivar hoja '{nombre_hoja}': {e}")
-            return False
+            logger.error(f"Error al eliminar hojas archivadas: {e}")
+            return []
 
-    def _limpiar_historial(self, spreadsheet_historial):
+        CALENDARIO_HOJAS.invalidar()
+        for hoja in copiadas:
+            ESTILOS.olvidar(hoja.id)
+
+        nombres = [hoja.title for hoja in copiadas]
+        logger.info(f"{len(nombres)} hojas archivadas en '{NOMBRE_HISTORIAL}': {', '.join(nombres)}")
+
+        # Limpiar historial (mantener solo últimas 8)
+        self._limpiar_historial(spreadsheet_historial)
+
+        return nombres
+
+    def _limpiar_historial(self, spreadsheet_historial, conservar=8):
         """
         Mantiene solo las últimas 8 semanas en el historial
+        (1 lectura de metadata + 1 batch_update)
         """
+        from core.lobo_google.rate_limiter import RATE_LIMITER
+
         try:
-            hojas = spreadsheet_historial.worksheets()
+            RATE_LIMITER.wait_if_needed()
+            datos = spreadsheet_historial.fetch_sheet_metadata(params={"fields": "sheets.properties"})
+            hojas = sorted((h["properties"] for h in datos.get("sheets", [])), key=lambda p: p["index"])
 
             # Si hay más de 8, eliminar las más antiguas
-            if len(hojas) > 8:
-                hojas_a_eliminar = hojas[:-8]  # Todas excepto últimas 8
+            if len(hojas) > conservar:
+                hojas_a_eliminar = hojas[:-conservar]  # Todas excepto últimas 8
 
-                for hoja in hojas_a_eliminar:
-                    spreadsheet_historial.del_worksheet(hoja)
-                    logger.info(f"Hoja antigua eliminada del historial: {hoja.title}")
+                RATE_LIMITER.wait_if_needed()
+                spreadsheet_historial.batch_update({
+                    "requests": [{"deleteSheet": {"sheetId": p["sheetId"]}} for p in hojas_a_eliminar]
+                })
+                logger.info(f"Hojas antiguas eliminadas del historial: "
+                            f"{', '.join(p['title'] for p in hojas_a_eliminar)}")
 
         except Exception as e:
             logger.error(f"Error al limpiar historial: {e}")
@@ -233,52 +288,34 @@ class SheetsManager:
         # Calcular el lunes de la semana actual
         lunes_semana_actual = hoy - timedelta(days=hoy.weekday())
 
-        hojas_archivadas = []
-
-        # Obtener todas las hojas
-        hojas = self.spreadsheet.worksheets()
-
         logger.info(f"🔍 Buscando hojas antiguas (anteriores a {lunes_semana_actual.strftime('%d/%m/%Y')})")
 
-        for hoja in hojas:
-            # Saltar template y hojas especiales
-            if hoja.title in [NOMBRE_TEMPLATE, "Sheet1"]:
-                continue
-
-            # Intentar calcular la fecha de la hoja
-            try:
-                fecha_lunes_hoja = self._parsear_fecha_desde_nombre_hoja(hoja.title)
-
-                if not fecha_lunes_hoja:
-                    logger.debug(f"⏭️  No se pudo parsear '{hoja.title}', saltando")
-                    continue
-
-                # Verificar si la semana YA PASÓ (lunes de la hoja < lunes actual)
-                if fecha_lunes_hoja < lunes_semana_actual:
-                    logger.info(f"📦 Archivando '{hoja.title}' (semana del {fecha_lunes_hoja.strftime('%d/%m/%Y')})")
+        # Lunes de cada hoja desde el índice (metadata o nombre), sin parsear en el bucle
+        antiguas = []
+        for fecha_lunes_hoja, hoja in CALENDARIO_HOJAS.hojas(self.spreadsheet):
+            # Verificar si la semana YA PASÓ (lunes de la hoja < lunes actual)
+            if fecha_lunes_hoja < lunes_semana_actual:
+                logger.info(f"📦 Archivando '{hoja.title}' (semana del {fecha_lunes_hoja.strftime('%d/%m/%Y')})")
+                antiguas.append(hoja)
+            else:
+                logger.debug(f"✅ '{hoja.title}' es actual o futura, no archivar")
 
-                    if self.archivar_hoja(hoja.title):
-                        hojas_archivadas.append(hoja.title)
-                    else:
-                        logger.warning(f"⚠️  No se pudo archivar '{hoja.title}'")
-                else:
-                    logger.debug(f"✅ '{hoja.title}' es actual o futura, no archivar")
+        # Todas en un solo lote: historial abierto una vez, un borrado, un recorte
+        hojas_archivadas = self.archivar_hojas(antiguas)
 
-            except Exception as e:
-                logger.warning(f"⚠️  Error al procesar '{hoja.title}': {e}")
-                continue
+        if len(hojas_archivadas) < len(antiguas):
+            logger.warning(f"⚠️  No se pudieron archivar {len(antiguas) - len(hojas_archivadas)} hojas")
 
         if hojas_archivadas:
             logger.info(f"✅ Archivadas {len(hojas_archivadas)} hojas: {', '.join(hojas_archivadas)}")
-        else:
+        elif not antiguas:
             logger.info("ℹ️  No hay hojas antiguas para archivar")
 
         return hojas_archivadas
 
     def _parsear_fecha_desde_nombre_hoja(self, nombre_hoja):
         """
-        Parsea el nombre de hoja a fecha del lunes
-        REUTILIZA la lógica de recordatorios_sheets
+        Parsea el nombre de hoja a fecha del lunes (ver calendario_hojas)
 
         Args:
             nombre_hoja: str - Ej: "10-16 nov", "29 dic-04 ene"
@@ -286,61 +323,7 @@ class SheetsManager:
         Returns:
             date: Lunes de esa semana o None
         """
-        try:
-            # Limpiar el nombre
-            nombre = nombre_hoja.replace(".", "").strip()
-
-            # Mapeo de meses
-            meses_map = {
-                "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6,
-                "jul": 7, "ago": 8, "sep": 9, "oct": 10, "nov": 11, "dic": 12,
-                "jan": 1, "apr": 4, "aug": 8, "dec": 12
-            }
-
-            # Detectar meses en el nombre
-            meses_encontrados = []
-            nombre_lower = nombre.lower()
-            for mes_str, mes_num in meses_map.items():
-                if mes_str in nombre_lower:
-                    meses_encontrados.append((mes_str, mes_num))
-
-            if not meses_encontrados:
-                return None
-
-            # Caso 1: Un solo mes ("10-16 nov")
-            if len(meses_encontrados) == 1:
-                partes = nombre.split()
-                dia_inicio = int(partes[0].split('-')[0])
-                mes = meses_encontrados[0][1]
-
-            # Caso 2: Dos meses ("29 dic-04 ene")
-            else:
-                import re
-                match = re.search(r'(\d+)\s*(?:' + '|'.join(meses_map.keys()) + ')', nombre_lower)
-                if match:
-                    dia_inicio = int(match.group(1))
-                    mes = meses_encontrados[0][1]  # Primer mes
-                else:
-                    return None
-
-            # Determinar año
-            año = date.today().year
-            mes_actual = date.today().month
-
-            # Ajustar año para cambios de año
-            if mes in [1, 2] and mes_actual in [11, 12]:
-                año += 1
-            elif mes in [11, 12] and mes_actual in [1, 2]:
-                año -= 1
-
-            try:
-                return date(año, mes, dia_inicio)
-            except ValueError:
-                return date(año, mes, 1)
-
-        except Exception as e:
-            logger.debug(f"Error al parsear '{nombre_hoja}': {e}")
-            return None
+        return lunes_desde_nombre(nombre_hoja)
 
     def inicializar_sistema(self):
         """
@@ -390,25 +373,13 @@ def obtener_hoja_por_fecha_sin_manager(fecha):
 
     spreadsheet = get_spreadsheet()
 
-    # Calcular nombre de hoja
-    if fecha is None:
-        fecha = date.today()
-
-    dias_desde_lunes = fecha.weekday()
-    lunes = fecha - timedelta(days=dias_desde_lunes)
-    domingo = lunes + timedelta(days=6)
-
-    if lunes.month == domingo.month:
-        nombre = f"{lunes.day:02d}-{domingo.day:02d} {lunes.strftime('%b')}"
-    else:
-        nombre = f"{lunes.day:02d} {lunes.strftime('%b')}-{domingo.day:02d} {domingo.strftime('%b')}"
-
-    try:
-        return spreadsheet.worksheet(nombre)
-    except gspread.exceptions.WorksheetNotFound:
-        # Si no existe, usar sheet1 por defecto (fallback)
-        logger.warning(f"Hoja '{nombre}' no encontrada, usando sheet1")
-        return spreadsheet.sheet1
+    hoja = CALENDARIO_HOJAS.hoja_para(spreadsheet, fecha or date.today())
+    if hoja is not None:
+        return hoja
+
+    # Si no existe, usar sheet1 por defecto (fallback)
+    logger.warning(f"Hoja '{nombre_para_fecha(fecha or date.today())}' no encontrada, usando sheet1")
+    return spreadsheet.sheet1
 
 
 # ===== INSTANCIA GLOBAL (INICIALIZACIÓN LAZY) =====
@@ -1,46 +1,321 @@
 # modules/alarma/alarma.py
+"""
+Planificador de alarmas
+- Un solo hilo despertador guiado por un heap de (disparo, evento_id)
+- Persistencia en la tabla `alarmas` (sobreviven a reinicios)
+- Cancelar/reprogramar en O(log n) con invalidación perezosa del heap
+"""
+
+import heapq
+import itertools
 import threading
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, date, timedelta
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from core.db.db import SessionLocal as Session
+from core.db.schema import Alarma, Evento
 from modules.agenda.agenda_logics import get_evento_by_id
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Días hacia adelante que se cargan al arrancar (el resto entra en refrescos posteriores)
+HORIZONTE_ALARMAS_DIAS = 14
+
+
 class AlarmManager:
     def __init__(self):
-        self.timers = {}  # evento_id -> Timer
+        self._heap = []  # (disparo, secuencia, evento_id)
+        self._vigentes = {}  # evento_id -> disparo (la única entrada válida del heap)
+        self._secuencia = itertools.count()
+        self._cond = threading.Condition()
+        self._hilo = None
+        self._detener = False
+
+    # ===== API pública =====
 
     def programar_alarma(self, evento_id: str, anticipacion_minutos: int = 10):
         evento = get_evento_by_id(evento_id)
         if not evento:
             raise ValueError("Evento no encontrado")
 
-        event_dt = datetime.combine(evento.fecha_inicio, evento.hora_inicio)
-        alarm_dt = event_dt - timedelta(minutes=anticipacion_minutos)
-        delay = (alarm_dt - datetime.now()).total_seconds()
+        return self.programar_evento(evento, anticipacion_minutos)
+
+    def programar_evento(self, evento, anticipacion_minutos: int = None):
+        """Programa (o reprograma) la alarma de un evento ya cargado, sin volver a consultarlo"""
+        return self.programar_lote([evento], anticipacion_minutos) == 1
+
+    def programar_lote(self, eventos, anticipacion_minutos: int = None):
+        """
+        Programa alarmas para varios eventos en una sola transacción
+
+        Args:
+            eventos: iterable de Evento/EventoVista
+            anticipacion_minutos: si es None usa evento.alarma_minutos
 
-        if delay <= 0:
+        Returns:
+            Número de alarmas programadas
+        """
+        ahora = datetime.now()
+        filas = []
+
+        for evento in eventos:
+            minutos = anticipacion_minutos
+            if minutos is None:
+                minutos = evento.alarma_minutos if evento.alarma_minutos is not None else 5
+            disparo = datetime.combine(evento.fecha_inicio, evento.hora_inicio) - timedelta(minutes=minutos)
+
+            if disparo <= ahora:
+                continue
+
+            filas.append({'evento_id': evento.id, 'disparo': disparo, 'anticipacion_minutos': minutos})
+
+        if not filas:
             logger.info("La alarma ya pasó o está muy cerca; no se programa.")
-            return False
+            return 0
+
+        self._persistir(filas)
+        self._encolar((fila['disparo'], fila['evento_id']) for fila in filas)
 
-        timer = threading.Timer(delay, self._trigger, args=(evento_id,))
-        timer.daemon = True
-        timer.start()
-        self.timers[evento_id] = timer
-        logger.info("Alarma programada para %s (evento %s)", alarm_dt.isoformat(), evento_id)
-        return True
+        logger.info("%d alarma(s) programada(s); próxima: %s", len(filas),
+                    min(fila['disparo'] for fila in filas).isoformat())
+        return len(filas)
 
     def cancelar_alarma(self, evento_id):
-        t = self.timers.get(evento_id)
-        if t:
-            t.cancel()
-            del self.timers[evento_id]
+        """
+        Cancela la alarma de un evento y la desactiva en `eventos`
+        para que no vuelva a cargarse al reiniciar
+        """
+        session = Session()
+        try:
+            fecha = session.execute(
+                select(Evento.fecha_inicio).where(Evento.id == evento_id)
+            ).scalar()
+            if fecha is not None:
+                session.execute(update(Evento).where(Evento.id == evento_id).values(alarma_activa=False))
+                session.commit()
+        finally:
+            session.close()
+
+        if fecha is not None:
+            from modules.agenda.cache_eventos import EVENTOS_CACHE
+            EVENTOS_CACHE.invalidar_fechas(fecha)
+
+        return self.cancelar_lote([evento_id]) > 0
+
+    def cancelar_lote(self, evento_ids):
+        """Cancela las alarmas de varios eventos. Retorna cuántas estaban pendientes"""
+        evento_ids = list(evento_ids)
+        if not evento_ids:
+            return 0
+
+        with self._cond:
+            # Invalidación perezosa: la entrada queda en el heap y se descarta al llegar a la cima
+            canceladas = sum(1 for eid in evento_ids if self._vigentes.pop(eid, None) is not None)
+            self._compactar_si_necesario()
+            self._cond.notify()
+
+        session = Session()
+        try:
+            session.execute(delete(Alarma).where(Alarma.evento_id.in_(evento_ids)))
+            session.commit()
+        finally:
+            session.close()
+
+        return canceladas
+
+    def reprogramar_evento(self, evento):
+        """
+        Ajusta la alarma tras editar un evento (la quita si se desactivó o ya pasó)
+
+        Solo se retira la alarma pendiente: alarma_activa del evento no se toca,
+        así vuelve a armarse si después se mueve al futuro
+        """
+        if evento.alarma_activa and self.programar_evento(evento):
             return True
+        self.cancelar_lote([evento.id])
         return False
 
+    def purgar_huerfanas(self):
+        """Cancela alarmas cuyo evento ya no existe (p. ej. tras eliminar una serie)"""
+        session = Session()
+        try:
+            huerfanas = [fila[0] for fila in session.query(Alarma.evento_id).filter(
+                ~Alarma.evento_id.in_(session.query(Evento.id))
+            )]
+        finally:
+            session.close()
+
+        return self.cancelar_lote(huerfanas)
+
+    def rehidratar(self, horizonte_dias: int = HORIZONTE_ALARMAS_DIAS):
+        """
+        Carga al arrancar todas las alarmas pendientes dentro del horizonte.
+
+        Una sola consulta por rango sobre el índice de `eventos.fecha_inicio`,
+        con LEFT JOIN a `alarmas` para respetar anticipaciones personalizadas.
+        Se puede volver a llamar para ir incorporando días nuevos al horizonte.
+
+        Returns:
+            Número de alarmas pendientes cargadas
+        """
+        t0 = time.perf_counter()
+        ahora = datetime.now()
+        hoy = date.today()
+
+        stmt = select(
+            Evento.id, Evento.fecha_inicio, Evento.hora_inicio,
+            Evento.alarma_minutos, Alarma.disparo
+        ).outerjoin(
+            Alarma, Alarma.evento_id == Evento.id
+        ).where(
+            Evento.fecha_inicio >= hoy,
+            Evento.fecha_inicio <= hoy + timedelta(days=horizonte_dias),
+            Evento.alarma_activa == True,
+            Evento.es_maestro == False
+        )
+
+        session = Session()
+        try:
+            # Limpiar lo que venció con LOBO cerrado
+            session.execute(delete(Alarma).where(Alarma.disparo <= ahora))
+            session.commit()
+            filas = session.execute(stmt).tuples().all()
+        finally:
+            session.close()
+
+        entradas = []
+        for evento_id, fecha, hora, minutos, disparo in filas:
+            if disparo is None:
+                disparo = datetime.combine(fecha, hora) - timedelta(minutes=minutos if minutos is not None else 5)
+            if disparo > ahora:
+                entradas.append((disparo, evento_id))
+
+        self._encolar_bulk(entradas)
+
+        logger.info("Alarmas rehidratadas: %d en %.1f ms", len(entradas), (time.perf_counter() - t0) * 1000)
+        return len(entradas)
+
+    def pendientes(self, desde=None, hasta=None):
+        """
+        Alarmas pendientes ordenadas por disparo
+
+        Returns:
+            list[(disparo, evento_id)]
+        """
+        with self._cond:
+            return sorted(
+                (disparo, evento_id) for evento_id, disparo in self._vigentes.items()
+                if (desde is None or disparo >= desde) and (hasta is None or disparo <= hasta)
+            )
+
+    def detener(self):
+        with self._cond:
+            self._detener = True
+            self._cond.notify()
+
+    # ===== Internos =====
+
+    def _persistir(self, filas):
+        stmt = sqlite_insert(Alarma)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Alarma.evento_id],
+            set_={'disparo': stmt.excluded.disparo,
+                  'anticipacion_minutos': stmt.excluded.anticipacion_minutos}
+        )
+
+        session = Session()
+        try:
+            session.execute(stmt, filas)
+            session.commit()
+        finally:
+            session.close()
+
+    def _encolar(self, entradas):
+        with self._cond:
+            for disparo, evento_id in entradas:
+                self._vigentes[evento_id] = disparo
+                heapq.heappush(self._heap, (disparo, next(self._secuencia), evento_id))
+            self._compactar_si_necesario()
+            self._cond.notify()
+
+        self._asegurar_hilo()
+
+    def _encolar_bulk(self, entradas):
+        """Como _encolar pero reconstruye el heap de una vez (O(n) en vez de n·log n)"""
+        with self._cond:
+            for disparo, evento_id in entradas:
+                if self._vigentes.get(evento_id) == disparo:
+                    continue  # ya estaba programada igual
+                self._vigentes[evento_id] = disparo
+                self._heap.append((disparo, next(self._secuencia), evento_id))
+            heapq.heapify(self._heap)
+            self._compactar_si_necesario()
+            self._cond.notify()
+
+        self._asegurar_hilo()
+
+    def _compactar_si_necesario(self):
+        # Llamar con el lock tomado. Evita que el heap crezca sin límite con entradas invalidadas
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._vigentes):
+            self._heap = [e for e in self._heap if self._vigentes.get(e[2]) == e[0]]
+            heapq.heapify(self._heap)
+
+    def _asegurar_hilo(self):
+        with self._cond:
+            if self._hilo and self._hilo.is_alive():
+                return
+            self._detener = False
+            self._hilo = threading.Thread(target=self._bucle, name="lobo-alarmas", daemon=True)
+            self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                evento_id = None
+                while not self._detener:
+                    # Descartar entradas canceladas o reprogramadas
+                    while self._heap and self._vigentes.get(self._heap[0][2]) != self._heap[0][0]:
+                        heapq.heappop(self._heap)
+
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    espera = (self._heap[0][0] - datetime.now()).total_seconds()
+                    if espera <= 0:
+                        _, _, evento_id = heapq.heappop(self._heap)
+                        del self._vigentes[evento_id]
+                        break
+
+                    self._cond.wait(timeout=espera)
+
+                if self._detener:
+                    return
+
+            try:
+                self._trigger(evento_id)
+            except Exception as e:
+                logger.exception("Error al disparar alarma %s: %s", evento_id, e)
+
     def _trigger(self, evento_id):
         evento = get_evento_by_id(evento_id)
         if evento:
             # Aquí conectar con Telegram, notificación del SO, sonido, etc.
             print(f"🔔 ALARMA -> {evento.nombre} en {evento.hora_inicio.strftime('%H:%M')}")
-        self.timers.pop(evento_id, None)
+
+        session = Session()
+        try:
+            # Solo la fila ya vencida: si se reprogramó mientras sonaba, la nueva se conserva
+            session.execute(delete(Alarma).where(
+                Alarma.evento_id == evento_id,
+                Alarma.disparo <= datetime.now()
+            ))
+            session.commit()
+        finally:
+            session.close()
+
+
+# ===== INSTANCIA GLOBAL =====
+ALARMAS = AlarmManager()
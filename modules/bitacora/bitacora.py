@@ -1,5 +1,6 @@
 # modules/bitacora/bitacora.py
 
+import threading
 from datetime import datetime
 from core.db.db import SessionLocal  # migrado desde core.db.sessions
 from core.db.schema import BitacoraRegistro
@@ -7,6 +8,9 @@ from core.db.schema import BitacoraRegistro
 class Bitacora:
     def __init__(self):
         self.db = SessionLocal()
+        # BITACORA se usa desde el hilo de comandos y desde las tareas de fondo:
+        # la Session no es thread-safe, cada uso va bajo el lock
+        self._lock = threading.Lock()
 
     def registrar(self, modulo: str, accion: str, descripcion: str = "", usuario: str = "system"):
 
@@ -17,12 +21,18 @@ class Bitacora:
             descripcion=descripcion,
             usuario=usuario,
         )
-        self.db.add(nuevo_evento)
-        self.db.commit()
+        with self._lock:
+            self.db.add(nuevo_evento)
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
 
     def ver_entradas(self, limite: int = 10):
-        entradas = self.db.query(BitacoraRegistro).order_by(BitacoraRegistro.timestamp.asc().nullslast()).limit(limite).all()
-        return entradas
+        with self._lock:
+            return self.db.query(BitacoraRegistro).order_by(
+                BitacoraRegistro.timestamp.asc().nullslast()).limit(limite).all()
 
 
 def comando_ver_bitacora(args):
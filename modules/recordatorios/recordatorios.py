@@ -508,7 +508,7 @@ class Recordatorios:
                 id_elegido = int(input("\nID a reprogramar: ").strip())
                 nota = self.memoria.obtener_por_id(id_elegido)
 
-                if nota and nota in vencidos:
+                if nota and any(v.id == nota.id for v in vencidos):
                     nueva_fecha = input("Nueva fecha (DD/MM/YYYY): ").strip()
                     nueva_hora = input("Nueva hora (HH:MM) [opcional]: ").strip() or None
 
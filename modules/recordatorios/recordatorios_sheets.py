@@ -8,7 +8,10 @@ from core.lobo_google.lobo_sheets import get_sheet
 from core.memory import Memory
 from datetime import datetime, timedelta, date
 from gspread.utils import rowcol_to_a1
+import hashlib
+import json
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -26,93 +29,37 @@ COLORES_PRIORIDAD = {
     5: (0.85, 0.95, 1.0)
 }
 
+# Hash del contenido escrito en cada hoja (clave: lunes ISO) para no reescribir lo que no cambió
+RUTA_ESTADO_SYNC = os.path.join("data", "sync_recordatorios.json")
+VERSION_PROYECCION = 1  # Subir si cambia el formato de I/J o de la tabla semanal
+MODOS_SYNC = ("inicio", "cambios", "completo")
+
 
 def actualizar_recordatorios_todas_las_hojas():
     """
     Actualiza recordatorios en TODAS las hojas semanales
-    OPTIMIZADO: ~3 requests por hoja (antes: ~7)
+    OPTIMIZADO: 3 requests en total (clear, valores y formato) sin importar cuántas hojas
     """
     from modules.agenda.sheets_manager import get_sheets_manager
     from core.lobo_google.rate_limiter import RATE_LIMITER
 
     try:
-        memoria = Memory()
-        todos = memoria.recall(estado="pendiente")
-
-        con_fecha = [r for r in todos if r.fecha_limite]
-        sin_fecha = [r for r in todos if not r.fecha_limite]
-
-        con_fecha.sort(key=lambda x: (x.fecha_limite, x.hora_limite or datetime.min.time(), x.prioridad))
-        sin_fecha.sort(key=lambda x: x.id)
-
-        logger.info(f"📝 Sincronizando {len(con_fecha) + len(sin_fecha)} recordatorios...")
-
         manager = get_sheets_manager()
-        spreadsheet = manager.spreadsheet
-
-        RATE_LIMITER.wait_if_needed()
-        todas_las_hojas = spreadsheet.worksheets()
-
-        # ===== ORDENAR HOJAS POR FECHA (FIX PROBLEMA #1) =====
-        hojas_validas = []
-        hojas_excluidas = ["Hoja 1", "Sheet1", "26-2"]
-
-        for hoja in todas_las_hojas:
-            if hoja.title in hojas_excluidas:
-                continue
+        hojas_con_fechas = _hojas_semanales(manager.spreadsheet)
 
-            if "-" in hoja.title:
-                meses = [
-                    "ene", "feb", "mar", "abr", "may", "jun",
-                    "jul", "ago", "sep", "oct", "nov", "dic",
-                    "jan", "feb", "mar", "apr", "may", "jun",
-                    "jul", "aug", "sep", "oct", "nov", "dec"
-                ]
-
-                if any(mes in hoja.title.lower() for mes in meses):
-                    hojas_validas.append(hoja.title)
-
-        if not hojas_validas:
+        if not hojas_con_fechas:
             logger.warning("⚠️  No se encontraron hojas válidas")
             return 0
 
-        # ===== ORDENAR HOJAS CRONOLÓGICAMENTE =====
-        hojas_con_fechas = []
-        for nombre_hoja in hojas_validas:
-            fecha_lunes = _calcular_lunes_desde_nombre_hoja(nombre_hoja)
-            if fecha_lunes:
-                hojas_con_fechas.append((fecha_lunes, nombre_hoja))
-
-        # Ordenar por fecha (más antigua primero)
+        # Ordenar por fecha (más reciente primero)
         hojas_con_fechas.sort(key=lambda x: x[0], reverse=True)
-        hojas_validas_ordenadas = [h[1] for h in hojas_con_fechas]
-
-        logger.info(f"✅ {len(hojas_validas_ordenadas)} hojas (más reciente primero)")
-        logger.info(f"Primera hoja: {hojas_validas_ordenadas[0] if hojas_validas_ordenadas else 'N/A'}")
-
-        # ===== ACTUALIZAR CADA HOJA (OPTIMIZADO) =====
-        hojas_actualizadas = 0
 
-        for nombre_hoja in hojas_validas_ordenadas:
-            try:
-                RATE_LIMITER.wait_if_needed()
-                sheet = spreadsheet.worksheet(nombre_hoja)
-
-                fecha_lunes = _calcular_lunes_desde_nombre_hoja(nombre_hoja)
-
-                if fecha_lunes:
-                    # ===== OPTIMIZACIÓN: All EN UNA SOLA LLAMADA =====
-                    _actualizar_hoja_completa_optimizado(
-                        sheet, fecha_lunes, con_fecha, sin_fecha
-                    )
+        logger.info(f"✅ {len(hojas_con_fechas)} hojas (más reciente primero)")
+        logger.info(f"Primera hoja: {hojas_con_fechas[0][1].title}")
 
-                    hojas_actualizadas += 1
-                    logger.info(f"✅ '{nombre_hoja}' actualizada")
-
-            except Exception as e:
-                logger.error(f"❌ Error en '{nombre_hoja}': {e}")
+        hojas_actualizadas = _sincronizar_hojas(manager, hojas_con_fechas, forzar=True)
 
-        logger.info(f"🎉 Completado: {hojas_actualizadas}/{len(hojas_validas_ordenadas)} hojas")
+        logger.info(f"🎉 Completado: {hojas_actualizadas}/{len(hojas_con_fechas)} hojas")
 
         # ===== NUEVO: REORDENAR HOJAS FÍSICAMENTE =====
         try:
@@ -131,128 +78,255 @@ def actualizar_recordatorios_todas_las_hojas():
         return 0
 
 
-def _calcular_lunes_desde_nombre_hoja(nombre_hoja):
+def sincronizar_recordatorios(modo="inicio"):
     """
-    Parsea nombres de hoja a fecha
-    MEJORADO: Maneja "29 dic.-04 ene." correctamente
+    Sincroniza recordatorios escribiendo solo las hojas cuyo contenido cambió
+
+    Modos:
+        inicio:   semana actual y siguiente, solo si cambiaron (0 requests si nada cambió)
+        cambios:  todas las hojas semanales, solo las que cambiaron (+1 request para listarlas)
+        completo: reescribe todas las hojas y las reordena
+
+    Returns:
+        int: Número de hojas escritas
     """
-    try:
-        # Limpiar el nombre
-        nombre = nombre_hoja.replace(".", "").strip()
-
-        # Detectar si cruza meses (tiene dos abreviaciones de mes)
-        meses_map = {
-            "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6,
-            "jul": 7, "ago": 8, "sep": 9, "oct": 10, "nov": 11, "dic": 12,
-            "jan": 1, "aug": 8,  "dec": 12
-        }
-
-        # Contar cuántos meses aparecen
-        meses_encontrados = []
-        nombre_lower = nombre.lower()
-        for mes_str, mes_num in meses_map.items():
-            if mes_str in nombre_lower:
-                meses_encontrados.append((mes_str, mes_num))
-
-        if not meses_encontrados:
-            return None
-
-        # Caso 1: "10-16 nov" (un solo mes)
-        if len(meses_encontrados) == 1:
-            partes = nombre.split()
-            dia_inicio = int(partes[0].split('-')[0])
-            mes = meses_encontrados[0][1]
-
-        # Caso 2: "29 dic-04 ene" (dos meses, tomar el primero)
-        else:
-            # Buscar el primer número antes del primer mes
-            import re
-            match = re.search(r'(\d+)\s*(?:' + '|'.join(meses_map.keys()) + ')', nombre_lower)
-            if match:
-                dia_inicio = int(match.group(1))
-                mes = meses_encontrados[0][1]  # Primer mes encontrado
-            else:
-                return None
+    if modo not in MODOS_SYNC:
+        raise ValueError(f"Modo de sincronización inválido: '{modo}' (usa {', '.join(MODOS_SYNC)})")
 
-        # Determinar año
-        ayo = date.today().year
-        mes_actual = date.today().month
+    if modo == "completo":
+        return actualizar_recordatorios_todas_las_hojas()
 
-        # Ajustar año para meses de cambio de año
-        if mes in [1, 2] and mes_actual in [11, 12]:
-            ayo += 1
-        elif mes in [11, 12] and mes_actual in [1, 2]:
-            ayo -= 1
+    from modules.agenda.sheets_manager import get_sheets_manager
 
-        try:
-            return date(ayo, mes, dia_inicio)
-        except ValueError:
-            return date(ayo, mes, 1)
+    manager = get_sheets_manager()
 
-    except Exception as e:
-        logger.debug(f"No se pudo parsear '{nombre_hoja}': {e}")
-        return None
+    if modo == "inicio":
+        hoy = date.today()
+        lunes_actual = hoy - timedelta(days=hoy.weekday())
+        # La hoja se obtiene solo si hay que escribirla
+        objetivos = [(lunes_actual, None), (lunes_actual + timedelta(weeks=1), None)]
+    else:
+        objetivos = _hojas_semanales(manager.spreadsheet)
 
+    hojas_escritas = _sincronizar_hojas(manager, objetivos)
 
-def _actualizar_hoja_completa_optimizado(sheet, fecha_lunes, todos_con_fecha, todos_sin_fecha):
+    logger.info(f"🔄 Sync '{modo}': {hojas_escritas}/{len(objetivos)} hojas con cambios")
+    return hojas_escritas
+
+
+def _sincronizar_hojas(manager, objetivos, forzar=False):
     """
-    Actualiza UNA hoja completa en el MÍNIMO de requests posible
+    Planifica y escribe las hojas indicadas en una sola tanda de requests
 
-    OPTIMIZACIÓN:
-    - 1 request: batch_clear (columnas I/J + área semanal)
-    - 1 request: batch_update (columnas I/J + tabla semanal)
-    - 1 request: batch_format (encabezados + colores)
+    Args:
+        manager: SheetsManager
+        objetivos: list[(lunes, Worksheet | None)]; None = obtener la hoja solo si hay que escribirla
+        forzar: escribir aunque el hash no haya cambiado
 
-    Total: 3 requests por hoja (antes: 7-10 requests)
+    Returns:
+        int: Número de hojas escritas
     """
-    from core.lobo_google.rate_limiter import RATE_LIMITER
+    con_fecha, sin_fecha = _cargar_pendientes(Memory())
+    plan = _planificar(con_fecha, sin_fecha)
+    estado = _cargar_estado_sync()
 
-    memoria = Memory()
-    recordatorios_semana = memoria.recall_por_semana(fecha_lunes)
+    escrituras = []  # (clave, huella, sheet, proyeccion)
+    for fecha_lunes, sheet in objetivos:
+        proyeccion = _proyectar_hoja(fecha_lunes, plan)
+        huella = _hash_proyeccion(proyeccion)
+        clave = fecha_lunes.isoformat()
 
-    # Agrupar recordatorios de la semana por día
-    recordatorios_por_dia = {i: [] for i in range(7)}
-    for rec in recordatorios_semana:
-        if rec.fecha_limite:
-            dia_semana = rec.fecha_limite.weekday()
-            recordatorios_por_dia[dia_semana].append(rec)
+        if not forzar and estado.get(clave) == huella:
+            continue
+
+        if sheet is None:
+            try:
+                sheet = manager.obtener_hoja_por_fecha(fecha_lunes)
+            except Exception as e:
+                logger.error(f"❌ No se pudo obtener la hoja de la semana {clave}: {e}")
+                continue
+
+        escrituras.append((clave, huella, sheet, proyeccion))
+
+    if not escrituras:
+        return 0
+
+    informe = _escribir_proyecciones(manager.spreadsheet,
+                                     [(sheet, proyeccion) for _, _, sheet, proyeccion in escrituras],
+                                     forzar=forzar)
+    _reportar_trozos(len(escrituras), informe)
+
+    for clave, huella, sheet, _ in escrituras:
+        estado[clave] = huella
+        logger.info(f"✅ '{sheet.title}' actualizada")
+    _guardar_estado_sync(estado)
+
+    return len(escrituras)
+
+
+def _reportar_trozos(hojas, informe):
+    """Deja constancia de cuántos trozos/requests usó una sincronización"""
+    from core.benchmark import guardar_benchmark
+
+    trozos = informe['trozos']
+    logger.info(f"📤 {hojas} hojas en {sum(trozos.values())} trozos "
+                f"(limpieza {trozos.get('limpieza', 0)}, valores {trozos.get('valores', 0)}, "
+                f"formato {trozos.get('formato', 0)}), {informe['reintentos']} reintentos")
+
+    try:
+        guardar_benchmark("sync_recordatorios", {'hojas': hojas, **informe})
+    except OSError as e:
+        logger.debug(f"No se pudo guardar el informe de sync: {e}")
+
+
+def _cargar_pendientes(memoria):
+    """Recordatorios pendientes separados y ordenados como se muestran en I/J"""
+    todos = memoria.recall(estado="pendiente")
+
+    con_fecha = [r for r in todos if r.fecha_limite]
+    sin_fecha = [r for r in todos if not r.fecha_limite]
+
+    con_fecha.sort(key=lambda x: (x.fecha_limite, x.hora_limite or datetime.min.time(), x.prioridad))
+    sin_fecha.sort(key=lambda x: x.id)
+
+    return con_fecha, sin_fecha
+
+
+def _hojas_semanales(spreadsheet):
+    """
+    Hojas semanales del spreadsheet (1 request, ver calendario_hojas)
+
+    Returns:
+        list[(date, gspread.Worksheet)]: lunes de la semana y la hoja
+    """
+    from modules.agenda.calendario_hojas import CALENDARIO_HOJAS
+
+    return CALENDARIO_HOJAS.hojas(spreadsheet)
+
+
+def _cargar_estado_sync():
+    if not os.path.exists(RUTA_ESTADO_SYNC):
+        return {}
+    try:
+        with open(RUTA_ESTADO_SYNC, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if contenido.get('version') != VERSION_PROYECCION:
+        return {}
+    return contenido.get('hojas', {})
+
+
+def _guardar_estado_sync(estado):
+    try:
+        os.makedirs(os.path.dirname(RUTA_ESTADO_SYNC), exist_ok=True)
+        with open(RUTA_ESTADO_SYNC, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION_PROYECCION, 'hojas': estado}, f, indent=4)
+    except OSError as e:
+        logger.warning(f"⚠️  No se pudo guardar el estado de sincronización: {e}")
+
+
+def _calcular_lunes_desde_nombre_hoja(nombre_hoja):
+    """Parsea nombres de hoja a fecha (ver calendario_hojas.lunes_desde_nombre)"""
+    from modules.agenda.calendario_hojas import lunes_desde_nombre
+
+    return lunes_desde_nombre(nombre_hoja)
+
+
+def _planificar(todos_con_fecha, todos_sin_fecha):
+    """
+    Datos compartidos por todas las hojas de una sincronización, calculados una vez
+
+    Returns:
+        dict: {'i': [...], 'j': [...], 'semanas': {lunes: {dia_idx: [recordatorios]}}}
+    """
+    semanas = {}
+    for rec in todos_con_fecha:
+        lunes = rec.fecha_limite - timedelta(days=rec.fecha_limite.weekday())
+        por_dia = semanas.setdefault(lunes, {i: [] for i in range(7)})
+        por_dia[rec.fecha_limite.weekday()].append(rec)
 
-    # ===== 1. PREPARAR TODOS LOS VALORES =====
     hoy = date.today()
 
-    # Columnas I/J
-    valores_i = _preparar_valores_columna_i(todos_con_fecha, hoy)
-    valores_j = _preparar_valores_columna_j(todos_sin_fecha)
+    return {
+        'i': _preparar_valores_columna_i(todos_con_fecha, hoy),
+        'j': _preparar_valores_columna_j(todos_sin_fecha),
+        'semanas': semanas,
+    }
 
-    # Tabla semanal
-    valores_tabla = _preparar_valores_tabla_semanal(recordatorios_por_dia, fecha_lunes)
 
-    # ===== 2. LIMPIAR All EN UN SOLO REQUEST =====
-    RATE_LIMITER.wait_if_needed()
-    sheet.batch_clear([
-        "I1:I60",  # Columna recordatorios con fecha
-        "J1:J60",  # Columna pendientes generales
-        f"A{FILA_INICIO_RECORDATORIOS}:H55"  # Área tabla semanal
-    ])
+def _proyectar_hoja(fecha_lunes, plan):
+    """
+    Valores que se escriben en una hoja semanal, sin tocar Sheets
 
-    # ===== 3. ESCRIBIR All EN UN SOLO REQUEST =====
-    RATE_LIMITER.wait_if_needed()
-    updates = [
-        {'range': 'I1:I60', 'values': valores_i},
-        {'range': 'J1:J60', 'values': valores_j}
-    ]
+    Returns:
+        dict: {'i': [...], 'j': [...], 'tabla': [updates]}
+    """
+    recordatorios_por_dia = plan['semanas'].get(fecha_lunes) or {i: [] for i in range(7)}
 
-    # Agregar valores de tabla semanal
-    if valores_tabla:
-        fila = FILA_INICIO_RECORDATORIOS
-        for update_tabla in valores_tabla:
-            updates.append(update_tabla)
+    return {
+        'i': plan['i'],
+        'j': plan['j'],
+        'tabla': _preparar_valores_tabla_semanal(recordatorios_por_dia, fecha_lunes),
+    }
 
-    sheet.batch_update(updates)
 
-    # ===== 4. APLICAR FORMATO EN UN SOLO REQUEST =====
-    RATE_LIMITER.wait_if_needed()
-    _aplicar_formato_batch(sheet)
+def _hash_proyeccion(proyeccion):
+    contenido = json.dumps(proyeccion, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+
+def _escribir_proyecciones(spreadsheet, escrituras, forzar=False):
+    """
+    Escribe varias hojas a la vez: los rangos de todas las hojas viajan juntos
+
+    OPTIMIZACIÓN (ver EscritorLotes):
+    - 1 request: values_batch_clear (I/J + área semanal de cada hoja)
+    - 1 request: values_batch_update (I/J + tabla semanal de cada hoja)
+    - 1 request: batch_update de formato (solo encabezados que la hoja aún no tiene)
+
+    Args:
+        escrituras: list[(Worksheet, proyeccion)]
+        forzar: reenviar los encabezados aunque la hoja ya los tenga
+    """
+    from core.lobo_google.escritor_lotes import EscritorLotes
+    from core.lobo_google.estilos import ESTILOS
+
+    escritor = EscritorLotes(spreadsheet)
+    encabezados = {}  # sheet_id -> nombres enviados
+
+    for sheet, proyeccion in escrituras:
+        escritor.limpiar(sheet, "I1:I60")  # Columna recordatorios con fecha
+        escritor.limpiar(sheet, "J1:J60")  # Columna pendientes generales
+        escritor.limpiar(sheet, f"A{FILA_INICIO_RECORDATORIOS}:H55")  # Área tabla semanal
+
+        escritor.escribir(sheet, 'I1:I60', proyeccion['i'])
+        escritor.escribir(sheet, 'J1:J60', proyeccion['j'])
+        for update_tabla in proyeccion['tabla']:
+            escritor.escribir(sheet, update_tabla['range'], update_tabla['values'])
+
+        nombres = list(ENCABEZADOS) if forzar else ESTILOS.pendientes(sheet.id, ENCABEZADOS)
+        if nombres:
+            escritor.formatear(*_requests_formato(sheet.id, nombres))
+            encabezados[sheet.id] = nombres
+
+    informe = escritor.enviar()
+    for sheet_id, nombres in encabezados.items():
+        ESTILOS.marcar(sheet_id, ENCABEZADOS, nombres)
+    return informe
+
+
+def _actualizar_hoja_completa_optimizado(sheet, fecha_lunes, todos_con_fecha, todos_sin_fecha):
+    """
+    Actualiza UNA hoja completa (3 requests: clear, update, formato)
+
+    Returns:
+        dict: La proyección escrita (ver _proyectar_hoja)
+    """
+    proyeccion = _proyectar_hoja(fecha_lunes, _planificar(todos_con_fecha, todos_sin_fecha))
+    _escribir_proyecciones(sheet.spreadsheet, [(sheet, proyeccion)])
+    return proyeccion
 
 
 def _preparar_valores_columna_i(recordatorios, hoy):
@@ -396,75 +470,57 @@ def _preparar_valores_tabla_semanal(recordatorios_por_dia, fecha_lunes=None):
     return updates
 
 
+# Encabezados estáticos de I/J y de la tabla semanal: nombre -> (rango A1, formato).
+# Solo se envían a las hojas que aún no los tienen (ver core.lobo_google.estilos)
+ENCABEZADOS = {
+    "encabezado_i": ("I1", {
+        "backgroundColor": {"red": 0.2, "green": 0.3, "blue": 0.5},
+        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True},
+        "horizontalAlignment": "CENTER"
+    }),
+    "encabezado_j": ("J1", {
+        "backgroundColor": {"red": 0.3, "green": 0.3, "blue": 0.3},
+        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True},
+        "horizontalAlignment": "CENTER"
+    }),
+    "titulo_tabla": (f"A{FILA_INICIO_RECORDATORIOS}:H{FILA_INICIO_RECORDATORIOS}", {
+        "backgroundColor": {"red": 0.2, "green": 0.2, "blue": 0.2},
+        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True,
+                       "fontSize": 11},
+        "horizontalAlignment": "CENTER"
+    }),
+    "dias_tabla": (f"B{FILA_INICIO_RECORDATORIOS + 1}:H{FILA_INICIO_RECORDATORIOS + 1}", {
+        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
+        "textFormat": {"bold": True, "fontSize": 9},
+        "horizontalAlignment": "CENTER"
+    }),
+}
+
+
 def _aplicar_formato_batch(sheet):
     """Aplica All el formato en una sola llamada batch_update"""
-    sheet_id = sheet._properties["sheetId"]
-
-    requests = [
-        # Encabezado columna I
-        {
-            "repeatCell": {
-                "range": {"sheetId": sheet_id, "startRowIndex": 0, "endRowIndex": 1, "startColumnIndex": 8,
-                          "endColumnIndex": 9},
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.2, "green": 0.3, "blue": 0.5},
-                        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True},
-                        "horizontalAlignment": "CENTER"
-                    }
-                },
-                "fields": "userEnteredFormat"
-            }
-        },
-        # Encabezado columna J
-        {
-            "repeatCell": {
-                "range": {"sheetId": sheet_id, "startRowIndex": 0, "endRowIndex": 1, "startColumnIndex": 9,
-                          "endColumnIndex": 10},
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.3, "green": 0.3, "blue": 0.3},
-                        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True},
-                        "horizontalAlignment": "CENTER"
-                    }
-                },
-                "fields": "userEnteredFormat"
-            }
-        },
-        # Título tabla semanal
-        {
-            "repeatCell": {
-                "range": {"sheetId": sheet_id, "startRowIndex": FILA_INICIO_RECORDATORIOS - 1,
-                          "endRowIndex": FILA_INICIO_RECORDATORIOS, "startColumnIndex": 0, "endColumnIndex": 8},
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.2, "green": 0.2, "blue": 0.2},
-                        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True,
-                                       "fontSize": 11},
-                        "horizontalAlignment": "CENTER"
-                    }
-                },
-                "fields": "userEnteredFormat"
-            }
-        },
-        # Encabezados días tabla
-        {
-            "repeatCell": {
-                "range": {"sheetId": sheet_id, "startRowIndex": FILA_INICIO_RECORDATORIOS,
-                          "endRowIndex": FILA_INICIO_RECORDATORIOS + 1, "startColumnIndex": 1, "endColumnIndex": 8},
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
-                        "textFormat": {"bold": True, "fontSize": 9},
-                        "horizontalAlignment": "CENTER"
-                    }
-                },
-                "fields": "userEnteredFormat"
-            }
-        }
-    ]
+    from core.lobo_google.estilos import ESTILOS
+
+    sheet.spreadsheet.batch_update({"requests": _requests_formato(sheet._properties["sheetId"])})
+    ESTILOS.marcar(sheet._properties["sheetId"], ENCABEZADOS)
+
+
+def _requests_formato(sheet_id, nombres=None):
+    """
+    Requests de formato de encabezados (I/J y tabla semanal) para una hoja
+
+    Args:
+        nombres: encabezados a incluir (None = todos)
+    """
+    from core.lobo_google.estilos import ESTILOS, repeat_cell
 
-    sheet.spreadsheet.batch_update({"requests": requests})
+    requests = []
+    for nombre in (ENCABEZADOS if nombres is None else nombres):
+        rango, formato = ENCABEZADOS[nombre]
+        formato = ESTILOS.obtener(("encabezado", nombre), lambda: formato)
+        # Formato completo: el encabezado no conserva nada de lo que hubiera antes
+        requests.append(repeat_cell(sheet_id, rango, formato, completo=True))
+    return requests
 
 
 def reordenar_hojas_cronologicamente(forzar=False):
@@ -475,6 +531,7 @@ def reordenar_hojas_cronologicamente(forzar=False):
     Returns:
         int: Número de hojas reordenadas
     """
+    from modules.agenda.calendario_hojas import CALENDARIO_HOJAS
     from modules.agenda.sheets_manager import get_sheets_manager
     from core.lobo_google.rate_limiter import RATE_LIMITER
 
@@ -484,28 +541,10 @@ def reordenar_hojas_cronologicamente(forzar=False):
         manager = get_sheets_manager()
         spreadsheet = manager.spreadsheet
 
-        RATE_LIMITER.wait_if_needed()
-        todas_las_hojas = spreadsheet.worksheets()
-
-        # Separar template y hojas semanales
-        template = None
-        hojas_semanales = []
-        hojas_excluidas = ["Hoja 1", "Sheet1", "26-2"]
-
-        for hoja in todas_las_hojas:
-            if hoja.title in hojas_excluidas:
-                template = hoja
-            else:
-                # Validar que sea hoja semanal
-                if "-" in hoja.title:
-                    meses = [
-                        "ene", "feb", "mar", "abr", "may", "jun",
-                        "jul", "ago", "sep", "oct", "nov", "dic"
-                    ]
-                    if any(mes in hoja.title.lower() for mes in meses):
-                        fecha_lunes = _calcular_lunes_desde_nombre_hoja(hoja.title)
-                        if fecha_lunes:
-                            hojas_semanales.append((fecha_lunes, hoja))
+        # Hojas semanales con su lunes (1 lectura, posiciones frescas); el template queda aparte
+        hojas_semanales = CALENDARIO_HOJAS.hojas(spreadsheet, forzar=True)
+        template = next((h for h in CALENDARIO_HOJAS.otras(spreadsheet)
+                         if h.title in ["Hoja 1", "Sheet1", "26-2"]), None)
 
         if not hojas_semanales:
             logger.warning("⚠️  No hay hojas semanales para reordenar")
@@ -554,6 +593,7 @@ def reordenar_hojas_cronologicamente(forzar=False):
         if requests:
             RATE_LIMITER.wait_if_needed()
             spreadsheet.batch_update({"requests": requests})
+            CALENDARIO_HOJAS.invalidar()  # Las posiciones (hoja.index) cambiaron
             logger.info(f"✅ {len(requests)} hojas reordenadas")
             return len(requests)
         else:
@@ -581,12 +621,7 @@ def pintar_recordatorios_semana(fecha_inicio_semana=None):
     try:
         memoria = Memory()
         recordatorios = memoria.recall_por_semana(fecha_inicio_semana)
-        todos = memoria.recall(estado="pendiente")
-        con_fecha = [r for r in todos if r.fecha_limite]
-        sin_fecha = [r for r in todos if not r.fecha_limite]
-
-        con_fecha.sort(key=lambda x: (x.fecha_limite, x.hora_limite or datetime.min.time(), x.prioridad))
-        sin_fecha.sort(key=lambda x: x.id)
+        con_fecha, sin_fecha = _cargar_pendientes(memoria)
 
         sheet = get_sheets_manager().obtener_hoja_por_fecha(fecha_inicio_semana)
         _actualizar_hoja_completa_optimizado(sheet, fecha_inicio_semana, con_fecha, sin_fecha)
@@ -599,10 +634,6 @@ def pintar_recordatorios_semana(fecha_inicio_semana=None):
         logger.info("No hay recordatorios para esta semana")
         return
 
-    # ===== APLICAR RATE LIMITING =====
-    from core.lobo_google.rate_limiter import RATE_LIMITER
-    RATE_LIMITER.wait_if_needed()
-
     limpiar_area_recordatorios(sheet)
 
     recordatorios_por_dia = {i: [] for i in range(7)}
@@ -612,33 +643,27 @@ def pintar_recordatorios_semana(fecha_inicio_semana=None):
             dia_semana = rec.fecha_limite.weekday()
             recordatorios_por_dia[dia_semana].append(rec)
 
+    from core.lobo_google.escritor_lotes import EscritorLotes
+    from core.lobo_google.estilos import ESTILOS, color
+
+    # Encabezados, celdas y formatos viajan juntos (trozos por tamaño, no de 10 en 10)
+    escritor = EscritorLotes(sheet.spreadsheet, value_input_option='USER_ENTERED')
+
     fila = FILA_INICIO_RECORDATORIOS
 
     # ===== ENCABEZADO PRINCIPAL =====
-    RATE_LIMITER.wait_if_needed()
-    sheet.update(f"A{fila}", [["RECORDATORIOS PENDIENTES DE LA SEMANA"]])
-
-    RATE_LIMITER.wait_if_needed()
-    sheet.format(f"A{fila}:H{fila}", {
-        "backgroundColor": {"red": 0.2, "green": 0.2, "blue": 0.2},
-        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True},
-        "horizontalAlignment": "CENTER"
-    })
+    escritor.escribir(sheet, f"A{fila}", [["RECORDATORIOS PENDIENTES DE LA SEMANA"]])
 
     fila += 1
 
     # ===== ENCABEZADOS DE DÍAS =====
     dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
 
-    RATE_LIMITER.wait_if_needed()
-    sheet.update(f"B{fila}:H{fila}", [dias])
+    escritor.escribir(sheet, f"B{fila}:H{fila}", [dias])
 
-    RATE_LIMITER.wait_if_needed()
-    sheet.format(f"B{fila}:H{fila}", {
-        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
-        "textFormat": {"bold": True},
-        "horizontalAlignment": "CENTER"
-    })
+    # Formato de ambos encabezados: solo si la hoja aún no lo tiene
+    pendientes = ESTILOS.pendientes(sheet.id, ENCABEZADOS)
+    escritor.formatear(*_requests_formato(sheet.id, pendientes))
 
     fila += 1
     fila_inicio_datos = fila
@@ -679,47 +704,25 @@ def pintar_recordatorios_semana(fecha_inicio_semana=None):
             updates.append((celda, [[texto]]))
 
             # Agregar formato
-            color = COLORES_PRIORIDAD.get(rec.prioridad, (1.0, 1.0, 1.0))
-            formato = {
-                "backgroundColor": {"red": color[0], "green": color[1], "blue": color[2]},
+            formato = ESTILOS.obtener(("prioridad", rec.prioridad), lambda: {
+                "backgroundColor": color(COLORES_PRIORIDAD.get(rec.prioridad, (1.0, 1.0, 1.0))),
                 "textFormat": {"fontSize": 9},
                 "wrapStrategy": "WRAP",
                 "verticalAlignment": "TOP"
-            }
+            })
             formatos.append((celda, formato))
 
             fila_actual += 1
 
-    # ===== EJECUTAR BATCH UPDATES =====
-    if updates:
-        # Actualizar contenido en batches de 10
-        RATE_LIMITER.wait_if_needed()
-
-        for i in range(0, len(updates), 10):
-            batch = updates[i:i + 10]
-
-            # Preparar data para batch_update
-            data = []
-            for celda, valores in batch:
-                data.append({
-                    'range': celda,
-                    'values': valores
-                })
-
-            RATE_LIMITER.wait_if_needed()
-            sheet.batch_update(data, value_input_option='USER_ENTERED')
-            logger.debug(f"Batch de recordatorios actualizado: {len(batch)} celdas")
-
-    # ===== APLICAR FORMATOS EN BATCH =====
-    if formatos:
-        RATE_LIMITER.wait_if_needed()
-
-        for i in range(0, len(formatos), 10):
-            batch = formatos[i:i + 10]
+    # ===== EJECUTAR EN LOTE =====
+    for celda, valores in updates:
+        escritor.escribir(sheet, celda, valores)
+    for celda, formato in formatos:
+        escritor.formatear_rango(sheet, celda, formato)
 
-            for celda, formato in batch:
-                RATE_LIMITER.wait_if_needed()
-                sheet.format(celda, formato)
+    informe = escritor.enviar()
+    ESTILOS.marcar(sheet.id, ENCABEZADOS, pendientes)
+    logger.debug(f"Recordatorios enviados en {sum(informe['trozos'].values())} trozos")
 
     logger.info(f"Recordatorios de la semana pintados en hoja '{sheet.title}': {len(updates)} recordatorios")
 
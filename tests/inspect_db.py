@@ -1,6 +1,6 @@
-import sqlite3
+from core.db.db import engine
 
-conn = sqlite3.connect("lobo.db")  # o cambia al nombre real de tu base de datos
+conn = engine.raw_connection()  # La DB configurada en core/db/db.py (o LOBO_DB)
 cursor = conn.cursor()
 
 # Mostrar todas las tablas
@@ -1,5 +1,4 @@
-from sqlalchemy import create_engine
-engine = create_engine("sqlite:///core/database/lobo.db")  # pon la ruta real
+from core.db.db import engine  # La DB configurada en core/db/db.py (o LOBO_DB)
 
-with engine.connect() as conn:
-    conn.execute("ALTER TABLE bitacora ADD COLUMN usuario TEXT")
+with engine.begin() as conn:
+    conn.exec_driver_sql("ALTER TABLE bitacora ADD COLUMN usuario TEXT")
@@ -0,0 +1,68 @@
+# test_alarmas.py
+import os
+import tempfile
+
+# DB temporal: LOBO_DB se lee al importar core.db.db
+os.environ["LOBO_DB"] = os.path.join(tempfile.mkdtemp(), "lobo_test.db")
+
+from core.db.db import SessionLocal
+from core.db.migraciones import migrar
+from core.db.schema import Evento
+from modules.alarma.alarma import AlarmManager
+from datetime import date, datetime, time, timedelta
+
+migrar()
+
+
+def crear_evento(nombre, fecha, hora):
+    session = SessionLocal()
+    evento = Evento(nombre=nombre, fecha_inicio=fecha, hora_inicio=hora,
+                    hora_fin=time(23, 59), alarma_activa=True)
+    session.add(evento)
+    session.commit()
+    session.refresh(evento)
+    session.expunge(evento)
+    session.close()
+    return evento
+
+
+def alarma_activa(evento_id):
+    session = SessionLocal()
+    try:
+        return session.get(Evento, evento_id).alarma_activa
+    finally:
+        session.close()
+
+
+alarmas = AlarmManager()
+
+print("🧪 Test 1: Editar un evento pasado no apaga su alarma")
+print("=" * 60)
+
+pasado = crear_evento("Junta pasada", date.today() - timedelta(days=1), time(9))
+reprogramada = alarmas.reprogramar_evento(pasado)
+
+if not reprogramada and alarma_activa(pasado.id):
+    print("✅ Sin alarma pendiente y alarma_activa sigue en True")
+else:
+    print(f"❌ reprogramada={reprogramada}, alarma_activa={alarma_activa(pasado.id)}")
+
+print("\n🧪 Test 2: Moverlo al futuro vuelve a armar la alarma")
+print("=" * 60)
+
+pasado.fecha_inicio = date.today() + timedelta(days=2)
+if alarmas.reprogramar_evento(pasado) and any(eid == pasado.id for _, eid in alarmas.pendientes()):
+    print("✅ Alarma armada de nuevo")
+else:
+    print("❌ La alarma no se volvió a programar")
+
+print("\n🧪 Test 3: cancelar_alarma sí la desactiva")
+print("=" * 60)
+
+alarmas.cancelar_alarma(pasado.id)
+if not alarma_activa(pasado.id) and not alarmas.pendientes():
+    print("✅ alarma_activa en False y sin pendientes")
+else:
+    print("❌ La alarma sigue activa")
+
+print("\n✅ Test de alarmas completado")
@@ -0,0 +1,54 @@
+# test_archivo.py
+from core.db.archivo import ArchivoHistorico
+from core.db.schema import RecurrenciaEnum
+from core.db.vistas import EventoVista
+from datetime import date, time, timedelta
+import os
+import tempfile
+
+
+def evento(i, nombre, fecha):
+    return EventoVista(f"{i:08d}-evento", nombre, "", fecha, time(9), time(10), RecurrenciaEnum.unico,
+                       [], False, None, False, "clase", 5, True, None)
+
+
+archivo = ArchivoHistorico(tempfile.mkdtemp())
+inicio = date(2025, 1, 6)
+eventos = [evento(i, "Clase de cálculo" if i % 2 else "Gym", inicio + timedelta(days=i)) for i in range(120)]
+
+print("🧪 Test 1: Archivar en segmentos por mes")
+print("=" * 60)
+
+archivo.agregar("eventos", eventos[:60])
+archivo.agregar("eventos", eventos[60:])
+print(f"   Meses: {archivo.meses('eventos')}")
+
+leidos = archivo.leer("eventos")
+if len(leidos) == 120 and leidos[0].fecha_inicio == inicio and leidos[0].recurrencia == RecurrenciaEnum.unico:
+    print("✅ 120 eventos de vuelta, con tipos restaurados")
+else:
+    print(f"❌ Se leyeron {len(leidos)} eventos")
+
+print("\n🧪 Test 2: Búsqueda por texto y rango")
+print("=" * 60)
+
+marzo = archivo.buscar_eventos("cálculo", date(2025, 3, 1), date(2025, 3, 31))
+if marzo and all(e.fecha_inicio.month == 3 and "cálculo" in e.nombre for e in marzo):
+    print(f"✅ {len(marzo)} clases de cálculo en marzo")
+else:
+    print("❌ Búsqueda incorrecta")
+
+print("\n🧪 Test 3: Reintento tras un corte (filas repetidas)")
+print("=" * 60)
+
+archivo.agregar("eventos", eventos[:10])
+if len(archivo.leer("eventos")) == 120:
+    print("✅ Sin duplicados al leer")
+else:
+    print("❌ Aparecieron duplicados")
+
+tamano = sum(os.path.getsize(os.path.join(archivo.ruta, "eventos", f))
+             for f in os.listdir(os.path.join(archivo.ruta, "eventos")))
+print(f"   Tamaño en disco: {tamano} bytes para 130 filas")
+
+print("\n✅ Test de archivo histórico completado")
@@ -0,0 +1,70 @@
+# test_cache_eventos.py
+from modules.agenda.cache_eventos import CacheEventosSemana
+from datetime import date
+from types import SimpleNamespace
+
+print("🧪 Test 1: Lecturas repetidas de la misma semana no consultan la DB")
+print("=" * 60)
+
+consultas = []
+
+
+def cargador(lunes, domingo):
+    consultas.append((lunes, domingo))
+    return [SimpleNamespace(fecha_inicio=lunes), SimpleNamespace(fecha_inicio=domingo)]
+
+
+cache = CacheEventosSemana(max_semanas=2)
+miercoles = date(2025, 10, 29)
+
+cache.eventos_del_dia(miercoles, cargador)
+cache.eventos_del_dia(miercoles, cargador)
+cache.eventos_entre(date(2025, 10, 27), date(2025, 11, 2), cargador)
+
+if len(consultas) == 1:
+    print("✅ Una sola carga para tres lecturas")
+else:
+    print(f"❌ Se esperaban 1 carga, hubo {len(consultas)}")
+
+print("\n🧪 Test 2: Invalidación precisa por semana")
+print("=" * 60)
+
+cache.eventos_del_dia(date(2025, 11, 5), cargador)  # otra semana
+cache.invalidar_fechas(miercoles)
+cache.eventos_del_dia(date(2025, 11, 5), cargador)  # sigue en cache
+cache.eventos_del_dia(miercoles, cargador)  # recarga
+
+if len(consultas) == 3:
+    print("✅ Solo se recargó la semana invalidada")
+else:
+    print(f"❌ Se esperaban 3 cargas, hubo {len(consultas)}")
+
+print("\n🧪 Test 3: Expulsión LRU")
+print("=" * 60)
+
+cache.eventos_del_dia(date(2025, 11, 12), cargador)  # expulsa la semana menos usada
+print(f"Semanas en cache: {cache.get_stats()['semanas_en_cache']}")
+print(f"Stats: {cache.get_stats()}")
+
+print("\n🧪 Test 4: invalidar_todo durante la primera carga de una semana")
+print("=" * 60)
+
+cache = CacheEventosSemana()
+consultas.clear()
+
+
+def cargador_con_escritura(lunes, domingo):
+    # Una escritura masiva termina mientras esta semana se carga por primera vez
+    cache.invalidar_todo()
+    return cargador(lunes, domingo)
+
+
+cache.eventos_del_dia(miercoles, cargador_con_escritura)
+cache.eventos_del_dia(miercoles, cargador)
+
+if len(consultas) == 2:
+    print("✅ Los datos previos a la invalidación no quedaron en cache")
+else:
+    print(f"❌ Se esperaban 2 cargas, hubo {len(consultas)}")
+
+print("\n✅ Test de cache de eventos completado")
@@ -0,0 +1,45 @@
+# test_escritor_lotes.py
+from core.lobo_google.escritor_lotes import _tamano, trozos_por_tamano
+
+
+def dato(hoja, relleno):
+    return {'range': f"'{hoja}'!A1", 'values': [["x" * relleno]]}
+
+
+def hoja(d):
+    return d['range'].rsplit('!', 1)[0]
+
+
+print("🧪 Test 1: Ningún trozo pasa de max_bytes ni de max_elementos")
+print("=" * 60)
+
+items = [dato("A", 1), dato("B", 60), dato("B", 10)]
+print(f"   Tamaños: {[_tamano(i) for i in items]}")
+max_bytes = _tamano(items[0]) + _tamano(items[1]) + 5  # A+B caben, B+B no
+
+trozos = trozos_por_tamano(items, max_bytes=max_bytes, clave=hoja)
+tamanos = [sum(_tamano(i) for i in t) for t in trozos]
+print(f"   Trozos: {[len(t) for t in trozos]} con {tamanos} bytes (máx {max_bytes})")
+
+if all(t <= max_bytes for t in tamanos) and [i for t in trozos for i in t] == items:
+    print("✅ Límite respetado y orden conservado")
+else:
+    print("❌ Un trozo pasa del límite")
+
+trozos = trozos_por_tamano([dato("A", 1)] + [dato("B", 1)] * 4, max_elementos=3, clave=hoja)
+if all(len(t) <= 3 for t in trozos):
+    print(f"✅ Máximo de elementos respetado: {[len(t) for t in trozos]}")
+else:
+    print(f"❌ Trozos de {[len(t) for t in trozos]} elementos")
+
+print("\n🧪 Test 2: Una hoja no se reparte si cabe entera en el siguiente trozo")
+print("=" * 60)
+
+items = [dato("A", 10), dato("A", 10), dato("B", 10), dato("B", 10)]
+trozos = trozos_por_tamano(items, max_bytes=sum(_tamano(i) for i in items[:3]), clave=hoja)
+if [{hoja(i) for i in t} for t in trozos] == [{"'A'"}, {"'B'"}]:
+    print("✅ Cada hoja en su propio trozo")
+else:
+    print(f"❌ Trozos: {[[hoja(i) for i in t] for t in trozos]}")
+
+print("\n✅ Test de escritor por lotes completado")
@@ -0,0 +1,69 @@
+# test_renderizadores.py
+from modules.agenda.renderizadores import (
+    proyectar_semana, bloques_grilla, RenderizadorICS, RenderizadorCSV, RenderizadorHTML
+)
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+import os
+import tempfile
+import time as reloj
+
+lunes = date(2025, 10, 27)
+
+
+def evento(id, nombre, dia, inicio, fin, tipo="personal"):
+    return SimpleNamespace(id=id, nombre=nombre, descripcion="", fecha_inicio=lunes + timedelta(days=dia),
+                           hora_inicio=inicio, hora_fin=fin, tipo_evento=tipo, es_maestro=False)
+
+
+eventos = [
+    evento("a", "Clase", 0, time(9), time(10), "clase"),
+    evento("b", "Junta", 0, time(9, 30), time(11), "reunion"),
+    evento("c", "Gym", 2, time(18), time(19), "deporte"),
+]
+recordatorios = [SimpleNamespace(id=1, content="Pagar renta, luz", fecha_limite=lunes + timedelta(days=1),
+                                 hora_limite=None, prioridad=1)]
+
+print("🧪 Test 1: Traslapes agrupados en la proyección")
+print("=" * 60)
+
+proyeccion = proyectar_semana(lunes, eventos, recordatorios)
+bloques = bloques_grilla(proyeccion)
+
+if len(bloques) == 2 and bloques[0]['traslape'] and bloques[0]['slots'] == 4:
+    print("✅ Clase + Junta en un bloque de 09:00 a 11:00")
+else:
+    print(f"❌ Bloques inesperados: {bloques}")
+
+print("\n🧪 Test 2: Backends locales")
+print("=" * 60)
+
+carpeta = tempfile.mkdtemp()
+ics = RenderizadorICS(os.path.join(carpeta, "agenda.ics"))
+backends = [ics, RenderizadorCSV(carpeta), RenderizadorHTML(carpeta)]
+
+for backend in backends:
+    print(f"   {backend.nombre}: {backend.renderizar([proyeccion])}")
+
+with open(ics.ruta, encoding="utf-8") as f:
+    contenido = f.read()
+
+if contenido.count("BEGIN:VEVENT") == 3 and "Pagar renta\\, luz" in contenido:
+    print("✅ ICS con 3 eventos y el recordatorio escapado")
+else:
+    print("❌ ICS incompleto")
+
+print("\n🧪 Test 3: Un año completo")
+print("=" * 60)
+
+semanas = [proyectar_semana(lunes + timedelta(weeks=i),
+                            [SimpleNamespace(**{**vars(ev), 'fecha_inicio': ev.fecha_inicio + timedelta(weeks=i)})
+                             for ev in eventos])
+           for i in range(52)]
+
+t0 = reloj.perf_counter()
+for backend in backends:
+    backend.renderizar(semanas)
+print(f"✅ 52 semanas en {(reloj.perf_counter() - t0) * 1000:.0f} ms")
+
+print("\n✅ Test de renderizadores completado")